@@ -0,0 +1,463 @@
+"""A small STAC API server over the catalog, answered from in-memory indexes.
+
+Serves:
+
+- /collections: every collection, sorted by id
+- /collections/{id}: one collection
+- /search: the collections that match all of the given parameters
+  - bbox=x1,y1,x2,y2: intersects the spatial extent (index.spatial)
+  - datetime=start/end or an instant, with .. for an open end
+    (index.temporal)
+  - keywords=a boolean keyword query like "landsat -toa" (index.keywords)
+  - q=free text, which also sorts the results by relevance (index.text)
+
+The lists are paged with limit and an opaque cursor, and each page links to
+the next one.  A cursor holds an offset and a tag of the catalog it came from,
+so a cursor from a server with a different catalog is rejected rather than
+silently skipping or repeating results.
+
+The indexes and the canonical json of each collection are built once at
+startup.  A list body is the collections' json joined together without being
+serialized again.  Rendered responses, with their gzip and, if the brotli
+package is installed, br variants, are kept in a small LRU cache, so repeated
+requests are not rendered or compressed again.  Every response has a strong
+ETag, the quoted sha256 of the bytes sent, and If-None-Match gets a 304.
+
+The HTTP/1.1 server is plain asyncio streams with keep-alive.  It is meant for
+tools on a trusted network and does not try to be a hardened web server.
+"""
+
+import asyncio
+import base64
+import collections
+import dataclasses
+import datetime
+import hashlib
+import http
+import json
+import math
+from typing import Callable, Optional
+import urllib.parse
+
+from checker import canonical
+from checker import publish
+from checker import stac
+from checker.index import keywords
+from checker.index import spatial
+from checker.index import temporal
+from checker.index import text
+
+COLLECTIONS = '/collections'
+SEARCH = '/search'
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 250
+CACHE_SIZE = 1024
+# Smaller bodies are sent as they are.
+MIN_COMPRESS_SIZE = 1024
+# The longest request line and headers that are read.
+MAX_HEAD_SIZE = 64 * 1024
+
+CONTENT_TYPE = 'application/json'
+EARLIEST = datetime.datetime(1, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class BadRequest(ValueError):
+  """The request has an invalid parameter."""
+
+
+def parse_bbox(value: str) -> spatial.Box:
+  try:
+    box = tuple(float(part) for part in value.split(','))
+  except ValueError:
+    raise BadRequest(f'Invalid bbox: {value}') from None
+  if len(box) != 4:
+    raise BadRequest(f'bbox must have 4 numbers: {value}')
+  if not all(math.isfinite(number) for number in box):
+    raise BadRequest(f'bbox numbers must be finite: {value}')
+  # West may be more than east for a box that crosses the antimeridian.
+  if box[1] > box[3]:
+    raise BadRequest(f'bbox south must not be more than north: {value}')
+  return box
+
+
+def _parse_time(value: str) -> datetime.datetime:
+  try:
+    # fromisoformat only takes a Z from Python 3.11.
+    when = datetime.datetime.fromisoformat(
+        value.replace('Z', '+00:00').replace('z', '+00:00'))
+  except ValueError:
+    raise BadRequest(f'Invalid datetime: {value}') from None
+  if when.tzinfo is None:
+    when = when.replace(tzinfo=datetime.timezone.utc)
+  return when
+
+
+def parse_datetime(
+    value: str
+) -> tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+  """Returns the start and end of a datetime parameter, None if open."""
+  if '/' not in value:
+    when = _parse_time(value)
+    return when, when
+  start, end = value.split('/', 1)
+  start_time = None if start in ('', '..') else _parse_time(start)
+  end_time = None if end in ('', '..') else _parse_time(end)
+  if (start_time is not None and end_time is not None and
+      start_time > end_time):
+    raise BadRequest(f'datetime start must not be after the end: {value}')
+  return start_time, end_time
+
+
+def parse_limit(value: Optional[str]) -> int:
+  if value is None:
+    return DEFAULT_LIMIT
+  try:
+    limit = int(value)
+  except ValueError:
+    raise BadRequest(f'Invalid limit: {value}') from None
+  if not 1 <= limit <= MAX_LIMIT:
+    raise BadRequest(f'limit must be from 1 to {MAX_LIMIT}: {value}')
+  return limit
+
+
+class Catalog:
+  """The collections and the indexes over them."""
+
+  def __init__(self, nodes: list[stac.Node]):
+    collections_by_id = {
+        a_node.id: a_node for a_node in nodes
+        if a_node.type == stac.StacType.COLLECTION}
+    self.ids = sorted(collections_by_id)
+    self.nodes = [collections_by_id[an_id] for an_id in self.ids]
+    self.ordinals = {an_id: i for i, an_id in enumerate(self.ids)}
+    self.bodies = [canonical.dumps(a_node.stac) for a_node in self.nodes]
+
+    digest = hashlib.sha256()
+    for a_node in self.nodes:
+      digest.update(f'{a_node.id}\0{a_node.fingerprint}\n'.encode('utf-8'))
+    # Identifies this catalog in cursors.
+    self.tag = digest.hexdigest()[:16]
+
+    self.spatial = spatial.build(self.nodes)
+    self.temporal = temporal.build(self.nodes)
+    self.keywords = keywords.build(self.nodes)
+    self.text = text.build(self.nodes)
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  def search(
+      self, bbox: Optional[spatial.Box] = None,
+      start: Optional[datetime.datetime] = None,
+      end: Optional[datetime.datetime] = None,
+      keyword_query: Optional[str] = None,
+      q: Optional[str] = None) -> list[int]:
+    """Returns the ordinals of the collections that match every argument.
+
+    They are sorted by relevance to q if given and otherwise by id.
+
+    Raises:
+      BadRequest: if keyword_query is not a valid query.
+    """
+    found: Optional[set[str]] = None
+
+    def narrow(ids: list[str]) -> None:
+      nonlocal found
+      found = set(ids) if found is None else found & set(ids)
+
+    if bbox is not None:
+      narrow(self.spatial.intersects(bbox))
+    if start is not None or end is not None:
+      narrow(self.temporal.overlapping(start or EARLIEST, end))
+    if keyword_query is not None:
+      try:
+        narrow(self.keywords.search(keyword_query))
+      except ValueError as e:
+        raise BadRequest(str(e)) from None
+
+    if q is not None:
+      ranked = self.text.search(q, limit=len(self.text))
+      return [
+          self.ordinals[an_id] for an_id, _ in ranked
+          if found is None or an_id in found]
+    if found is None:
+      return list(range(len(self.ids)))
+    return sorted(self.ordinals[an_id] for an_id in found)
+
+  def encode_cursor(self, offset: int) -> str:
+    return base64.urlsafe_b64encode(
+        f'{offset}.{self.tag}'.encode('ascii')).decode('ascii').rstrip('=')
+
+  def decode_cursor(self, cursor: str) -> int:
+    """Returns the offset in a cursor from encode_cursor.
+
+    Raises:
+      BadRequest: if the cursor is invalid or from another catalog.
+    """
+    try:
+      padded = cursor + '=' * (-len(cursor) % 4)
+      offset, tag = base64.urlsafe_b64decode(padded).decode('ascii').split('.')
+      offset = int(offset)
+    except ValueError:
+      raise BadRequest(f'Invalid cursor: {cursor}') from None
+    if tag != self.tag or offset < 0:
+      raise BadRequest('The cursor is from a different catalog')
+    return offset
+
+
+@dataclasses.dataclass
+class Body:
+  """A rendered response body and its compressed variants."""
+  status: int
+  data: bytes
+  etag: str
+  # encoding -> (data, etag), filled in as they are asked for.
+  variants: dict[str, tuple[bytes, str]] = dataclasses.field(
+      default_factory=dict)
+
+
+@dataclasses.dataclass
+class Response:
+  status: int
+  headers: dict[str, str]
+  body: bytes = b''
+
+  def encode(self, keep_alive: bool, head_only: bool = False) -> bytes:
+    headers = dict(self.headers)
+    headers['Content-Length'] = str(len(self.body))
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    lines = [f'HTTP/1.1 {self.status} {http.HTTPStatus(self.status).phrase}']
+    lines += [f'{name}: {value}' for name, value in headers.items()]
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head if head_only else head + self.body
+
+
+def _compressors() -> dict[str, Callable[[bytes], bytes]]:
+  try:
+    return publish.compressors((publish.BROTLI, publish.GZIP))
+  except ValueError:
+    return publish.compressors((publish.GZIP,))
+
+
+def accepted_encodings(header: str) -> set[str]:
+  """Returns the codings in an Accept-Encoding header that are not q=0."""
+  result = set()
+  for item in header.split(','):
+    coding, *params = [part.strip() for part in item.split(';')]
+    if any(param.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+           for param in params):
+      continue
+    if coding:
+      result.add(coding.lower())
+  return result
+
+
+class Lru:
+  """A dict that keeps at most size of the most recently used items."""
+
+  def __init__(self, size: int):
+    self.size = size
+    self.items: collections.OrderedDict = collections.OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, key, make: Callable[[], object]):
+    if key in self.items:
+      self.hits += 1
+      self.items.move_to_end(key)
+      return self.items[key]
+    self.misses += 1
+    value = make()
+    self.items[key] = value
+    if len(self.items) > self.size:
+      self.items.popitem(last=False)
+    return value
+
+
+class App:
+  """Turns requests into responses."""
+
+  def __init__(self, catalog: Catalog, cache_size: int = CACHE_SIZE):
+    self.catalog = catalog
+    self.compress = _compressors()
+    self.bodies = Lru(cache_size)
+    # The ordinals that match each search, for paging through them.
+    self.searches = Lru(cache_size)
+
+  def _json(self, status: int, value: object) -> Body:
+    data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+    return Body(status, data, publish.etag(data))
+
+  def _error(self, status: int, message: str) -> Body:
+    return self._json(status, {
+        'code': http.HTTPStatus(status).phrase, 'description': message})
+
+  def _page(
+      self, path: str, params: dict[str, str], ordinals: list[int]) -> Body:
+    limit = parse_limit(params.get('limit'))
+    cursor = params.get('cursor')
+    offset = self.catalog.decode_cursor(cursor) if cursor else 0
+    page = ordinals[offset:offset + limit]
+    links = [{'rel': 'self', 'href': _href(path, params)}]
+    if offset + limit < len(ordinals):
+      next_params = dict(params)
+      next_params['cursor'] = self.catalog.encode_cursor(offset + limit)
+      links.append({'rel': 'next', 'href': _href(path, next_params)})
+    data = b''.join([
+        b'{"collections":[',
+        b','.join(self.catalog.bodies[i] for i in page),
+        b'],"links":', canonical.dumps(links),
+        f',"numberMatched":{len(ordinals)},'
+        f'"numberReturned":{len(page)}}}'.encode('ascii'),
+    ])
+    return Body(http.HTTPStatus.OK, data, publish.etag(data))
+
+  def _search(self, params: dict[str, str]) -> list[int]:
+    bbox = parse_bbox(params['bbox']) if 'bbox' in params else None
+    start = end = None
+    if 'datetime' in params:
+      start, end = parse_datetime(params['datetime'])
+    return self.catalog.search(
+        bbox, start, end, params.get('keywords'), params.get('q'))
+
+  def _render(self, path: str, params: dict[str, str]) -> Body:
+    try:
+      if path == '/':
+        return self._json(http.HTTPStatus.OK, {
+            'type': 'Catalog',
+            'id': 'earthengine-stac-api',
+            'links': [
+                {'rel': 'data', 'href': COLLECTIONS},
+                {'rel': 'search', 'href': SEARCH},
+            ],
+        })
+      if path == COLLECTIONS:
+        return self._page(path, params, list(range(len(self.catalog))))
+      if path.startswith(COLLECTIONS + '/'):
+        dataset_id = path[len(COLLECTIONS) + 1:]
+        ordinal = self.catalog.ordinals.get(dataset_id)
+        if ordinal is None:
+          return self._error(
+              http.HTTPStatus.NOT_FOUND, f'No collection {dataset_id}')
+        data = self.catalog.bodies[ordinal]
+        return Body(
+            http.HTTPStatus.OK, data,
+            f'"{self.catalog.nodes[ordinal].fingerprint}"')
+      if path == SEARCH:
+        search_key = tuple(sorted(
+            (name, value) for name, value in params.items()
+            if name not in ('limit', 'cursor')))
+        ordinals = self.searches.get(
+            search_key, lambda: self._search(params))
+        return self._page(path, params, ordinals)
+    except BadRequest as e:
+      return self._error(http.HTTPStatus.BAD_REQUEST, str(e))
+    return self._error(http.HTTPStatus.NOT_FOUND, f'Not found: {path}')
+
+  def _variant(
+      self, body: Body, accept_encoding: str) -> tuple[bytes, str, str]:
+    """Returns the data, etag, and content coding to send."""
+    if len(body.data) >= MIN_COMPRESS_SIZE:
+      accepted = accepted_encodings(accept_encoding)
+      for encoding, function in self.compress.items():
+        if encoding not in accepted:
+          continue
+        if encoding not in body.variants:
+          data = function(body.data)
+          body.variants[encoding] = data, publish.etag(data)
+        data, etag = body.variants[encoding]
+        return data, etag, encoding
+    return body.data, body.etag, ''
+
+  def respond(
+      self, method: str, target: str, headers: dict[str, str]) -> Response:
+    """Returns the response to a request.  Header names are lower case."""
+    if method not in ('GET', 'HEAD'):
+      return Response(
+          http.HTTPStatus.METHOD_NOT_ALLOWED, {'Allow': 'GET, HEAD'})
+    parts = urllib.parse.urlsplit(target)
+    path = urllib.parse.unquote(parts.path)
+    if len(path) > 1:
+      path = path.rstrip('/')
+    params = dict(urllib.parse.parse_qsl(parts.query))
+    key = (path, tuple(sorted(params.items())))
+    body = self.bodies.get(key, lambda: self._render(path, params))
+
+    data, etag, encoding = self._variant(
+        body, headers.get('accept-encoding', ''))
+    response_headers = {
+        'Content-Type': CONTENT_TYPE,
+        'ETag': etag,
+        'Vary': 'Accept-Encoding',
+    }
+    if encoding:
+      response_headers['Content-Encoding'] = encoding
+    if body.status == http.HTTPStatus.OK and etag in _etags(
+        headers.get('if-none-match', '')):
+      return Response(http.HTTPStatus.NOT_MODIFIED, response_headers)
+    return Response(body.status, response_headers, data)
+
+  def summary(self) -> str:
+    return (
+        f'api: {len(self.catalog)} collections, response cache '
+        f'{self.bodies.hits} hits, {self.bodies.misses} misses')
+
+
+def _href(path: str, params: dict[str, str]) -> str:
+  if not params:
+    return path
+  return path + '?' + urllib.parse.urlencode(sorted(params.items()))
+
+
+def _etags(header: str) -> set[str]:
+  return {item.strip() for item in header.split(',') if item.strip()}
+
+
+async def handle_connection(
+    app: App, reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter) -> None:
+  """Answers the requests on one connection until it closes."""
+  try:
+    while True:
+      try:
+        head = await reader.readuntil(b'\r\n\r\n')
+      except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+              ConnectionError):
+        return
+      request_line, *header_lines = head.decode('latin-1').split('\r\n')
+      try:
+        method, target, version = request_line.split(' ')
+      except ValueError:
+        writer.write(Response(http.HTTPStatus.BAD_REQUEST, {}).encode(False))
+        await writer.drain()
+        return
+      headers = {}
+      for line in header_lines:
+        name, _, value = line.partition(':')
+        if name:
+          headers[name.strip().lower()] = value.strip()
+      length = headers.get('content-length', '0')
+      if length.isdigit() and int(length):
+        await reader.readexactly(int(length))
+
+      keep_alive = (
+          version == 'HTTP/1.1' and
+          headers.get('connection', '').lower() != 'close')
+      response = app.respond(method, target, headers)
+      writer.write(response.encode(keep_alive, head_only=method == 'HEAD'))
+      await writer.drain()
+      if not keep_alive:
+        return
+  except ConnectionError:
+    pass
+  finally:
+    writer.close()
+
+
+async def serve(
+    app: App, host: str = '127.0.0.1', port: int = 0) -> asyncio.Server:
+  """Returns a started server.  Port 0 picks a free port."""
+  return await asyncio.start_server(
+      lambda reader, writer: handle_connection(app, reader, writer),
+      host, port, limit=MAX_HEAD_SIZE)
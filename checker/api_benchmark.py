@@ -0,0 +1,149 @@
+"""Load test the STAC API server.
+
+Starts the server on a free port in a thread and sends a mix of requests from
+concurrent keep-alive connections:
+
+- /collections pages
+- /collections/{id} for random collections
+- /search with a random bbox, year, keyword, or title word
+
+Reports the p50 and p99 latency and the requests per second, once with the
+response cache and once without it.
+"""
+
+from collections.abc import Sequence
+import asyncio
+import random
+import statistics
+import threading
+import time
+
+from absl import app
+from absl import flags
+
+from checker import api
+from checker import stac
+from checker.index import text
+
+_REQUESTS = flags.DEFINE_integer(
+    'requests', 5000, 'Number of requests to send in each mode.')
+_CONCURRENCY = flags.DEFINE_integer(
+    'concurrency', 16, 'Number of connections sending requests at once.')
+_SEED = flags.DEFINE_integer('seed', 0, 'Random seed for picking requests.')
+
+
+def targets(catalog: api.Catalog, count: int, seed: int) -> list[str]:
+  """Returns a mix of request targets."""
+  rng = random.Random(seed)
+  words = sorted({
+      word for node in catalog.nodes
+      for word in text.tokenize(text.field_text(node, text.TITLE))})
+  keywords = catalog.keywords.keywords
+  result = []
+  for _ in range(count):
+    kind = rng.randrange(5)
+    if kind == 0:
+      result.append(f'/collections?limit={rng.choice((10, 50))}')
+    elif kind == 1:
+      result.append(f'/collections/{rng.choice(catalog.ids)}')
+    elif kind == 2:
+      x = rng.uniform(-180, 170)
+      y = rng.uniform(-90, 80)
+      result.append(f'/search?bbox={x:.1f},{y:.1f},{x + 10:.1f},{y + 10:.1f}')
+    elif kind == 3:
+      result.append(f'/search?datetime={rng.randrange(1980, 2024)}-01-01')
+    elif keywords and rng.randrange(2):
+      result.append(f'/search?keywords={rng.choice(keywords)}')
+    elif words:
+      result.append(f'/search?q={rng.choice(words)}')
+  return result
+
+
+async def _get(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+    target: str) -> None:
+  writer.write(
+      f'GET {target} HTTP/1.1\r\nHost: localhost\r\n'
+      f'Accept-Encoding: gzip\r\n\r\n'.encode('latin-1'))
+  head = await reader.readuntil(b'\r\n\r\n')
+  for line in head.split(b'\r\n'):
+    name, _, value = line.partition(b':')
+    if name.lower() == b'content-length':
+      await reader.readexactly(int(value))
+      return
+
+
+async def load_test(
+    port: int, target_list: list[str],
+    concurrency: int) -> tuple[list[float], float]:
+  """Returns the seconds taken by each request and in total."""
+  latencies = []
+  pending = iter(target_list)
+
+  async def client() -> None:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+      for target in pending:
+        start = time.perf_counter()
+        await _get(reader, writer, target)
+        latencies.append(time.perf_counter() - start)
+    finally:
+      writer.close()
+      await writer.wait_closed()
+
+  start = time.perf_counter()
+  await asyncio.gather(*(client() for _ in range(concurrency)))
+  return latencies, time.perf_counter() - start
+
+
+async def _stop(server: asyncio.Server) -> None:
+  """Closes the server once its connections have seen the clients go."""
+  server.close()
+  await server.wait_closed()
+  handlers = asyncio.all_tasks() - {asyncio.current_task()}
+  await asyncio.gather(*handlers, return_exceptions=True)
+
+
+def run(an_app: api.App, target_list: list[str], concurrency: int) -> str:
+  loop = asyncio.new_event_loop()
+  server = loop.run_until_complete(api.serve(an_app))
+  port = server.sockets[0].getsockname()[1]
+  thread = threading.Thread(target=loop.run_forever)
+  thread.start()
+  try:
+    latencies, seconds = asyncio.run(
+        load_test(port, target_list, concurrency))
+  finally:
+    asyncio.run_coroutine_threadsafe(_stop(server), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+  latencies.sort()
+  p50 = statistics.median(latencies)
+  p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+  return (
+      f'p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, '
+      f'{len(latencies) / seconds:.0f} requests/s')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  start = time.perf_counter()
+  nodes = stac.load(stac.stac_root())
+  catalog = api.Catalog(nodes)
+  print('Number of STAC nodes loaded:', len(nodes))
+  print(f'Startup: {(time.perf_counter() - start) * 1000:.1f} ms for '
+        f'{len(catalog)} collections')
+
+  target_list = targets(catalog, _REQUESTS.value, _SEED.value)
+  for name, cache_size in (('cached', api.CACHE_SIZE), ('uncached', 0)):
+    an_app = api.App(catalog, cache_size)
+    print(f'{name}: {run(an_app, target_list, _CONCURRENCY.value)}')
+    print(an_app.summary())
+
+
+if __name__ == '__main__':
+  app.run(main)
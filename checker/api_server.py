@@ -0,0 +1,52 @@
+"""Serve a STAC API over the catalog from in-memory indexes.
+
+STATUS: Experimental - For feedback
+
+  api_server --port=8080 [CATALOG]
+
+CATALOG is a directory of built json or an archive of one and defaults to the
+catalog in this tree.  See api for the endpoints.
+"""
+
+from collections.abc import Sequence
+import asyncio
+import pathlib
+import time
+
+from absl import app
+from absl import flags
+
+from checker import api
+from checker import stac
+
+_HOST = flags.DEFINE_string('host', '127.0.0.1', 'Address to listen on.')
+_PORT = flags.DEFINE_integer('port', 8080, 'Port to listen on.')
+_CACHE_SIZE = flags.DEFINE_integer(
+    'cache_size', api.CACHE_SIZE, 'Number of rendered responses to keep.')
+
+
+async def serve_forever(an_app: api.App, host: str, port: int) -> None:
+  server = await api.serve(an_app, host, port)
+  for sock in server.sockets:
+    print('Serving on http://{}:{}/'.format(*sock.getsockname()[:2]))
+  async with server:
+    await server.serve_forever()
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 2:
+    raise app.UsageError('Too many command-line arguments.')
+  root = pathlib.Path(argv[1]) if len(argv) > 1 else stac.stac_root()
+
+  start = time.perf_counter()
+  nodes = stac.load(root)
+  catalog = api.Catalog(nodes)
+  print(f'Loaded {len(nodes)} STAC nodes and indexed {len(catalog)} '
+        f'collections in {time.perf_counter() - start:.2f} s')
+  asyncio.run(
+      serve_forever(
+          api.App(catalog, _CACHE_SIZE.value), _HOST.value, _PORT.value))
+
+
+if __name__ == '__main__':
+  app.run(main)
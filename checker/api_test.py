@@ -0,0 +1,270 @@
+"""Tests for api."""
+
+import asyncio
+import gzip
+import hashlib
+import http.client
+import json
+import pathlib
+import threading
+
+from checker import api
+from checker import canonical
+from checker import stac
+import unittest
+
+COLLECTION = stac.StacType.COLLECTION
+CATALOG = stac.StacType.CATALOG
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+OK = 200
+NOT_MODIFIED = 304
+BAD_REQUEST = 400
+NOT_FOUND = 404
+
+
+def collection(
+    dataset_id: str, bbox: list[float], interval: list[object],
+    keywords: list[str], title: str) -> stac.Node:
+  return stac.Node(
+      dataset_id, pathlib.Path(dataset_id.replace('/', '_') + '.json'),
+      COLLECTION, IMAGE, {
+          'type': 'Collection',
+          'id': dataset_id,
+          'title': title,
+          'description': f'{title} description. ' * 20,
+          'keywords': keywords,
+          'extent': {
+              'spatial': {'bbox': [bbox]},
+              'temporal': {'interval': [interval]},
+          },
+      })
+
+
+def nodes() -> list[stac.Node]:
+  return [
+      stac.Node('A', pathlib.Path('A/catalog.json'), CATALOG, NONE, {
+          'type': 'Catalog', 'id': 'A'}),
+      collection(
+          'A/EUROPE', [-10, 35, 30, 70],
+          ['2000-01-01T00:00:00Z', '2010-01-01T00:00:00Z'],
+          ['landsat', 'sr'], 'Landsat surface reflectance over Europe'),
+      collection(
+          'A/GLOBAL', [-180, -90, 180, 90], ['1980-01-01T00:00:00Z', None],
+          ['climate', 'temperature'], 'Global temperature'),
+      collection(
+          'B/PACIFIC', [170, -20, -170, 20],
+          ['2015-01-01T00:00:00Z', '2020-01-01T00:00:00Z'],
+          ['landsat', 'toa'], 'Landsat top of atmosphere over the Pacific'),
+  ]
+
+
+class AppTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.app = api.App(api.Catalog(nodes()))
+
+  def get(self, target: str, **headers) -> tuple[api.Response, object]:
+    response = self.app.respond('GET', target, {
+        name.replace('_', '-'): value for name, value in headers.items()})
+    body = response.body
+    if response.headers.get('Content-Encoding') == 'gzip':
+      body = gzip.decompress(body)
+    return response, json.loads(body) if body else None
+
+  def ids(self, target: str) -> list[str]:
+    response, data = self.get(target)
+    self.assertEqual(OK, response.status, data)
+    return [item['id'] for item in data['collections']]
+
+  def test_collections(self):
+    response, data = self.get('/collections')
+    self.assertEqual(OK, response.status)
+    self.assertEqual(
+        ['A/EUROPE', 'A/GLOBAL', 'B/PACIFIC'],
+        [item['id'] for item in data['collections']])
+    self.assertEqual(3, data['numberMatched'])
+    self.assertEqual('application/json', response.headers['Content-Type'])
+    self.assertEqual(
+        '"' + hashlib.sha256(response.body).hexdigest() + '"',
+        response.headers['ETag'])
+
+  def test_collection(self):
+    response, data = self.get('/collections/A/GLOBAL')
+    self.assertEqual(OK, response.status)
+    node = nodes()[2]
+    self.assertEqual(node.stac, data)
+    self.assertEqual(canonical.dumps(node.stac), response.body)
+    self.assertEqual(f'"{node.fingerprint}"', response.headers['ETag'])
+    self.assertEqual(OK, self.get('/collections/A%2FGLOBAL')[0].status)
+
+  def test_not_found(self):
+    for target in ('/collections/A', '/collections/X/Y', '/nothing'):
+      with self.subTest(target=target):
+        response, data = self.get(target)
+        self.assertEqual(NOT_FOUND, response.status)
+        self.assertIn('description', data)
+
+  def test_method_not_allowed(self):
+    response = self.app.respond('POST', '/collections', {})
+    self.assertEqual(405, response.status)
+
+  def test_pages(self):
+    seen = []
+    target = '/collections?limit=2'
+    while target:
+      response, data = self.get(target)
+      self.assertEqual(OK, response.status)
+      self.assertLessEqual(data['numberReturned'], 2)
+      seen += [item['id'] for item in data['collections']]
+      next_links = [
+          link['href'] for link in data['links'] if link['rel'] == 'next']
+      target = next_links[0] if next_links else None
+    self.assertEqual(['A/EUROPE', 'A/GLOBAL', 'B/PACIFIC'], seen)
+
+  def test_cursor_from_another_catalog(self):
+    other = api.App(api.Catalog(nodes()[:2]))
+    _, data = self.get('/collections?limit=1')
+    next_href = data['links'][-1]['href']
+    response = other.respond('GET', next_href, {})
+    self.assertEqual(BAD_REQUEST, response.status)
+    self.assertEqual(BAD_REQUEST, self.get('/collections?cursor=xx')[0].status)
+
+  def test_search_bbox(self):
+    self.assertEqual(
+        ['A/EUROPE', 'A/GLOBAL'], self.ids('/search?bbox=0,40,1,41'))
+    # Crosses the antimeridian.
+    self.assertEqual(
+        ['A/GLOBAL', 'B/PACIFIC'], self.ids('/search?bbox=175,0,-175,1'))
+
+  def test_search_datetime(self):
+    self.assertEqual(
+        ['A/EUROPE', 'A/GLOBAL'], self.ids('/search?datetime=2005-06-01'))
+    self.assertEqual(
+        ['A/GLOBAL', 'B/PACIFIC'],
+        self.ids('/search?datetime=2012-01-01T00:00:00Z/..'))
+    self.assertEqual(
+        ['A/EUROPE', 'A/GLOBAL'], self.ids('/search?datetime=../2001-01-01'))
+
+  def test_search_keywords_and_text(self):
+    self.assertEqual(
+        ['A/EUROPE', 'B/PACIFIC'], self.ids('/search?keywords=landsat'))
+    self.assertEqual(['A/EUROPE'], self.ids('/search?keywords=landsat+-toa'))
+    self.assertEqual(['B/PACIFIC'], self.ids('/search?q=pacific'))
+    # All of the parameters must match.
+    self.assertEqual(
+        [], self.ids('/search?q=pacific&bbox=0,40,1,41'))
+    self.assertEqual(
+        ['A/EUROPE'], self.ids('/search?keywords=landsat&datetime=2005-01-01'))
+
+  def test_search_pages(self):
+    _, data = self.get('/search?keywords=landsat&limit=1')
+    self.assertEqual(['A/EUROPE'], [c['id'] for c in data['collections']])
+    self.assertEqual(2, data['numberMatched'])
+    self.assertEqual(
+        ['B/PACIFIC'], self.ids(data['links'][-1]['href']))
+    self.assertEqual(1, self.app.searches.misses)
+
+  def test_bad_parameters(self):
+    for target in (
+        '/search?bbox=1,2,3', '/search?bbox=a,b,c,d',
+        '/search?datetime=yesterday', '/search?keywords=(landsat',
+        '/collections?limit=0', '/collections?limit=x',
+        '/search?datetime=2020-01-01/2000-01-01', '/search?bbox=10,10,0,0',
+        '/search?bbox=nan,0,1,1', '/search?bbox=0,0,inf,1'):
+      with self.subTest(target=target):
+        self.assertEqual(BAD_REQUEST, self.get(target)[0].status)
+
+  def test_gzip_and_etag(self):
+    plain, _ = self.get('/collections')
+    response, data = self.get('/collections', accept_encoding='br;q=0, gzip')
+    self.assertEqual('gzip', response.headers['Content-Encoding'])
+    self.assertEqual(plain.body, gzip.decompress(response.body))
+    self.assertNotEqual(plain.headers['ETag'], response.headers['ETag'])
+    self.assertEqual(3, len(data['collections']))
+
+    not_modified, _ = self.get(
+        '/collections', accept_encoding='gzip',
+        if_none_match=response.headers['ETag'])
+    self.assertEqual(NOT_MODIFIED, not_modified.status)
+    self.assertEqual(b'', not_modified.body)
+    self.assertEqual(
+        OK, self.get('/collections', if_none_match='"other"')[0].status)
+
+  def test_small_bodies_are_not_compressed(self):
+    response, _ = self.get('/', accept_encoding='gzip')
+    self.assertNotIn('Content-Encoding', response.headers)
+
+  def test_cache(self):
+    self.get('/collections?limit=1')
+    self.get('/collections?limit=1', accept_encoding='gzip')
+    self.get('/collections?limit=1', accept_encoding='gzip')
+    self.assertEqual(1, self.app.bodies.misses)
+    self.assertEqual(2, self.app.bodies.hits)
+
+  def test_lru(self):
+    lru = api.Lru(2)
+    for key in ('a', 'b', 'a', 'c'):
+      lru.get(key, lambda key=key: key.upper())
+    self.assertEqual(['a', 'c'], list(lru.items))
+
+  def test_accepted_encodings(self):
+    self.assertEqual(
+        {'gzip', 'deflate'}, api.accepted_encodings('gzip, deflate;q=0.5'))
+    self.assertEqual(set(), api.accepted_encodings('gzip;q=0'))
+
+
+class ServerTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.app = api.App(api.Catalog(nodes()))
+    self.loop = asyncio.new_event_loop()
+    self.server = self.loop.run_until_complete(api.serve(self.app))
+    self.port = self.server.sockets[0].getsockname()[1]
+    self.thread = threading.Thread(target=self.loop.run_forever)
+    self.thread.start()
+
+  def tearDown(self):
+    async def stop():
+      self.server.close()
+      await self.server.wait_closed()
+    asyncio.run_coroutine_threadsafe(stop(), self.loop).result()
+    self.loop.call_soon_threadsafe(self.loop.stop)
+    self.thread.join()
+    self.loop.close()
+    super().tearDown()
+
+  def test_keep_alive(self):
+    connection = http.client.HTTPConnection('127.0.0.1', self.port)
+    try:
+      for target in ('/collections', '/collections/A/EUROPE', '/nothing'):
+        connection.request('GET', target)
+        response = connection.getresponse()
+        body = response.read()
+        expected = self.app.respond('GET', target, {})
+        self.assertEqual(expected.status, response.status)
+        self.assertEqual(expected.body, body)
+      connection.request('HEAD', '/collections')
+      response = connection.getresponse()
+      self.assertEqual(b'', response.read())
+      self.assertGreater(int(response.getheader('Content-Length')), 0)
+    finally:
+      connection.close()
+
+  def test_bad_request_line(self):
+    async def send() -> bytes:
+      reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+      writer.write(b'nonsense\r\n\r\n')
+      await writer.drain()
+      data = await reader.read()
+      writer.close()
+      return data
+    data = asyncio.run_coroutine_threadsafe(send(), self.loop).result()
+    self.assertTrue(data.startswith(b'HTTP/1.1 400 '))
+
+
+if __name__ == '__main__':
+  unittest.main()
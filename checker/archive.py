@@ -0,0 +1,126 @@
+"""Reads the STAC json files from a zip or tar archive of the catalog.
+
+The build ships the catalog between stages as an archive.  Rather than
+extracting it, the members are streamed out of the archive:
+
+- .zip
+- .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz
+- .tar.zst and .tzst, with the zstandard package
+
+Member names become paths relative to the catalog root.  A leading ./ and a
+leading catalog/ directory are dropped, so archives of either the contents of
+catalog or the catalog directory itself work.
+
+A thread reads and decompresses the members into a small queue while the
+caller parses them.  zlib, bz2, lzma, and zstandard release the GIL while
+decompressing, so the two overlap.
+"""
+
+import pathlib
+import queue
+import tarfile
+import threading
+from typing import BinaryIO, Iterator
+import zipfile
+
+CATALOG_DIR = 'catalog'
+JSON_SUFFIX = '.json'
+
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = (
+    '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ZSTD_SUFFIXES = ('.tar.zst', '.tzst')
+
+# The number of members read ahead of the parser.
+QUEUE_SIZE = 64
+
+_DONE = object()
+
+
+def is_archive(path: pathlib.Path) -> bool:
+  name = path.name.lower()
+  return path.is_file() and name.endswith(
+      ZIP_SUFFIXES + TAR_SUFFIXES + ZSTD_SUFFIXES)
+
+
+def relative_path(member_name: str) -> pathlib.Path:
+  """Returns the path of a member relative to the catalog root."""
+  parts = [part for part in member_name.split('/') if part not in ('', '.')]
+  if len(parts) > 1 and parts[0] == CATALOG_DIR:
+    parts = parts[1:]
+  return pathlib.Path(*parts)
+
+
+def _zip_members(path: pathlib.Path) -> Iterator[tuple[pathlib.Path, bytes]]:
+  with zipfile.ZipFile(path) as zip_file:
+    for info in zip_file.infolist():
+      if not info.is_dir() and info.filename.endswith(JSON_SUFFIX):
+        yield relative_path(info.filename), zip_file.read(info)
+
+
+def _tar_members(
+    fileobj: BinaryIO, mode: str) -> Iterator[tuple[pathlib.Path, bytes]]:
+  # The | modes read the stream front to back without seeking.
+  with tarfile.open(fileobj=fileobj, mode=mode) as tar_file:
+    for info in tar_file:
+      if info.isfile() and info.name.endswith(JSON_SUFFIX):
+        yield relative_path(info.name), tar_file.extractfile(info).read()
+
+
+def _zstd_reader(path: pathlib.Path, raw: BinaryIO) -> BinaryIO:
+  try:
+    import zstandard  # pylint: disable=g-import-not-at-top
+  except ImportError as e:
+    raise ValueError(f'Reading {path} needs the zstandard package') from e
+  return zstandard.ZstdDecompressor().stream_reader(raw)
+
+
+def read_members(path: pathlib.Path) -> Iterator[tuple[pathlib.Path, bytes]]:
+  """Yields the relative path and contents of the json files in an archive.
+
+  This reads in the calling thread.  See members to read ahead.
+  """
+  name = path.name.lower()
+  if name.endswith(ZIP_SUFFIXES):
+    yield from _zip_members(path)
+  elif name.endswith(ZSTD_SUFFIXES):
+    with open(path, 'rb') as raw:
+      with _zstd_reader(path, raw) as reader:
+        yield from _tar_members(reader, 'r|')
+  elif name.endswith(TAR_SUFFIXES):
+    with open(path, 'rb') as raw:
+      yield from _tar_members(raw, 'r|*')
+  else:
+    raise ValueError(f'Not a zip or tar archive: {path}')
+
+
+def members(path: pathlib.Path) -> Iterator[tuple[pathlib.Path, bytes]]:
+  """Yields the same as read_members, reading ahead in another thread."""
+  items = queue.Queue(maxsize=QUEUE_SIZE)
+  stop = threading.Event()
+
+  def produce() -> None:
+    try:
+      for item in read_members(path):
+        items.put(item)
+        if stop.is_set():
+          return
+    except Exception as e:  # pylint: disable=broad-except
+      items.put(e)
+    items.put(_DONE)
+
+  thread = threading.Thread(target=produce, daemon=True)
+  thread.start()
+  try:
+    while (item := items.get()) is not _DONE:
+      if isinstance(item, Exception):
+        raise item
+      yield item
+  finally:
+    # If the caller stopped early, unblock the reader so it can finish.
+    stop.set()
+    while thread.is_alive():
+      try:
+        items.get(timeout=0.01)
+      except queue.Empty:
+        pass
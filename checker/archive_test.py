@@ -0,0 +1,117 @@
+"""Tests for archive."""
+
+import io
+import json
+import pathlib
+import tarfile
+import tempfile
+from unittest import mock
+import zipfile
+
+from checker import archive
+from checker import stac
+import unittest
+
+FILES = {
+    'catalog.json': {'id': 'GEE_catalog', 'type': 'Catalog'},
+    'A/catalog.json': {'id': 'A', 'type': 'Catalog'},
+    'A/A_B.json': {'id': 'A/B', 'type': 'Collection', 'gee:type': 'image'},
+}
+
+
+def write_zip(path: pathlib.Path, prefix: str) -> None:
+  with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+    zip_file.writestr(prefix + 'README.md', 'not json')
+    for name, data in FILES.items():
+      zip_file.writestr(prefix + name, json.dumps(data))
+
+
+def write_tar(path: pathlib.Path, mode: str, prefix: str) -> None:
+  with tarfile.open(path, mode) as tar_file:
+    for name, data in FILES.items():
+      contents = json.dumps(data).encode('utf-8')
+      info = tarfile.TarInfo(prefix + name)
+      info.size = len(contents)
+      tar_file.addfile(info, io.BytesIO(contents))
+
+
+class ArchiveTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.dir = pathlib.Path(self.tmp_dir.name)
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  def assert_members(self, path: pathlib.Path) -> None:
+    self.assertEqual(
+        {pathlib.Path(name): data for name, data in FILES.items()},
+        {relative: json.loads(contents)
+         for relative, contents in archive.members(path)})
+
+  def test_relative_path(self):
+    self.assertEqual(
+        pathlib.Path('A/A_B.json'), archive.relative_path('./A/A_B.json'))
+    self.assertEqual(
+        pathlib.Path('A/A_B.json'),
+        archive.relative_path('catalog/A/A_B.json'))
+    self.assertEqual(
+        pathlib.Path('catalog.json'), archive.relative_path('catalog.json'))
+
+  def test_is_archive(self):
+    path = self.dir / 'catalog.tar.gz'
+    self.assertFalse(archive.is_archive(path))
+    write_tar(path, 'w:gz', '')
+    self.assertTrue(archive.is_archive(path))
+    self.assertFalse(archive.is_archive(self.dir))
+
+  def test_zip(self):
+    for prefix in ('', 'catalog/'):
+      with self.subTest(prefix=prefix):
+        path = self.dir / 'catalog.zip'
+        write_zip(path, prefix)
+        self.assert_members(path)
+
+  def test_tar(self):
+    for suffix, mode in (
+        ('.tar', 'w'), ('.tar.gz', 'w:gz'), ('.tgz', 'w:gz'),
+        ('.tar.bz2', 'w:bz2'), ('.tar.xz', 'w:xz')):
+      for prefix in ('', './', 'catalog/'):
+        with self.subTest(suffix=suffix, prefix=prefix):
+          path = self.dir / f'catalog{suffix}'
+          write_tar(path, mode, prefix)
+          self.assert_members(path)
+
+  def test_not_an_archive(self):
+    with self.assertRaisesRegex(ValueError, 'Not a zip or tar'):
+      list(archive.members(self.dir / 'catalog.rar'))
+
+  def test_corrupt_archive(self):
+    path = self.dir / 'catalog.tar.gz'
+    path.write_bytes(b'not gzip')
+    with self.assertRaises(tarfile.TarError):
+      list(archive.members(path))
+
+  def test_stop_early(self):
+    path = self.dir / 'catalog.zip'
+    write_zip(path, '')
+    # With a queue of 1, the reader blocks until the close drains it.
+    with mock.patch.object(archive, 'QUEUE_SIZE', 1):
+      members = archive.members(path)
+      next(members)
+      members.close()
+
+  def test_load(self):
+    path = self.dir / 'catalog.tar.gz'
+    write_tar(path, 'w:gz', 'catalog/')
+    nodes = sorted(stac.load(path), key=lambda node: node.id)
+    self.assertEqual(['A', 'A/B', 'GEE_catalog'], [node.id for node in nodes])
+    self.assertEqual(pathlib.Path('A/A_B.json'), nodes[1].path)
+    self.assertEqual(stac.GeeType.IMAGE, nodes[1].gee_type)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,128 @@
+"""Read and write files of named arrays that are loaded with mmap.
+
+The layout, which encode and decode also use for in memory buffers, is:
+
+- magic: bytes that identify the kind of file
+- uint64 little endian length of the header
+- the header as json: the caller's metadata plus where each array is
+- each array's raw little endian bytes, aligned to 8 bytes
+
+Loading maps the file and returns memoryviews into it, so large numeric arrays
+are used in place without being copied or parsed.  Decoding a buffer, such as
+a shared memory block, does the same.
+"""
+
+import array
+import json
+import mmap
+import pathlib
+import struct
+import sys
+from typing import Optional, Union
+
+ALIGN = 8
+ARRAYS = 'arrays'
+METADATA = 'metadata'
+
+_LENGTH = struct.Struct('<Q')
+
+Array = Union[array.array, memoryview]
+
+
+def _padding(offset: int) -> int:
+  return -offset % ALIGN
+
+
+def _typecode(values: Array) -> str:
+  if isinstance(values, memoryview):
+    return values.format
+  return values.typecode
+
+
+def _to_bytes(values: Array) -> bytes:
+  if sys.byteorder == 'little':
+    return memoryview(values).tobytes()
+  values = array.array(_typecode(values), values)
+  values.byteswap()
+  return values.tobytes()
+
+
+def encode(
+    magic: bytes, metadata: object, arrays: dict[str, Array]) -> bytes:
+  """Returns metadata and arrays in the file layout."""
+  array_bytes = {name: _to_bytes(values) for name, values in arrays.items()}
+  array_info = {}
+  offset = 0
+  for name, data in array_bytes.items():
+    array_info[name] = {
+        'typecode': _typecode(arrays[name]),
+        'offset': offset,
+        'nbytes': len(data),
+    }
+    offset += len(data) + _padding(len(data))
+
+  header = json.dumps({METADATA: metadata, ARRAYS: array_info}).encode('utf-8')
+  header += b' ' * _padding(len(magic) + _LENGTH.size + len(header))
+
+  parts = [magic, _LENGTH.pack(len(header)), header]
+  for data in array_bytes.values():
+    parts.append(data)
+    parts.append(b'\0' * _padding(len(data)))
+  return b''.join(parts)
+
+
+def save(
+    path: pathlib.Path, magic: bytes, metadata: object,
+    arrays: dict[str, Array]) -> None:
+  """Writes metadata and arrays to path."""
+  path.write_bytes(encode(magic, metadata, arrays))
+
+
+def decode(
+    buffer, magic: bytes,
+    source: Optional[object] = None) -> tuple[object, dict[str, Array]]:
+  """Returns the metadata and memoryviews of the arrays in buffer.
+
+  On big endian machines, the arrays are copied and byte swapped.
+
+  Args:
+    buffer: Anything that supports the buffer protocol.
+    magic: The bytes buffer must start with.
+    source: Where buffer came from for error messages.
+
+  Raises:
+    ValueError: if the buffer does not start with magic.
+  """
+  view = memoryview(buffer)
+  if view[:len(magic)] != magic:
+    raise ValueError(
+        f'Expected {magic!r} at the start of: {source or "buffer"}')
+  header_start = len(magic) + _LENGTH.size
+  (header_len,) = _LENGTH.unpack(view[len(magic):header_start])
+  data_start = header_start + header_len
+  header = json.loads(bytes(view[header_start:data_start]))
+
+  arrays = {}
+  for name, info in header[ARRAYS].items():
+    start = data_start + info['offset']
+    values = view[start:start + info['nbytes']].cast(info['typecode'])
+    if sys.byteorder != 'little':
+      values = array.array(info['typecode'], values)
+      values.byteswap()
+    arrays[name] = values
+
+  return header[METADATA], arrays
+
+
+def load(
+    path: pathlib.Path, magic: bytes) -> tuple[object, dict[str, Array]]:
+  """Returns the metadata and arrays in path.
+
+  On big endian machines, the arrays are copied and byte swapped.
+
+  Raises:
+    ValueError: if the file does not start with magic.
+  """
+  with open(path, 'rb') as f:
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  return decode(mapped, magic, path)
@@ -0,0 +1,76 @@
+"""Tests for array_file."""
+
+import array
+import pathlib
+import tempfile
+
+from checker import array_file
+import unittest
+
+MAGIC = b'TEST0001'
+
+
+class ArrayFileTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.path = pathlib.Path(self.tmp_dir.name) / 'arrays.bin'
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  def test_round_trip(self):
+    arrays = {
+        'bytes': array.array('B', [1, 2, 3]),
+        'floats': array.array('d', [1.5, -2.25]),
+        'empty': array.array('q'),
+        'ints': array.array('q', [-(2**40), 7]),
+    }
+    metadata = {'names': ['a', 'b'], 'count': 2}
+    array_file.save(self.path, MAGIC, metadata, arrays)
+
+    loaded_metadata, loaded = array_file.load(self.path, MAGIC)
+    self.assertEqual(metadata, loaded_metadata)
+    self.assertEqual(list(arrays), list(loaded))
+    for name, values in arrays.items():
+      self.assertIsInstance(loaded[name], memoryview)
+      self.assertEqual(values.typecode, loaded[name].format)
+      self.assertEqual(list(values), list(loaded[name]))
+
+  def test_save_memoryview(self):
+    arrays = {'floats': memoryview(array.array('d', [3.0, 4.0]))}
+    array_file.save(self.path, MAGIC, None, arrays)
+    metadata, loaded = array_file.load(self.path, MAGIC)
+    self.assertIsNone(metadata)
+    self.assertEqual([3.0, 4.0], list(loaded['floats']))
+
+  def test_arrays_are_aligned(self):
+    arrays = {'bytes': array.array('B', [1]), 'floats': array.array('d', [2])}
+    array_file.save(self.path, MAGIC, 'x', arrays)
+    _, loaded = array_file.load(self.path, MAGIC)
+    data = self.path.read_bytes()
+    offset = data.index(array.array('d', [2]).tobytes())
+    self.assertEqual(0, offset % array_file.ALIGN)
+    self.assertEqual([2.0], list(loaded['floats']))
+
+  def test_decode_buffer(self):
+    arrays = {'ints': array.array('q', [5, 6])}
+    encoded = bytearray(array_file.encode(MAGIC, [1], arrays))
+    # Trailing bytes, like the page rounding of shared memory, are ignored.
+    encoded += b'\0' * 13
+    metadata, decoded = array_file.decode(encoded, MAGIC)
+    self.assertEqual([1], metadata)
+    self.assertEqual([5, 6], list(decoded['ints']))
+    array_file.save(self.path, MAGIC, [1], arrays)
+    self.assertEqual(encoded[:-13], self.path.read_bytes())
+
+  def test_wrong_magic(self):
+    array_file.save(self.path, MAGIC, {}, {})
+    with self.assertRaisesRegex(ValueError, 'Expected'):
+      array_file.load(self.path, b'OTHER001')
+
+
+if __name__ == '__main__':
+  unittest.main()
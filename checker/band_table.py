@@ -0,0 +1,165 @@
+"""Columnar table of every band in summaries.eo:bands across the catalog.
+
+Walking the nested dicts of every Node for band level questions is slow when
+there are hundreds of collections with hundreds of bands each.  This module
+flattens all the bands into one row per band with these columns:
+
+- id: the dataset id
+- name: the band name
+- center_wavelength, gsd, gee:scale, gee:offset: float64, NaN when missing
+- gee:units
+
+The string columns are dictionary encoded as uint32 codes into a per column
+list of strings.  Code 0 is always the empty string and marks a missing value.
+
+The table can be saved to a single array_file that is loaded with mmap so the
+numeric and code columns are used in place without copying or parsing.
+"""
+
+import array
+import dataclasses
+import math
+import pathlib
+from typing import Iterator, Union
+
+from checker import array_file
+from checker import stac
+
+SUMMARIES = 'summaries'
+EO_BANDS = 'eo:bands'
+
+ID = 'id'
+NAME = 'name'
+CENTER_WAVELENGTH = 'center_wavelength'
+GSD = 'gsd'
+GEE_SCALE = 'gee:scale'
+GEE_OFFSET = 'gee:offset'
+GEE_UNITS = 'gee:units'
+
+STRING_COLUMNS = (ID, NAME, GEE_UNITS)
+FLOAT_COLUMNS = (CENTER_WAVELENGTH, GSD, GEE_SCALE, GEE_OFFSET)
+
+MAGIC = b'EEBANDS1'
+MISSING = ''
+_CODE_TYPE = 'I'
+_FLOAT_TYPE = 'd'
+
+Column = array_file.Array
+
+
+@dataclasses.dataclass
+class BandTable:
+  """All bands in the catalog, one column per field."""
+  num_rows: int
+  # For each string column, the string for each code.
+  dictionaries: dict[str, list[str]]
+  # uint32 codes for string columns and float64 values for the rest.
+  columns: dict[str, Column]
+
+  def __len__(self) -> int:
+    return self.num_rows
+
+  def code(self, column: str, value: str) -> int:
+    """Returns the code for a string or -1 if it is not in the column."""
+    try:
+      return self.dictionaries[column].index(value)
+    except ValueError:
+      return -1
+
+  def value(self, column: str, row: int) -> Union[str, float]:
+    if column in self.dictionaries:
+      return self.dictionaries[column][self.columns[column][row]]
+    return self.columns[column][row]
+
+  def row(self, row: int) -> dict[str, Union[str, float]]:
+    return {column: self.value(column, row) for column in self.columns}
+
+  def rows_where(self, column: str, value: str) -> Iterator[int]:
+    """Yields the rows where a string column is equal to value."""
+    code = self.code(column, value)
+    if code < 0:
+      return
+    for row, row_code in enumerate(self.columns[column]):
+      if row_code == code:
+        yield row
+
+
+class _Encoder:
+  """Builds the dictionary for one string column."""
+
+  def __init__(self):
+    self.strings = [MISSING]
+    self.codes = {MISSING: 0}
+
+  def encode(self, value: object) -> int:
+    if not isinstance(value, str):
+      return 0
+    code = self.codes.get(value)
+    if code is None:
+      code = len(self.strings)
+      self.codes[value] = code
+      self.strings.append(value)
+    return code
+
+
+def _float(value: object) -> float:
+  # bool is an int, but is never a valid band number.
+  if isinstance(value, bool) or not isinstance(value, (int, float)):
+    return math.nan
+  return float(value)
+
+
+def bands(node: stac.Node) -> list[dict[str, object]]:
+  summaries = node.stac.get(SUMMARIES)
+  if not isinstance(summaries, dict):
+    return []
+  node_bands = summaries.get(EO_BANDS)
+  if not isinstance(node_bands, list):
+    return []
+  return [band for band in node_bands if isinstance(band, dict)]
+
+
+def build(nodes: list[stac.Node]) -> BandTable:
+  """Returns a table with all of the bands of the nodes."""
+  encoders = {column: _Encoder() for column in STRING_COLUMNS}
+  columns = {column: array.array(_CODE_TYPE) for column in STRING_COLUMNS}
+  columns.update(
+      {column: array.array(_FLOAT_TYPE) for column in FLOAT_COLUMNS})
+
+  id_encoder = encoders[ID]
+  num_rows = 0
+  for node in nodes:
+    node_bands = bands(node)
+    if not node_bands:
+      continue
+    id_code = id_encoder.encode(node.id)
+    for band in node_bands:
+      num_rows += 1
+      columns[ID].append(id_code)
+      for column in (NAME, GEE_UNITS):
+        columns[column].append(encoders[column].encode(band.get(column)))
+      for column in FLOAT_COLUMNS:
+        columns[column].append(_float(band.get(column)))
+
+  dictionaries = {
+      column: encoder.strings for column, encoder in encoders.items()}
+  return BandTable(num_rows, dictionaries, columns)
+
+
+def save(table: BandTable, path: pathlib.Path) -> None:
+  """Writes the table to a file that load can memory map."""
+  metadata = {'num_rows': table.num_rows, 'dictionaries': table.dictionaries}
+  array_file.save(path, MAGIC, metadata, table.columns)
+
+
+def load(path: pathlib.Path) -> BandTable:
+  """Returns a table with columns that are views into a memory map of path.
+
+  Raises:
+    ValueError: if path is not a band table.
+  """
+  try:
+    metadata, columns = array_file.load(path, MAGIC)
+  except ValueError as e:
+    raise ValueError(f'Not a band table: {path}') from e
+  return BandTable(metadata['num_rows'], metadata['dictionaries'], columns)
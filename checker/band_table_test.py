@@ -0,0 +1,97 @@
+"""Tests for band_table."""
+
+import math
+import pathlib
+import tempfile
+
+from checker import band_table
+from checker import stac
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def collection_node(dataset_id: str, bands) -> stac.Node:
+  stac_data = {'summaries': {'eo:bands': bands}}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+NODES = [
+    stac.Node('A', FILE_PATH, CATALOG, NONE, {}),
+    collection_node('A/b', [
+        {'name': 'B1', 'center_wavelength': 0.49, 'gsd': 30,
+         'gee:scale': 0.0001, 'gee:units': 'm'},
+        {'name': 'B2', 'gee:offset': -0.2, 'gee:units': 'm'},
+    ]),
+    collection_node('A/c', [
+        {'name': 'B1', 'gsd': 'not a number'},
+        'not a dict',
+    ]),
+    collection_node('A/d', 'not a list'),
+]
+
+
+class BandTableTest(unittest.TestCase):
+
+  def check_table(self, table: band_table.BandTable):
+    self.assertEqual(3, len(table))
+    self.assertEqual(['', 'A/b', 'A/c'], list(table.dictionaries['id']))
+    self.assertEqual(['', 'B1', 'B2'], list(table.dictionaries['name']))
+    self.assertEqual([1, 1, 2], list(table.columns['id']))
+    self.assertEqual([1, 2, 1], list(table.columns['name']))
+
+    first = table.row(0)
+    self.assertEqual('A/b', first['id'])
+    self.assertEqual('B1', first['name'])
+    self.assertEqual(0.49, first['center_wavelength'])
+    self.assertEqual(30.0, first['gsd'])
+    self.assertEqual(0.0001, first['gee:scale'])
+    self.assertTrue(math.isnan(first['gee:offset']))
+    self.assertEqual('m', first['gee:units'])
+
+    second = table.row(1)
+    self.assertEqual(-0.2, second['gee:offset'])
+
+    third = table.row(2)
+    self.assertEqual('A/c', third['id'])
+    self.assertTrue(math.isnan(third['gsd']))
+    self.assertEqual(band_table.MISSING, third['gee:units'])
+
+    self.assertEqual([0, 2], list(table.rows_where('name', 'B1')))
+    self.assertEqual([], list(table.rows_where('name', 'missing')))
+
+  def test_build(self):
+    self.check_table(band_table.build(NODES))
+
+  def test_save_and_load(self):
+    table = band_table.build(NODES)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'bands.bin'
+      band_table.save(table, path)
+      loaded = band_table.load(path)
+      self.assertIsInstance(loaded.columns['gsd'], memoryview)
+      self.check_table(loaded)
+
+  def test_empty(self):
+    table = band_table.build([])
+    self.assertEqual(0, len(table))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'bands.bin'
+      band_table.save(table, path)
+      self.assertEqual(0, len(band_table.load(path)))
+
+  def test_load_not_a_band_table(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'bands.bin'
+      path.write_bytes(b'not a band table')
+      with self.assertRaisesRegex(ValueError, 'Not a band table'):
+        band_table.load(path)
+
+
+if __name__ == '__main__':
+  unittest.main()
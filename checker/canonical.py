@@ -0,0 +1,169 @@
+"""Canonical json for STAC nodes and fingerprints of it.
+
+json.dumps output depends on the key order of the dicts and on how Python
+formats floats, so the same content can have different bytes.  The canonical
+form follows RFC 8785 (JSON Canonicalization Scheme), plus NFC strings:
+
+- no whitespace
+- object keys sorted by their UTF-16 code units
+- strings NFC normalized, with only the escapes json requires
+- numbers formatted like ECMAScript, so 1.0 and 1 are both 1, and 1e-7,
+  0.000001, and 1e+21 have one spelling each
+
+Most nodes come out of json.dumps with sorted keys already canonical, so
+dumps tries that first, in C.  It falls back to iter_encode if the text has
+a float that repr formats differently (1.0, 1e-05, 1e+16), a string that is
+not NFC, or a character outside the BMP.  json.dumps sorts keys by code
+point, which only differs from UTF-16 order for those characters.  The
+checks look at the whole text, so a string like "v1.0," also takes the
+slower path, which gives the same bytes.
+
+fingerprint is the sha256 of the same bytes.  On the slow path it hashes the
+pieces from iter_encode in blocks as they are made.  stac.Node.fingerprint
+caches it per node.
+"""
+
+import hashlib
+import json
+import math
+import re
+from typing import Iterator, Optional
+import unicodedata
+
+# How many bytes to collect before updating the hash.
+BUFFER_SIZE = 1 << 16
+
+_encode_string = json.encoder.encode_basestring
+
+# Numbers that json.dumps formats differently from the canonical form.
+_INTEGRAL_FLOAT = re.compile(r'\.0(?:[,\]}]|$)')
+_EXPONENT = re.compile(r'e[-+]\d+(?:[,\]}]|$)')
+_OUTSIDE_BMP = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def _string(value: str) -> str:
+  if not value.isascii():
+    value = unicodedata.normalize('NFC', value)
+  return _encode_string(value)
+
+
+def _utf16(key: str) -> bytes:
+  return key.encode('utf-16-be')
+
+
+def number(value: float) -> str:
+  """Returns a float formatted like ECMAScript Number.prototype.toString."""
+  if not math.isfinite(value):
+    raise ValueError(f'Not a json number: {value}')
+  if value == 0:
+    return '0'
+  if value.is_integer() and abs(value) < 1e21:
+    return str(int(value))
+
+  sign = '-' if value < 0 else ''
+  # repr gives the shortest digits that round trip.
+  mantissa, _, exponent = repr(abs(value)).partition('e')
+  whole, _, fraction = mantissa.partition('.')
+  digits = whole + fraction
+  stripped = digits.lstrip('0')
+  # The value is 0.digits * 10**point.
+  point = len(whole) + int(exponent or 0) - (len(digits) - len(stripped))
+  digits = stripped.rstrip('0')
+  count = len(digits)
+  if count <= point <= 21:
+    return sign + digits + '0' * (point - count)
+  if 0 < point <= 21:
+    return sign + digits[:point] + '.' + digits[point:]
+  if -6 < point <= 0:
+    return sign + '0.' + '0' * -point + digits
+  power = point - 1
+  mantissa = digits[0] + ('.' + digits[1:] if count > 1 else '')
+  return f'{sign}{mantissa}e{"+" if power > 0 else "-"}{abs(power)}'
+
+
+def iter_encode(value: object) -> Iterator[str]:
+  """Yields the canonical json of value in pieces."""
+  if isinstance(value, str):
+    yield _string(value)
+  elif value is None:
+    yield 'null'
+  elif value is True:
+    yield 'true'
+  elif value is False:
+    yield 'false'
+  elif isinstance(value, int):
+    yield str(value)
+  elif isinstance(value, float):
+    yield number(value)
+  elif isinstance(value, dict):
+    items = {}
+    for key, item in value.items():
+      if not isinstance(key, str):
+        raise TypeError(f'Keys must be str: {key!r}')
+      if not key.isascii():
+        key = unicodedata.normalize('NFC', key)
+      if key in items:
+        raise ValueError(f'Duplicate key after NFC normalization: {key}')
+      items[key] = item
+    yield '{'
+    first = True
+    for key in sorted(items, key=_utf16):
+      if not first:
+        yield ','
+      first = False
+      yield _encode_string(key)
+      yield ':'
+      yield from iter_encode(items[key])
+    yield '}'
+  elif isinstance(value, (list, tuple)):
+    yield '['
+    for index, item in enumerate(value):
+      if index:
+        yield ','
+      yield from iter_encode(item)
+    yield ']'
+  else:
+    raise TypeError(f'Not json: {type(value).__name__}')
+
+
+def _json_dumps(value: object) -> Optional[str]:
+  """Returns json.dumps of value if that is canonical or else None."""
+  text = json.dumps(
+      value, ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+      sort_keys=True)
+  if _INTEGRAL_FLOAT.search(text) or _EXPONENT.search(text):
+    return None
+  if not text.isascii() and (
+      _OUTSIDE_BMP.search(text) or
+      not unicodedata.is_normalized('NFC', text)):
+    return None
+  return text
+
+
+def dumps(value: object) -> bytes:
+  """Returns the canonical json of value as utf-8."""
+  text = _json_dumps(value)
+  if text is None:
+    text = ''.join(iter_encode(value))
+  return text.encode('utf-8')
+
+
+def fingerprint(value: object) -> str:
+  """Returns the hex sha256 of dumps(value)."""
+  digest = hashlib.sha256()
+  text = _json_dumps(value)
+  if text is not None:
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+  pieces = []
+  size = 0
+  for piece in iter_encode(value):
+    pieces.append(piece)
+    size += len(piece)
+    if size >= BUFFER_SIZE:
+      digest.update(''.join(pieces).encode('utf-8'))
+      pieces = []
+      size = 0
+  digest.update(''.join(pieces).encode('utf-8'))
+  return digest.hexdigest()
@@ -0,0 +1,67 @@
+"""Time canonical serialization and fingerprints of the whole catalog.
+
+Reports the throughput of json.dumps with sorted keys for comparison,
+canonical.dumps, canonical.fingerprint, and the cached Node.fingerprint.
+"""
+
+from collections.abc import Sequence
+import json
+import time
+from typing import Callable
+
+from absl import app
+from absl import flags
+
+from checker import canonical
+from checker import stac
+
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 3, 'Number of times to process the catalog in each mode.')
+
+
+def best_seconds(
+    stacs: list[dict[str, object]], function: Callable[[object], object],
+    repeats: int) -> float:
+  best = float('inf')
+  for _ in range(repeats):
+    start = time.perf_counter()
+    for stac_data in stacs:
+      function(stac_data)
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  nodes = stac.load(stac.stac_root())
+  stacs = [node.stac for node in nodes]
+  total_bytes = sum(len(canonical.dumps(stac_data)) for stac_data in stacs)
+  print('Number of STAC nodes loaded:', len(nodes))
+  print(f'Canonical bytes: {total_bytes}')
+
+  for name, function in (
+      ('json.dumps', lambda value: json.dumps(value, sort_keys=True)),
+      ('canonical.dumps', canonical.dumps),
+      ('canonical.fingerprint', canonical.fingerprint),
+  ):
+    seconds = best_seconds(stacs, function, _REPEATS.value)
+    print(f'{name}: {seconds * 1000:.1f} ms, '
+          f'{len(nodes) / seconds:.0f} nodes/s, '
+          f'{total_bytes / seconds / 1e6:.1f} MB/s')
+
+  start = time.perf_counter()
+  for a_node in nodes:
+    a_node.fingerprint  # pylint: disable=pointless-statement
+  first = time.perf_counter() - start
+  start = time.perf_counter()
+  for a_node in nodes:
+    a_node.fingerprint  # pylint: disable=pointless-statement
+  cached = time.perf_counter() - start
+  print(f'Node.fingerprint: {first * 1000:.1f} ms the first time, '
+        f'{cached * 1000:.3f} ms cached')
+
+
+if __name__ == '__main__':
+  app.run(main)
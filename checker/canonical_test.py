@@ -0,0 +1,129 @@
+"""Tests for canonical."""
+
+import hashlib
+import json
+import math
+
+from checker import canonical
+import unittest
+
+
+class NumberTest(unittest.TestCase):
+
+  def test_numbers(self):
+    # The expected values are what ECMAScript's Number toString gives.
+    for value, expected in (
+        (0.0, '0'),
+        (-0.0, '0'),
+        (1.0, '1'),
+        (-2.0, '-2'),
+        (0.5, '0.5'),
+        (123.456, '123.456'),
+        (0.001, '0.001'),
+        (0.000001, '0.000001'),
+        (1e-7, '1e-7'),
+        (-1.5e-7, '-1.5e-7'),
+        (1e20, '100000000000000000000'),
+        (1e21, '1e+21'),
+        (1.5e22, '1.5e+22'),
+        (5e-324, '5e-324'),
+        (1.7976931348623157e308, '1.7976931348623157e+308'),
+    ):
+      with self.subTest(value=value):
+        self.assertEqual(expected, canonical.number(value))
+        self.assertEqual(value, float(canonical.number(value)))
+
+  def test_not_finite(self):
+    for value in (math.inf, -math.inf, math.nan):
+      with self.assertRaisesRegex(ValueError, 'Not a json number'):
+        canonical.number(value)
+
+
+class DumpsTest(unittest.TestCase):
+
+  def test_sorted_and_compact(self):
+    self.assertEqual(
+        b'{"a":[1,2.5,true,false,null],"b":{"c":"d"}}',
+        canonical.dumps({'b': {'c': 'd'}, 'a': [1, 2.5, True, False, None]}))
+
+  def test_key_order_does_not_matter(self):
+    first = {'x': 1, 'y': {'p': 1.0, 'q': [3]}}
+    second = json.loads('{"y": {"q": [3], "p": 1}, "x": 1.0}')
+    self.assertEqual(canonical.dumps(first), canonical.dumps(second))
+
+  def test_keys_sort_by_code_point(self):
+    self.assertEqual(
+        b'{"B":1,"a":2,"\xc3\xa9":3}',
+        canonical.dumps({'é': 3, 'a': 2, 'B': 1}))
+
+  def test_keys_sort_by_utf16(self):
+    # U+1F600 is a surrogate pair starting with 0xD83D, so it sorts before
+    # U+FB01, unlike in code point order.
+    data = {'\ufb01': 1, '\U0001f600': 2}
+    text = canonical.dumps(data).decode('utf-8')
+    self.assertEqual('{"\U0001f600":2,"\ufb01":1}', text)
+    self.assertEqual(
+        canonical.fingerprint(data),
+        hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+  def test_nfc(self):
+    decomposed = 'e\u0301'
+    composed = '\u00e9'
+    self.assertEqual(
+        canonical.dumps({decomposed: decomposed}),
+        canonical.dumps({composed: composed}))
+    self.assertEqual('"\u00e9"'.encode('utf-8'), canonical.dumps(decomposed))
+
+  def test_duplicate_after_nfc(self):
+    with self.assertRaisesRegex(ValueError, 'Duplicate key'):
+      canonical.dumps({'e\u0301': 1, '\u00e9': 2})
+
+  def test_escapes(self):
+    self.assertEqual(
+        b'"a\\"b\\\\c\\n\\u0001/\xe2\x82\xac"',
+        canonical.dumps('a"b\\c\n\x01/€'))
+
+  def test_round_trip(self):
+    value = {'a': [1, 0.1, -3e-9, 'x\ty'], 'b': {'c': None}}
+    self.assertEqual(value, json.loads(canonical.dumps(value)))
+
+  def test_not_json(self):
+    with self.assertRaises(TypeError):
+      canonical.dumps({'a': {1, 2}})
+    with self.assertRaisesRegex(TypeError, 'Not json'):
+      list(canonical.iter_encode({'a': {1, 2}}))
+    with self.assertRaisesRegex(TypeError, 'Keys must be str'):
+      list(canonical.iter_encode({1: 2}))
+
+
+  def test_fast_path_matches_iter_encode(self):
+    for value in (
+        1.0, -0.0, 1e-05, 1e16, 1e21, 0.5, 'v1.0,', 'e-5]', 'e\u0301',
+        {'a': 1.0}, {'a': [2.0, 1e-07]}, {'b': 'x', 'a': 'y'},
+        {'bbox': [-180.0, -90, 180.5, 90]}, {'t': 'Version 1.0, 2e-5]'},
+        {'\u00e9': ['e\u0301']}, [], {}, None, True, 12345678901234567890):
+      with self.subTest(value=value):
+        self.assertEqual(
+            ''.join(canonical.iter_encode(value)).encode('utf-8'),
+            canonical.dumps(value))
+
+
+class FingerprintTest(unittest.TestCase):
+
+  def test_matches_dumps(self):
+    value = {'a': ['x' * 1000] * 200, 'b': 1.5}
+    self.assertGreater(len(canonical.dumps(value)), canonical.BUFFER_SIZE)
+    self.assertEqual(
+        hashlib.sha256(canonical.dumps(value)).hexdigest(),
+        canonical.fingerprint(value))
+
+  def test_same_content(self):
+    self.assertEqual(
+        canonical.fingerprint({'a': 1.0, 'b': 'é'}),
+        canonical.fingerprint({'b': 'é', 'a': 1}))
+    self.assertNotEqual(
+        canonical.fingerprint({'a': 1}), canonical.fingerprint({'a': 2}))
+
+
+if __name__ == '__main__':
+  unittest.main()
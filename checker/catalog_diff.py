@@ -0,0 +1,81 @@
+"""Show which STAC nodes differ between two builds of the catalog.
+
+STATUS: Experimental - For feedback
+
+Each side can be a directory of built json, a zip or tar archive of one, or a
+snapshot file.  To diff against a build later without keeping it around, or
+to diff two builds in time that depends only on how much changed, save
+snapshots with
+
+  catalog_diff snapshot BUILD_DIR build.snapshot
+
+and then
+
+  catalog_diff old.snapshot new.snapshot
+
+Exits with 1 if there are differences, like diff.
+"""
+
+from collections.abc import Sequence
+import json
+import pathlib
+import sys
+
+from absl import app
+from absl import flags
+
+from checker import merkle
+
+_JSON = flags.DEFINE_bool(
+    'json', False, 'Print one json object per changed node.')
+_STATS = flags.DEFINE_bool(
+    'stats', False, 'Print how many listings and nodes were read.')
+
+SNAPSHOT = 'snapshot'
+
+
+def print_diff(node_diff: merkle.NodeDiff) -> None:
+  print(f'{node_diff.change.value} {node_diff.path} {node_diff.id}')
+  for field in node_diff.fields:
+    if field.change == merkle.Change.ADDED:
+      print(f'  + {field.pointer}: {json.dumps(field.new)}')
+    elif field.change == merkle.Change.REMOVED:
+      print(f'  - {field.pointer}: {json.dumps(field.old)}')
+    else:
+      print(f'  ~ {field.pointer}: {json.dumps(field.old)} -> '
+            f'{json.dumps(field.new)}')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1 and argv[1] == SNAPSHOT:
+    if len(argv) != 4:
+      raise app.UsageError('snapshot needs a catalog and an output path.')
+    snapshot = merkle.open_snapshot(pathlib.Path(argv[2]))
+    if not isinstance(snapshot, merkle.MemorySnapshot):
+      raise app.UsageError(f'Already a snapshot: {argv[2]}')
+    merkle.save(snapshot, pathlib.Path(argv[3]))
+    print(f'Saved root {snapshot.root.hash} to {argv[3]}')
+    return
+
+  if len(argv) != 3:
+    raise app.UsageError('Expected an old and a new catalog.')
+
+  stats = merkle.Stats()
+  old = merkle.open_snapshot(pathlib.Path(argv[1]), stats)
+  new = merkle.open_snapshot(pathlib.Path(argv[2]), stats)
+  changed = 0
+  for node_diff in merkle.diff(old, new):
+    changed += 1
+    if _JSON.value:
+      print(json.dumps(merkle.to_json(node_diff)))
+    else:
+      print_diff(node_diff)
+
+  if _STATS.value:
+    print(stats.summary(), file=sys.stderr)
+  if changed:
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+  app.run(main)
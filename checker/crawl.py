@@ -0,0 +1,274 @@
+"""Loads the published STAC catalog over HTTP.
+
+The json that is actually served can drift from the source tree, so this
+loads the nodes from a url instead of a directory and feeds them to the same
+checks.  Starting at catalog.json, the child links are followed breadth first
+with every level fetched concurrently.
+
+- A ConnectionPool bounds the number of open connections and keeps them alive
+  between requests.  The standard library has no asyncio HTTP client, so each
+  request runs http.client in a worker thread and asyncio schedules them.
+- An EtagCache keeps the last body and ETag of each url on disk and sends
+  If-None-Match, so a 304 reuses the cached body.  Its reads and writes run
+  in the same worker threads as the requests, off the event loop.
+- Hrefs under the published PREFIX are rewritten to the directory of the root
+  url, so a mirror or a local server of the build output can be crawled.
+
+Node paths are the hrefs relative to the catalog root, like stac.load.
+Fetches that fail are recorded in Stats rather than raised, and the links
+check then reports the dangling links.
+"""
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import hashlib
+import http.client
+import json
+import pathlib
+from typing import Callable, Optional, TypeVar
+import urllib.parse
+
+from checker import hash_cons
+from checker import stac
+from checker.tree import parent_child
+
+PREFIX = parent_child.PREFIX
+ROOT_URL = PREFIX + 'catalog.json'
+
+CHILD = parent_child.CHILD
+HREF = parent_child.HREF
+LINKS = parent_child.LINKS
+REL = parent_child.REL
+
+ETAG = 'ETag'
+IF_NONE_MATCH = 'If-None-Match'
+OK = 200
+NOT_MODIFIED = 304
+
+CONNECTIONS = 8
+TIMEOUT_SECONDS = 30
+
+T = TypeVar('T')
+
+# The status, headers, and body of a response.
+Response = tuple[int, http.client.HTTPMessage, bytes]
+
+
+@dataclasses.dataclass
+class Stats:
+  requests: int = 0
+  # Responses that were 304 and used the cached body.
+  revalidated: int = 0
+  bytes_received: int = 0
+  connections_opened: int = 0
+  # The url and reason for each fetch that failed.
+  failures: list[tuple[str, str]] = dataclasses.field(default_factory=list)
+
+  def summary(self) -> str:
+    return (
+        f'crawl: {self.requests} requests, {self.revalidated} not modified, '
+        f'{self.bytes_received} bytes received, {self.connections_opened} '
+        f'connections, {len(self.failures)} failures')
+
+
+class EtagCache:
+  """The last body and ETag of each url, kept in a directory."""
+
+  def __init__(self, directory: pathlib.Path):
+    self.directory = directory
+    directory.mkdir(parents=True, exist_ok=True)
+
+  def _path(self, url: str, suffix: str) -> pathlib.Path:
+    return self.directory / (
+        hashlib.sha256(url.encode('utf-8')).hexdigest() + suffix)
+
+  def get(self, url: str) -> Optional[tuple[str, bytes]]:
+    """Returns the ETag and body for url or None."""
+    try:
+      etag = self._path(url, '.etag').read_text()
+      body = self._path(url, '.body').read_bytes()
+    except FileNotFoundError:
+      return None
+    return etag, body
+
+  def put(self, url: str, etag: str, body: bytes) -> None:
+    # Write the body first and replace atomically, so a partial write never
+    # pairs a new ETag with an old body.
+    for suffix, data in (('.body', body), ('.etag', etag.encode('utf-8'))):
+      path = self._path(url, suffix)
+      tmp_path = path.with_suffix(suffix + '.tmp')
+      tmp_path.write_bytes(data)
+      tmp_path.replace(path)
+
+
+class ConnectionPool:
+  """Up to size keep-alive connections shared by concurrent requests."""
+
+  def __init__(self, size: int, stats: Stats):
+    self.stats = stats
+    self._slots = asyncio.Semaphore(size)
+    self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+    self._executor = concurrent.futures.ThreadPoolExecutor(size)
+
+  def close(self) -> None:
+    for connections in self._idle.values():
+      for connection in connections:
+        connection.close()
+    self._idle = {}
+    self._executor.shutdown()
+
+  async def run(self, function: Callable[..., T], *args) -> T:
+    """Returns function(*args) called in a worker thread."""
+    return await asyncio.get_running_loop().run_in_executor(
+        self._executor, function, *args)
+
+  def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+    self.stats.connections_opened += 1
+    if scheme == 'https':
+      return http.client.HTTPSConnection(netloc, timeout=TIMEOUT_SECONDS)
+    return http.client.HTTPConnection(netloc, timeout=TIMEOUT_SECONDS)
+
+  @staticmethod
+  def _send(
+      connection: http.client.HTTPConnection, target: str,
+      headers: dict[str, str]) -> tuple[Response, bool]:
+    """Returns the response and whether the connection can be reused."""
+    connection.request('GET', target, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    return (response.status, response.headers, body), not response.will_close
+
+  async def get(self, url: str, headers: dict[str, str]) -> Response:
+    """Returns the response to a GET."""
+    parts = urllib.parse.urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    async with self._slots:
+      idle = self._idle.setdefault(key, [])
+      reused = bool(idle)
+      connection = idle.pop() if idle else self._connect(*key)
+      try:
+        result = await self.run(self._send, connection, target, headers)
+      except (OSError, http.client.HTTPException):
+        connection.close()
+        if not reused:
+          raise
+        # The server may have closed an idle connection, so retry once.
+        connection = self._connect(*key)
+        result = await self.run(self._send, connection, target, headers)
+      response, keep_alive = result
+      if keep_alive:
+        self._idle[key].append(connection)
+      else:
+        connection.close()
+    self.stats.requests += 1
+    self.stats.bytes_received += len(response[2])
+    return response
+
+
+def child_hrefs(stac_data: dict[str, object]) -> list[str]:
+  node_links = stac_data.get(LINKS)
+  if not isinstance(node_links, list):
+    return []
+  return [
+      link[HREF] for link in node_links
+      if isinstance(link, dict) and link.get(REL) == CHILD and
+      isinstance(link.get(HREF), str)]
+
+
+class Crawler:
+  """Fetches the nodes of a catalog."""
+
+  def __init__(
+      self, root_url: str, cache: Optional[EtagCache],
+      connections: int, stats: Stats):
+    self.base = root_url.rsplit('/', 1)[0] + '/'
+    self.root_url = root_url
+    self.cache = cache
+    self.stats = stats
+    self.connections = connections
+
+  def url(self, href: str) -> str:
+    """Returns where to fetch an href from."""
+    if href.startswith(PREFIX):
+      return self.base + href.removeprefix(PREFIX)
+    return href
+
+  async def fetch(self, pool: ConnectionPool, url: str) -> Optional[bytes]:
+    """Returns the body of url or None if it failed."""
+    cached = await pool.run(self.cache.get, url) if self.cache else None
+    headers = {IF_NONE_MATCH: cached[0]} if cached else {}
+    try:
+      status, response_headers, body = await pool.get(url, headers)
+    except (OSError, http.client.HTTPException) as e:
+      self.stats.failures.append((url, str(e)))
+      return None
+    if status == NOT_MODIFIED and cached:
+      self.stats.revalidated += 1
+      return cached[1]
+    if status != OK:
+      self.stats.failures.append((url, f'HTTP {status}'))
+      return None
+    etag = response_headers.get(ETAG)
+    if self.cache and etag:
+      await pool.run(self.cache.put, url, etag, body)
+    return body
+
+  async def crawl(self) -> list[tuple[str, dict[str, object]]]:
+    """Returns the url and json of every node reachable from the root."""
+    pool = ConnectionPool(self.connections, self.stats)
+    result = []
+    seen = {self.root_url}
+    level = [self.root_url]
+    try:
+      while level:
+        bodies = await asyncio.gather(
+            *(self.fetch(pool, url) for url in level))
+        next_level = []
+        for url, body in zip(level, bodies):
+          if body is None:
+            continue
+          try:
+            stac_data = json.loads(body)
+          except json.JSONDecodeError as e:
+            self.stats.failures.append((url, f'Invalid json: {e}'))
+            continue
+          if not isinstance(stac_data, dict):
+            self.stats.failures.append((url, 'Not a json object'))
+            continue
+          result.append((url, stac_data))
+          for href in child_hrefs(stac_data):
+            child_url = self.url(href)
+            if child_url not in seen:
+              seen.add(child_url)
+              next_level.append(child_url)
+        level = next_level
+    finally:
+      pool.close()
+    return result
+
+
+def load(
+    root_url: str = ROOT_URL,
+    cache_dir: Optional[pathlib.Path] = None,
+    connections: int = CONNECTIONS,
+    stats: Optional[Stats] = None,
+    pool: Optional[hash_cons.Pool] = None) -> list[stac.Node]:
+  """Returns the nodes of the catalog at root_url, like stac.load.
+
+  Args:
+    root_url: The url of the root catalog.json.
+    cache_dir: If given, where to keep bodies and ETags between runs.
+    connections: The most connections to have open at once.
+    stats: If given, filled in with what the crawl did.
+    pool: If given, identical values are shared between the nodes.
+  """
+  if stats is None:
+    stats = Stats()
+  cache = EtagCache(cache_dir) if cache_dir else None
+  crawler = Crawler(root_url, cache, connections, stats)
+  return [
+      stac.new_node(pathlib.Path(url.removeprefix(crawler.base)), stac_data,
+                    pool)
+      for url, stac_data in asyncio.run(crawler.crawl())]
@@ -0,0 +1,188 @@
+"""Tests for crawl."""
+
+import asyncio
+import hashlib
+import http.server
+import json
+import pathlib
+import socket
+import tempfile
+import threading
+
+from checker import crawl
+from checker import stac
+import unittest
+
+PREFIX = crawl.PREFIX
+
+
+def link(rel: str, path: str) -> dict[str, str]:
+  return {'rel': rel, 'href': PREFIX + path, 'type': 'application/json'}
+
+
+def catalog(dataset_id: str, path: str, children: list[str]) -> dict:
+  return {
+      'type': 'Catalog',
+      'id': dataset_id,
+      'links': [link('self', path)] + [
+          link('child', child) for child in children],
+  }
+
+
+def collection(dataset_id: str, path: str) -> dict:
+  return {
+      'type': 'Collection',
+      'id': dataset_id,
+      'gee:type': 'image',
+      'links': [link('self', path)],
+  }
+
+
+FILES = {
+    'catalog.json': catalog(
+        'GEE_catalog', 'catalog.json', ['A/catalog.json', 'B/catalog.json']),
+    'A/catalog.json': catalog(
+        'A', 'A/catalog.json', ['A/A_X.json', 'A/A_Y.json', 'A/A_X.json']),
+    'A/A_X.json': collection('A/X', 'A/A_X.json'),
+    'A/A_Y.json': collection('A/Y', 'A/A_Y.json'),
+    'B/catalog.json': catalog('B', 'B/catalog.json', ['B/B_missing.json']),
+}
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+  """Serves a directory with strong ETags, like the bucket does."""
+  protocol_version = 'HTTP/1.1'
+  root: pathlib.Path
+
+  def do_GET(self):  # pylint: disable=invalid-name
+    path = self.root / self.path.lstrip('/')
+    if not path.is_file():
+      self.send_response(404)
+      self.send_header('Content-Length', '0')
+      self.end_headers()
+      return
+    body = path.read_bytes()
+    etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+    if self.headers.get('If-None-Match') == etag:
+      self.send_response(304)
+      self.send_header('ETag', etag)
+      self.send_header('Content-Length', '0')
+      self.end_headers()
+      return
+    self.send_response(200)
+    self.send_header('ETag', etag)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def log_message(self, *args):
+    pass
+
+
+class CrawlTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    tmp = pathlib.Path(self.tmp_dir.name)
+    self.root = tmp / 'catalog'
+    for name, data in FILES.items():
+      path = self.root / name
+      path.parent.mkdir(parents=True, exist_ok=True)
+      path.write_text(json.dumps(data))
+    self.cache_dir = tmp / 'cache'
+
+    handler = type('TestHandler', (Handler,), {'root': self.root})
+    self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    self.thread = threading.Thread(target=self.server.serve_forever)
+    self.thread.start()
+    host, port = self.server.server_address
+    self.url = f'http://{host}:{port}/catalog.json'
+
+  def tearDown(self):
+    self.server.shutdown()
+    self.server.server_close()
+    self.thread.join()
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  def test_crawl(self):
+    stats = crawl.Stats()
+    nodes = crawl.load(self.url, connections=2, stats=stats)
+    self.assertEqual(
+        ['GEE_catalog', 'A', 'B', 'A/X', 'A/Y'], [node.id for node in nodes])
+    self.assertEqual(pathlib.Path('A/A_X.json'), nodes[3].path)
+    self.assertEqual(stac.GeeType.IMAGE, nodes[3].gee_type)
+    self.assertEqual(stac.GeeType.NONE, nodes[0].gee_type)
+    # The duplicate child is fetched once.
+    self.assertEqual(6, stats.requests)
+    self.assertLessEqual(stats.connections_opened, 2)
+    self.assertEqual(1, len(stats.failures))
+    self.assertIn('B/B_missing.json', stats.failures[0][0])
+    self.assertEqual('HTTP 404', stats.failures[0][1])
+
+  def test_matches_the_directory(self):
+    by_path = {node.path: node for node in stac.load(self.root)}
+    for node in crawl.load(self.url):
+      self.assertEqual(by_path[node.path], node)
+
+  def test_revalidate(self):
+    first = crawl.load(self.url, self.cache_dir)
+    (self.root / 'A/A_Y.json').write_text(
+        json.dumps(collection('A/Y2', 'A/A_Y.json')))
+    stats = crawl.Stats()
+    second = crawl.load(self.url, self.cache_dir, stats=stats)
+    self.assertEqual(
+        ['GEE_catalog', 'A', 'B', 'A/X', 'A/Y2'], [node.id for node in second])
+    self.assertEqual(first[:4], second[:4])
+    # Everything but the changed file and the missing one was a 304.
+    self.assertEqual(4, stats.revalidated)
+
+  def test_cache_is_used_off_the_event_loop(self):
+    threads = set()
+
+    class RecordingCache(crawl.EtagCache):
+
+      def get(self, url):
+        threads.add(threading.current_thread())
+        return super().get(url)
+
+      def put(self, url, etag, body):
+        threads.add(threading.current_thread())
+        super().put(url, etag, body)
+
+    crawler = crawl.Crawler(
+        self.url, RecordingCache(self.cache_dir), 2, crawl.Stats())
+    asyncio.run(crawler.crawl())
+    self.assertTrue(threads)
+    self.assertNotIn(threading.current_thread(), threads)
+
+  def test_unreachable(self):
+    with socket.socket() as unused:
+      unused.bind(('127.0.0.1', 0))
+      host, port = unused.getsockname()
+    stats = crawl.Stats()
+    self.assertEqual(
+        [], crawl.load(f'http://{host}:{port}/catalog.json', stats=stats))
+    self.assertEqual(1, len(stats.failures))
+
+  def test_invalid_json(self):
+    (self.root / 'A/A_X.json').write_text('{')
+    stats = crawl.Stats()
+    ids = [node.id for node in crawl.load(self.url, stats=stats)]
+    self.assertNotIn('A/X', ids)
+    self.assertIn(
+        'Invalid json', ' '.join(reason for _, reason in stats.failures))
+
+  def test_url(self):
+    crawler = crawl.Crawler(
+        'http://localhost/x/catalog.json', None, 1, crawl.Stats())
+    self.assertEqual(
+        'http://localhost/x/A/A_B.json', crawler.url(PREFIX + 'A/A_B.json'))
+    self.assertEqual(
+        'http://example.com/A.json', crawler.url('http://example.com/A.json'))
+
+
+if __name__ == '__main__':
+  unittest.main()
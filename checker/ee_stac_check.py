@@ -1,42 +1,108 @@
 """Run the STAC checker on the Earth Engine Public Data Catalog.
 
 STATUS: Experimental - For feedback
+
+To split a run across machines, run each shard with
+
+  ee_stac_check --shard_count=N --shard_index=I --shard_summary=shard_I.json
+
+and then report on all of them with
+
+  ee_stac_check merge shard_0.json ... shard_N-1.json
 """
 
 from collections.abc import Sequence
+import pathlib
 import sys
-from typing import Iterator
+from typing import Iterator, Optional
 
 from absl import app
 from absl import flags
 
+from checker import crawl
+from checker import hash_cons
 from checker import node
+from checker import shard
+from checker import shared_nodes
 from checker import stac
 from checker import tree
+from checker.tree import schemas
 
 _CHECKS = flags.DEFINE_multi_string(
     'checks', [], 'List of checks to run or empty to run all checks.')
-
-
-def find_issues(checks: list[str]) -> Iterator[stac.Issue]:
-  stac_root = stac.stac_root()
-  nodes = stac.load(stac_root)
+_HASH_CONS = flags.DEFINE_bool(
+    'hash_cons', False,
+    'Share identical strings and sub-dicts between nodes while loading.')
+_URL = flags.DEFINE_string(
+    'url', None,
+    'Check the catalog published at this catalog.json url instead of the '
+    'source tree, for example ' + crawl.ROOT_URL)
+_HTTP_CACHE = flags.DEFINE_string(
+    'http_cache', None,
+    'Directory to keep fetched json and ETags in between runs with --url.')
+_PROCESSES = flags.DEFINE_integer(
+    'processes', 1,
+    'Number of worker processes for the node checks and the schema '
+    'validation.  The node check summaries are not printed when more than 1, '
+    'since they stay in the workers.')
+_SHARD_INDEX = flags.DEFINE_integer(
+    'shard_index', 0, 'Which shard to check, from 0 to --shard_count - 1.')
+_SHARD_COUNT = flags.DEFINE_integer(
+    'shard_count', 1, 'How many shards to split the catalog into.')
+_SHARD_SUMMARY = flags.DEFINE_string(
+    'shard_summary', None,
+    'Where to write the summary of this shard for merge.  '
+    'Required if --shard_count is more than 1.')
+
+MERGE = 'merge'
+
+
+def fields_read(checks: list[str]) -> Optional[frozenset[str]]:
+  """Returns the fields that the checks read or None for all of them."""
+  node_fields = node.fields(checks)
+  tree_fields = tree.fields(checks)
+  if node_fields is None or tree_fields is None:
+    return None
+  return node_fields | tree_fields
+
+
+def find_issues(
+    checks: list[str], share_values: bool = False,
+    processes: int = 1, url: Optional[str] = None,
+    http_cache: Optional[str] = None) -> Iterator[stac.Issue]:
+  pool = hash_cons.Pool() if share_values else None
+  if url:
+    crawl_stats = crawl.Stats()
+    nodes = crawl.load(
+        url, pathlib.Path(http_cache) if http_cache else None,
+        stats=crawl_stats, pool=pool)
+    print(crawl_stats.summary())
+    for failed_url, reason in crawl_stats.failures:
+      print(f'Failed to fetch {failed_url}: {reason}')
+  else:
+    nodes = stac.load(stac.stac_root(), pool=pool, fields=fields_read(checks))
 
   print('Number of STAC nodes loaded:', len(nodes))
-
-  for a_node in nodes:
-    yield from node.run_checks(a_node, checks)
-
+  if pool:
+    print(pool.summary())
+
+  if processes > 1:
+    stats = shared_nodes.Stats()
+    yield from shared_nodes.run_checks(nodes, checks, processes, stats)
+    print(stats.summary())
+  else:
+    for a_node in nodes:
+      yield from node.run_checks(a_node, checks)
+
+  schemas.Check.processes = processes
   yield from tree.run_checks(nodes, checks)
 
 
-def main(argv: Sequence[str]) -> None:
-  if len(argv) > 1:
-    raise app.UsageError('Too many command-line arguments.')
-
+def report(issues: Iterator[stac.Issue], summaries: Iterator[str]) -> None:
+  """Prints the issues and counts and exits with 1 if there are errors."""
   warning_count = 0
   error_count = 0
-  for issue in find_issues(_CHECKS.value):
+  for issue in issues:
     print(issue)
 
     if issue.level == stac.IssueLevel.WARNING:
@@ -45,6 +111,9 @@ def main(argv: Sequence[str]) -> None:
     if issue.level == stac.IssueLevel.ERROR:
       error_count += 1
 
+  for summary in summaries:
+    print(summary)
+
   if warning_count:
     print('Warning count:', warning_count)
 
@@ -53,5 +122,54 @@ def main(argv: Sequence[str]) -> None:
     sys.exit(1)
 
 
+def write_shard(
+    checks: list[str], shard_index: int, shard_count: int,
+    path: pathlib.Path) -> None:
+  nodes = stac.load(stac.stac_root(), fields=fields_read(checks))
+  summary = shard.summarize(nodes, checks, shard_index, shard_count)
+  shard.save(summary, path)
+  print(f'Shard {shard_index} of {shard_count}: '
+        f'{len(summary["nodes"])} of {len(nodes)} STAC nodes written to {path}')
+
+
+def merge(checks: list[str], paths: Sequence[str]) -> None:
+  records = shard.merge([shard.load(pathlib.Path(path)) for path in paths])
+  print('Number of STAC nodes loaded:', len(records))
+  # The node check summaries stay with the shards that ran them.
+  report(shard.merged_issues(records, checks), tree.summaries(checks))
+
+
+def main(argv: Sequence[str]) -> None:
+  checks = _CHECKS.value
+  if len(argv) > 1:
+    if argv[1] != MERGE:
+      raise app.UsageError(f'Unknown command: {argv[1]}')
+    if len(argv) < 3:
+      raise app.UsageError('merge needs the shard summaries to merge.')
+    merge(checks, argv[2:])
+    return
+
+  if _SHARD_COUNT.value > 1:
+    if not _SHARD_SUMMARY.value:
+      raise app.UsageError('--shard_summary is required with --shard_count.')
+    write_shard(
+        checks, _SHARD_INDEX.value, _SHARD_COUNT.value,
+        pathlib.Path(_SHARD_SUMMARY.value))
+    return
+
+  def summaries() -> Iterator[str]:
+    # The node checks ran in the workers, so the summaries here would be
+    # empty.
+    if _PROCESSES.value <= 1:
+      yield from node.summaries(checks)
+    yield from tree.summaries(checks)
+
+  report(
+      find_issues(
+          checks, _HASH_CONS.value, _PROCESSES.value, _URL.value,
+          _HTTP_CACHE.value),
+      summaries())
+
+
 if __name__ == '__main__':
   app.run(main)
@@ -0,0 +1,58 @@
+"""Caches results by the fingerprint of the json they were computed from.
+
+Families of collections share eo:bands and gee:visualizations blocks built
+from the same templates, and many collections share the same terms of use.
+Checks of those values get the same answer for each copy, so a Cache keys the
+result by canonical.fingerprint of the value and computes it the first time
+the value is seen.
+
+Values that are the same in canonical json, like 1 and 1.0, share a result.
+"""
+
+import dataclasses
+from typing import Callable, Generic, TypeVar
+
+from checker import canonical
+
+T = TypeVar('T')
+
+
+@dataclasses.dataclass
+class Stats:
+  hits: int = 0
+  misses: int = 0
+
+  def hit_rate(self) -> float:
+    total = self.hits + self.misses
+    return self.hits / total if total else 0.0
+
+
+class Cache(Generic[T]):
+  """Results by the fingerprint of the value, with hit and miss counts."""
+
+  def __init__(self):
+    self._results: dict[str, T] = {}
+    self.stats = Stats()
+
+  def get(self, value: object, make: Callable[[], T], kind: str = '') -> T:
+    """Returns the result for value, calling make if it is not cached.
+
+    Args:
+      value: The json the result is computed from.
+      make: Computes the result.
+      kind: Keeps the results of different computations on the same value
+        apart.
+    """
+    key = kind + ':' + canonical.fingerprint(value)
+    if key in self._results:
+      self.stats.hits += 1
+      return self._results[key]
+    self.stats.misses += 1
+    result = make()
+    self._results[key] = result
+    return result
+
+  def summary(self, name: str) -> str:
+    return (
+        f'{name} cache: {self.stats.hits} hits, {self.stats.misses} misses, '
+        f'{self.stats.hit_rate():.1%} hit rate')
@@ -0,0 +1,36 @@
+"""Tests for fingerprint_cache."""
+
+from checker import fingerprint_cache
+import unittest
+
+
+class CacheTest(unittest.TestCase):
+
+  def test_get(self):
+    cache = fingerprint_cache.Cache()
+    calls = []
+
+    def make(result):
+      calls.append(result)
+      return result
+
+    self.assertEqual(1, cache.get({'a': 1, 'b': [2.5]}, lambda: make(1)))
+    self.assertEqual(1, cache.get({'b': [2.5], 'a': 1}, lambda: make(2)))
+    self.assertEqual(3, cache.get({'a': 2}, lambda: make(3)))
+    self.assertEqual([1, 3], calls)
+    self.assertEqual(fingerprint_cache.Stats(hits=1, misses=2), cache.stats)
+    self.assertEqual(
+        'test cache: 1 hits, 2 misses, 33.3% hit rate', cache.summary('test'))
+
+  def test_kind(self):
+    cache = fingerprint_cache.Cache()
+    self.assertEqual('x', cache.get([], lambda: 'x', 'one'))
+    self.assertEqual('y', cache.get([], lambda: 'y', 'two'))
+    self.assertEqual('x', cache.get([], lambda: 'z', 'one'))
+
+  def test_hit_rate_empty(self):
+    self.assertEqual(0.0, fingerprint_cache.Stats().hit_rate())
+
+
+if __name__ == '__main__':
+  unittest.main()
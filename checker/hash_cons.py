@@ -0,0 +1,116 @@
+"""Shares identical values between the json of loaded nodes.
+
+Families of collections like MODIS and Landsat repeat the same terms of use,
+providers, bands, and boilerplate descriptions, and json.loads gives every
+node its own copy.  A Pool hash-conses the json of each node as it is loaded:
+
+- strings at least min_length long are shared by value
+- dict keys are interned with sys.intern
+- dicts and lists are rebuilt bottom up from shared children and shared when
+  an identical one, with the same keys in the same order, is already pooled
+
+Because children are shared first, an identical container is found with a
+shallow key of its children's identities rather than a deep comparison.
+
+Nodes loaded through a pool share their values, so they must be treated as
+read only.
+
+The bytes saved are estimated with sys.getsizeof on the duplicates that were
+dropped.  They do not count the pool's own memory, its lookup keys and set of
+ids, which is held for as long as the pool is.
+"""
+
+import dataclasses
+import sys
+
+# Shorter strings are not worth a lookup.
+MIN_LENGTH = 32
+
+_POOLED = 'pooled'
+
+
+@dataclasses.dataclass
+class Stats:
+  strings: int = 0
+  containers: int = 0
+  # The number of values replaced by a pooled copy.
+  shared: int = 0
+  # Before the memory the pool itself uses.
+  bytes_saved: int = 0
+
+
+class Pool:
+  """Identical json values seen so far."""
+
+  def __init__(self, min_length: int = MIN_LENGTH):
+    self.min_length = min_length
+    self.stats = Stats()
+    self._strings: dict[str, str] = {}
+    self._containers: dict[tuple[object, ...], object] = {}
+    # The ids of every pooled value, which stay valid while the pool holds
+    # the values.
+    self._pooled: set[int] = set()
+
+  def summary(self) -> str:
+    return (
+        f'hash_cons: {self.stats.shared} shared values, '
+        f'{self.stats.strings} distinct strings, '
+        f'{self.stats.containers} distinct containers, '
+        f'{self.stats.bytes_saved} bytes saved')
+
+  def _identity(self, value: object) -> tuple[object, object]:
+    if id(value) in self._pooled:
+      return _POOLED, id(value)
+    if isinstance(value, float):
+      # -0.0 == 0.0, but they are different json.
+      return float, repr(value)
+    return type(value), value
+
+  def _leaf_bytes(self, values) -> int:
+    return sum(
+        sys.getsizeof(value) for value in values
+        if isinstance(value, (str, float)) and id(value) not in self._pooled)
+
+  def _share(self, key: tuple[object, ...], value: object, leaves) -> object:
+    shared = self._containers.get(key)
+    if shared is not None:
+      self.stats.shared += 1
+      self.stats.bytes_saved += sys.getsizeof(value) + self._leaf_bytes(leaves)
+      return shared
+    self._containers[key] = value
+    self._pooled.add(id(value))
+    self.stats.containers += 1
+    return value
+
+  def intern(self, value: object) -> object:
+    """Returns value or an identical pooled value."""
+    if isinstance(value, str):
+      if len(value) < self.min_length:
+        return value
+      shared = self._strings.get(value)
+      if shared is not None:
+        self.stats.shared += 1
+        self.stats.bytes_saved += sys.getsizeof(value)
+        return shared
+      self._strings[value] = value
+      self._pooled.add(id(value))
+      self.stats.strings += 1
+      return value
+
+    if isinstance(value, dict):
+      result = {}
+      for key, item in value.items():
+        interned_key = sys.intern(key)
+        if interned_key is not key:
+          self.stats.bytes_saved += sys.getsizeof(key)
+        result[interned_key] = self.intern(item)
+      key = (dict, tuple(
+          (name, self._identity(item)) for name, item in result.items()))
+      return self._share(key, result, result.values())
+
+    if isinstance(value, list):
+      result = [self.intern(item) for item in value]
+      key = (list, tuple(self._identity(item) for item in result))
+      return self._share(key, result, result)
+
+    return value
@@ -0,0 +1,94 @@
+"""Tests for hash_cons."""
+
+import json
+import pathlib
+import tempfile
+
+from checker import hash_cons
+from checker import stac
+import unittest
+
+TERMS = 'The terms of use are long enough to be worth sharing between nodes.'
+
+
+def node_json(dataset_id: str) -> str:
+  return json.dumps({
+      'id': dataset_id,
+      'type': 'Collection',
+      'gee:terms_of_use': TERMS,
+      'providers': [{'name': 'NASA', 'roles': ['producer']}],
+      'summaries': {'eo:bands': [{'name': 'B1', 'gee:scale': 0.5}]},
+      'title': f'Dataset {dataset_id} with a long enough title',
+  })
+
+
+class PoolTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.pool = hash_cons.Pool()
+
+  def test_strings(self):
+    first = self.pool.intern(json.loads(json.dumps(TERMS)))
+    second = self.pool.intern(json.loads(json.dumps(TERMS)))
+    self.assertIs(first, second)
+    self.assertEqual(1, self.pool.stats.strings)
+    self.assertEqual(1, self.pool.stats.shared)
+    self.assertGreater(self.pool.stats.bytes_saved, len(TERMS))
+
+  def test_short_strings_are_not_pooled(self):
+    self.pool.intern('short')
+    self.assertEqual(0, self.pool.stats.strings)
+
+  def test_containers(self):
+    first = self.pool.intern(json.loads(node_json('A')))
+    second = self.pool.intern(json.loads(node_json('B')))
+    self.assertIsNot(first, second)
+    self.assertIs(first['gee:terms_of_use'], second['gee:terms_of_use'])
+    self.assertIs(first['providers'], second['providers'])
+    self.assertIs(first['summaries'], second['summaries'])
+    self.assertIsNot(first['title'], second['title'])
+    self.assertEqual(json.loads(node_json('B')), second)
+    # The terms, roles, provider, providers, band, bands, and summaries.
+    self.assertIn('7 shared values', self.pool.summary())
+
+  def test_types_are_not_confused(self):
+    values = self.pool.intern([{'a': 1}, {'a': True}, {'a': 1.0}, {'a': 1}])
+    self.assertIsNot(values[0], values[1])
+    self.assertIsNot(values[0], values[2])
+    self.assertIs(values[0], values[3])
+    self.assertIs(values[1]['a'], True)
+    self.assertIsInstance(values[2]['a'], float)
+
+  def test_signed_zeros_are_not_confused(self):
+    values = self.pool.intern([[0.0], [-0.0], [0.0]])
+    self.assertIsNot(values[0], values[1])
+    self.assertIs(values[0], values[2])
+    self.assertEqual('[[0.0], [-0.0], [0.0]]', json.dumps(values))
+
+  def test_key_order_matters(self):
+    values = self.pool.intern([{'a': 1, 'b': 2}, {'b': 2, 'a': 1}])
+    self.assertIsNot(values[0], values[1])
+    self.assertEqual(['b', 'a'], list(values[1]))
+
+
+class LoadTest(unittest.TestCase):
+
+  def test_load_with_pool(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      root = pathlib.Path(tmp_dir)
+      for name in ('A', 'B', 'C'):
+        (root / f'{name}.json').write_text(node_json(name))
+      plain = stac.load(root)
+      pool = hash_cons.Pool()
+      shared = stac.load(root, pool=pool)
+
+    self.assertEqual(
+        sorted((node.id, node.stac) for node in plain),
+        sorted((node.id, node.stac) for node in shared))
+    self.assertIs(shared[0].stac['summaries'], shared[1].stac['summaries'])
+    self.assertGreater(pool.stats.bytes_saved, 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1 @@
+# Intentionally left empty.
@@ -0,0 +1,189 @@
+"""Bitmap index over the facets used to filter the catalog.
+
+Each node gets an ordinal and each facet value gets a bitmap with bit i set
+for the nodes with that value.  Bitmaps are python ints, so AND, OR, and
+counting bits run over machine words rather than over the nodes.  A filter is
+a dict from facet to a list of accepted values: the values of one facet are
+ORed together and the facets are ANDed.
+
+The facets are:
+
+- license
+- provider: each of the providers[].name values
+- gee:type
+- gee:is_derived and gee:skip_indexing: "true" or "false", missing is "false"
+- non_commercial: "true" for CC-BY-NC licenses
+
+When saved, each bitmap is stored in the smaller of two forms: a sorted list
+of uint32 ordinals for sparse bitmaps like one provider, or the raw bits for
+dense bitmaps like a gee:type.
+"""
+
+import array
+import dataclasses
+import pathlib
+from typing import Iterator, Optional
+
+from checker import array_file
+from checker import stac
+from checker.node import license_field
+
+GEE_IS_DERIVED = 'gee:is_derived'
+GEE_SKIP_INDEXING = 'gee:skip_indexing'
+GEE_TYPE = stac.GEE_TYPE
+LICENSE = license_field.LICENSE
+NAME = 'name'
+NON_COMMERCIAL = 'non_commercial'
+PROVIDER = 'provider'
+PROVIDERS = 'providers'
+
+FACETS = (
+    LICENSE, PROVIDER, GEE_TYPE, GEE_IS_DERIVED, GEE_SKIP_INDEXING,
+    NON_COMMERCIAL)
+
+FALSE = 'false'
+TRUE = 'true'
+
+MAGIC = b'EEFACET1'
+
+# Bitmap storage forms in a saved index.
+_BITS = 'bits'
+_ORDINALS = 'ordinals'
+
+Filters = dict[str, list[str]]
+
+
+def _flag(node: stac.Node, field: str) -> str:
+  return TRUE if node.stac.get(field) is True else FALSE
+
+
+def facet_values(node: stac.Node) -> Iterator[tuple[str, str]]:
+  """Yields the (facet, value) pairs of a node."""
+  license_value = node.stac.get(LICENSE)
+  if isinstance(license_value, str):
+    yield LICENSE, license_value
+  providers = node.stac.get(PROVIDERS)
+  if isinstance(providers, list):
+    names = {
+        provider.get(NAME) for provider in providers
+        if isinstance(provider, dict)}
+    for name in sorted(name for name in names if isinstance(name, str)):
+      yield PROVIDER, name
+  yield GEE_TYPE, node.gee_type.value
+  yield GEE_IS_DERIVED, _flag(node, GEE_IS_DERIVED)
+  yield GEE_SKIP_INDEXING, _flag(node, GEE_SKIP_INDEXING)
+  yield NON_COMMERCIAL, (
+      TRUE if license_field.is_non_commercial(node) else FALSE)
+
+
+def popcount(bitmap: int) -> int:
+  """Returns the number of set bits.  int.bit_count needs Python 3.10."""
+  return bin(bitmap).count('1')
+
+
+def ordinals(bitmap: int) -> Iterator[int]:
+  """Yields the set bits of bitmap from lowest to highest."""
+  while bitmap:
+    low = bitmap & -bitmap
+    yield low.bit_length() - 1
+    bitmap ^= low
+
+
+@dataclasses.dataclass
+class FacetIndex:
+  """A bitmap for each value of each facet."""
+  ids: list[str]
+  # facet -> value -> bitmap of node ordinals.
+  bitmaps: dict[str, dict[str, int]]
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  def everything(self) -> int:
+    return (1 << len(self.ids)) - 1
+
+  def bitmap(self, facet: str, value: str) -> int:
+    return self.bitmaps.get(facet, {}).get(value, 0)
+
+  def select(self, filters: Filters, skip: Optional[str] = None) -> int:
+    """Returns the bitmap of nodes matching filters, ignoring facet skip."""
+    result = self.everything()
+    for facet, values in filters.items():
+      if facet == skip:
+        continue
+      if facet not in FACETS:
+        raise ValueError(f'Unknown facet: "{facet}"')
+      accepted = 0
+      for value in values:
+        accepted |= self.bitmap(facet, value)
+      result &= accepted
+    return result
+
+  def search(self, filters: Filters) -> list[str]:
+    """Returns the ids of the nodes matching filters in ordinal order."""
+    return [self.ids[i] for i in ordinals(self.select(filters))]
+
+  def count(self, filters: Filters) -> int:
+    return popcount(self.select(filters))
+
+  def counts(
+      self, facet: str, filters: Optional[Filters] = None) -> dict[str, int]:
+    """Returns the number of matches for each value of facet.
+
+    The filter on facet itself is ignored so that the other values of a facet
+    that is already filtered still show how many nodes they would add.
+    """
+    selected = self.select(filters or {}, skip=facet)
+    result = {}
+    for value, bitmap in self.bitmaps.get(facet, {}).items():
+      count = popcount(bitmap & selected)
+      if count:
+        result[value] = count
+    return dict(sorted(result.items(), key=lambda item: (-item[1], item[0])))
+
+
+def build(nodes: list[stac.Node]) -> FacetIndex:
+  """Returns a facet index of all of the nodes in their loaded order."""
+  ids = []
+  bitmaps: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+  for ordinal, node in enumerate(nodes):
+    ids.append(node.id)
+    bit = 1 << ordinal
+    for facet, value in facet_values(node):
+      values = bitmaps[facet]
+      values[value] = values.get(value, 0) | bit
+  return FacetIndex(ids, bitmaps)
+
+
+def save(index: FacetIndex, path: pathlib.Path) -> None:
+  """Writes each bitmap as ordinals or bits, whichever is smaller."""
+  num_bytes = (len(index.ids) + 7) // 8
+  entries = []
+  bits = bytearray()
+  ordinal_array = array.array('I')
+  for facet, values in index.bitmaps.items():
+    for value, bitmap in values.items():
+      count = popcount(bitmap)
+      if count * ordinal_array.itemsize < num_bytes:
+        entries.append([facet, value, _ORDINALS, len(ordinal_array), count])
+        ordinal_array.extend(ordinals(bitmap))
+      else:
+        entries.append([facet, value, _BITS, len(bits), num_bytes])
+        bits.extend(bitmap.to_bytes(num_bytes, 'little'))
+  metadata = {'ids': index.ids, 'bitmaps': entries}
+  arrays = {'bits': array.array('B', bits), 'ordinals': ordinal_array}
+  array_file.save(path, MAGIC, metadata, arrays)
+
+
+def load(path: pathlib.Path) -> FacetIndex:
+  metadata, arrays = array_file.load(path, MAGIC)
+  bitmaps: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+  for facet, value, form, offset, length in metadata['bitmaps']:
+    if form == _BITS:
+      bitmap = int.from_bytes(arrays['bits'][offset:offset + length], 'little')
+    else:
+      bitmap = 0
+      for ordinal in arrays['ordinals'][offset:offset + length]:
+        bitmap |= 1 << ordinal
+    bitmaps.setdefault(facet, {})[value] = bitmap
+  return FacetIndex(metadata['ids'], bitmaps)
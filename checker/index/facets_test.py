@@ -0,0 +1,139 @@
+"""Tests for the facets index."""
+
+import pathlib
+import tempfile
+
+from checker import stac
+from checker.index import facets
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+IMAGE_COLLECTION = stac.GeeType.IMAGE_COLLECTION
+NONE = stac.GeeType.NONE
+TABLE = stac.GeeType.TABLE
+
+LICENSE = facets.LICENSE
+PROVIDER = facets.PROVIDER
+GEE_TYPE = facets.GEE_TYPE
+GEE_IS_DERIVED = facets.GEE_IS_DERIVED
+GEE_SKIP_INDEXING = facets.GEE_SKIP_INDEXING
+NON_COMMERCIAL = facets.NON_COMMERCIAL
+TRUE = facets.TRUE
+FALSE = facets.FALSE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def collection_node(dataset_id, gee_type, license_value, providers, **extra):
+  stac_data = {
+      'license': license_value,
+      'providers': [{'name': name} for name in providers]}
+  stac_data.update(extra)
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, gee_type, stac_data)
+
+
+NODES = [
+    stac.Node('CATALOG', FILE_PATH, CATALOG, NONE, {}),
+    collection_node('L8', IMAGE_COLLECTION, 'proprietary', ['USGS', 'Google']),
+    collection_node(
+        'L8_NDVI', IMAGE_COLLECTION, 'proprietary', ['Google'],
+        **{'gee:is_derived': True}),
+    collection_node('ERGO', IMAGE, 'CC-BY-NC-4.0', ['CSP']),
+    collection_node(
+        'MAP', IMAGE_COLLECTION, 'CC-BY-NC-SA-4.0', ['Oxford'],
+        **{'gee:skip_indexing': True}),
+    collection_node('GAUL', TABLE, 'CC-BY-4.0', ['FAO', 'FAO']),
+]
+
+
+class FacetValuesTest(unittest.TestCase):
+
+  def test_catalog(self):
+    self.assertEqual([
+        (GEE_TYPE, 'none'), (GEE_IS_DERIVED, FALSE),
+        (GEE_SKIP_INDEXING, FALSE), (NON_COMMERCIAL, FALSE)
+    ], list(facets.facet_values(NODES[0])))
+
+  def test_collection(self):
+    self.assertEqual([
+        (LICENSE, 'CC-BY-NC-SA-4.0'), (PROVIDER, 'Oxford'),
+        (GEE_TYPE, 'image_collection'), (GEE_IS_DERIVED, FALSE),
+        (GEE_SKIP_INDEXING, TRUE), (NON_COMMERCIAL, TRUE)
+    ], list(facets.facet_values(NODES[4])))
+
+  def test_bad_providers(self):
+    node = collection_node('X', TABLE, ['not a str'], [])
+    node.stac['providers'] = ['not a dict', {'name': 3}, {}]
+    self.assertNotIn(LICENSE, dict(facets.facet_values(node)))
+    self.assertNotIn(PROVIDER, dict(facets.facet_values(node)))
+
+
+class FacetIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = facets.build(NODES)
+
+  def test_ordinals(self):
+    self.assertEqual([0, 3, 64], list(facets.ordinals(1 | 8 | 1 << 64)))
+    self.assertEqual([], list(facets.ordinals(0)))
+
+  def test_build(self):
+    self.assertEqual(6, len(self.index))
+    self.assertEqual(0b000110, self.index.bitmap(PROVIDER, 'Google'))
+    self.assertEqual(0, self.index.bitmap(PROVIDER, 'missing'))
+    self.assertEqual(0, self.index.bitmap('missing', 'missing'))
+
+  def test_search(self):
+    self.assertEqual(
+        ['ERGO', 'MAP'], self.index.search({NON_COMMERCIAL: [TRUE]}))
+    self.assertEqual(['L8_NDVI'], self.index.search(
+        {PROVIDER: ['Google'], GEE_IS_DERIVED: [TRUE]}))
+    self.assertEqual(['L8', 'L8_NDVI', 'GAUL'], self.index.search(
+        {PROVIDER: ['Google', 'FAO']}))
+    self.assertEqual([], self.index.search({LICENSE: []}))
+    self.assertEqual(NODES[0].id, self.index.search({})[0])
+    self.assertEqual(6, self.index.count({}))
+
+  def test_unknown_facet(self):
+    with self.assertRaisesRegex(ValueError, 'Unknown facet: "color"'):
+      self.index.search({'color': ['red']})
+
+  def test_counts(self):
+    self.assertEqual(
+        {'image_collection': 3, 'image': 1, 'none': 1, 'table': 1},
+        self.index.counts(GEE_TYPE))
+    self.assertEqual(
+        {'Google': 2, 'USGS': 1},
+        self.index.counts(PROVIDER, {GEE_TYPE: ['image_collection'],
+                                     NON_COMMERCIAL: [FALSE]}))
+
+  def test_counts_ignore_own_filter(self):
+    self.assertEqual(
+        {'image_collection': 3, 'image': 1, 'none': 1, 'table': 1},
+        self.index.counts(GEE_TYPE, {GEE_TYPE: ['table']}))
+
+  def test_save_and_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'facets.bin'
+      facets.save(self.index, path)
+      loaded = facets.load(path)
+    self.assertEqual(self.index, loaded)
+
+  def test_save_and_load_large(self):
+    nodes = [
+        collection_node(f'ID{i}', IMAGE, 'CC-BY-4.0', [f'P{i % 100}'])
+        for i in range(1000)]
+    index = facets.build(nodes)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'facets.bin'
+      facets.save(index, path)
+      loaded = facets.load(path)
+    self.assertEqual(index, loaded)
+    self.assertEqual(10, loaded.count({PROVIDER: ['P7']}))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,137 @@
+"""Trie over the "/" separated parts of asset ids.
+
+Ids like MODIS/006/MOD09GA and NOAA/GOES/16/MCMIPC are hierarchical: the
+catalog NOAA holds NOAA/GOES/... and so on.  Each trie node is one part of an
+id and keeps a count of the ids at or below it, so "how many datasets are
+under NOAA/CDR" walks the parts of NOAA/CDR and nothing else.
+
+An IdTrie works both as an index over loaded nodes, where tree checks can pull
+out a subtree, and as a loader filter built from a few prefixes:
+
+  nodes = stac.load(stac.stac_root(), id_trie.IdTrie(['NOAA/CDR']).covers)
+"""
+
+from typing import Iterator, Optional
+
+from checker import stac
+
+SEPARATOR = '/'
+
+
+def split(dataset_id: str) -> list[str]:
+  """Returns the parts of an id, ignoring empty parts."""
+  return [part for part in dataset_id.split(SEPARATOR) if part]
+
+
+class _TrieNode:
+  """One part of an id."""
+  __slots__ = ('children', 'count', 'id', 'values')
+
+  def __init__(self):
+    self.children: dict[str, '_TrieNode'] = {}
+    # The number of ids at or below this node.
+    self.count = 0
+    # The id if an id ends here, else None.
+    self.id: Optional[str] = None
+    # An id can have more than one value.  FIRMS is both a catalog and a
+    # collection.
+    self.values: list[object] = []
+
+
+class IdTrie:
+  """Ids and their values arranged by the parts of the ids."""
+
+  def __init__(self, ids: Optional[list[str]] = None):
+    self._root = _TrieNode()
+    for dataset_id in ids or []:
+      self.add(dataset_id)
+
+  def __len__(self) -> int:
+    return self._root.count
+
+  def __contains__(self, dataset_id: str) -> bool:
+    node = self._find(dataset_id)
+    return node is not None and node.id is not None
+
+  def add(self, dataset_id: str, value: object = None) -> None:
+    """Adds an id and appends value, if any, to the values of the id."""
+    path = [self._root]
+    for part in split(dataset_id):
+      path.append(path[-1].children.setdefault(part, _TrieNode()))
+    node = path[-1]
+    if node.id is None:
+      for parent in path:
+        parent.count += 1
+    node.id = dataset_id
+    if value is not None:
+      node.values.append(value)
+
+  def _find(self, prefix: str) -> Optional[_TrieNode]:
+    node = self._root
+    for part in split(prefix):
+      node = node.children.get(part)
+      if node is None:
+        return None
+    return node
+
+  def get(self, dataset_id: str) -> list[object]:
+    """Returns the values for an id in the order they were added."""
+    node = self._find(dataset_id)
+    return list(node.values) if node is not None else []
+
+  def count(self, prefix: str) -> int:
+    """Returns the number of ids equal to or under prefix."""
+    node = self._find(prefix)
+    return node.count if node is not None else 0
+
+  def children(self, prefix: str) -> list[str]:
+    """Returns the sorted parts directly under prefix."""
+    node = self._find(prefix)
+    return sorted(node.children) if node is not None else []
+
+  def _walk(self, node: _TrieNode) -> Iterator[_TrieNode]:
+    stack = [node]
+    while stack:
+      node = stack.pop()
+      if node.id is not None:
+        yield node
+      stack.extend(
+          node.children[part] for part in sorted(node.children, reverse=True))
+
+  def under(self, prefix: str) -> Iterator[str]:
+    """Yields the ids equal to or under prefix in depth first sorted order."""
+    node = self._find(prefix)
+    if node is not None:
+      for found in self._walk(node):
+        yield found.id
+
+  def values_under(self, prefix: str) -> Iterator[object]:
+    """Yields the values of the ids equal to or under prefix."""
+    node = self._find(prefix)
+    if node is not None:
+      for found in self._walk(node):
+        yield from found.values
+
+  def longest_prefix(self, dataset_id: str) -> Optional[str]:
+    """Returns the longest id in the trie that is a prefix of dataset_id."""
+    result = None
+    node = self._root
+    for part in split(dataset_id):
+      node = node.children.get(part)
+      if node is None:
+        break
+      if node.id is not None:
+        result = node.id
+    return result
+
+  def covers(self, dataset_id: str) -> bool:
+    """Returns True if dataset_id is equal to or under any id in the trie."""
+    return self.longest_prefix(dataset_id) is not None
+
+
+def build(nodes: list[stac.Node]) -> IdTrie:
+  """Returns a trie of the ids of the nodes with every node as a value."""
+  trie = IdTrie()
+  for node in nodes:
+    trie.add(node.id, node)
+  return trie
@@ -0,0 +1,115 @@
+"""Tests for id_trie."""
+
+import pathlib
+
+from checker import stac
+from checker.index import id_trie
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+IDS = [
+    'NOAA',
+    'NOAA/CDR',
+    'NOAA/CDR/AVHRR/NDVI/V5',
+    'NOAA/CDR/OISST/V2_1',
+    'NOAA/GOES/16/MCMIPC',
+    'MODIS',
+    'MODIS/006/MOD09GA',
+]
+
+
+class SplitTest(unittest.TestCase):
+
+  def test_split(self):
+    self.assertEqual(
+        ['MODIS', '006', 'MOD09GA'], id_trie.split('MODIS/006/MOD09GA'))
+    self.assertEqual(['a', 'b'], id_trie.split('/a//b/'))
+    self.assertEqual([], id_trie.split(''))
+
+
+class IdTrieTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.trie = id_trie.IdTrie(IDS)
+
+  def test_len_and_contains(self):
+    self.assertEqual(7, len(self.trie))
+    self.assertIn('NOAA/CDR', self.trie)
+    # An intermediate part that is not itself an id.
+    self.assertNotIn('NOAA/GOES', self.trie)
+    self.assertNotIn('NOAA/CDR/AVHRR/NDVI/V5/extra', self.trie)
+
+  def test_add_twice(self):
+    self.trie.add('MODIS', 'value')
+    self.assertEqual(7, len(self.trie))
+    self.assertEqual(['value'], self.trie.get('MODIS'))
+    self.assertEqual([], self.trie.get('NOAA'))
+    self.assertEqual([], self.trie.get('missing'))
+
+  def test_count(self):
+    self.assertEqual(5, self.trie.count('NOAA'))
+    self.assertEqual(3, self.trie.count('NOAA/CDR'))
+    self.assertEqual(1, self.trie.count('NOAA/GOES'))
+    self.assertEqual(0, self.trie.count('NOAA/CD'))
+    self.assertEqual(7, self.trie.count(''))
+
+  def test_children(self):
+    self.assertEqual(['AVHRR', 'OISST'], self.trie.children('NOAA/CDR'))
+    self.assertEqual(['MODIS', 'NOAA'], self.trie.children(''))
+    self.assertEqual([], self.trie.children('missing'))
+
+  def test_under(self):
+    self.assertEqual(
+        ['NOAA/CDR', 'NOAA/CDR/AVHRR/NDVI/V5', 'NOAA/CDR/OISST/V2_1'],
+        list(self.trie.under('NOAA/CDR')))
+    self.assertEqual(
+        ['NOAA/GOES/16/MCMIPC'], list(self.trie.under('NOAA/GOES')))
+    self.assertEqual([], list(self.trie.under('NOAA/CD')))
+
+  def test_longest_prefix(self):
+    self.assertEqual(
+        'NOAA/CDR', self.trie.longest_prefix('NOAA/CDR/PERSIANN-CDR'))
+    self.assertEqual('NOAA', self.trie.longest_prefix('NOAA/GOES/17/MCMIPC'))
+    self.assertEqual(
+        'MODIS/006/MOD09GA', self.trie.longest_prefix('MODIS/006/MOD09GA'))
+    # Parts must match whole.
+    self.assertIsNone(self.trie.longest_prefix('NOAAX/CDR'))
+    self.assertFalse(self.trie.covers('LANDSAT/LC08'))
+    self.assertTrue(self.trie.covers('MODIS/061/MOD09GA'))
+
+  def test_build(self):
+    nodes = [
+        stac.Node('NOAA', FILE_PATH, CATALOG, NONE, {}),
+        stac.Node('NOAA/CDR/OISST/V2_1', FILE_PATH, COLLECTION, IMAGE, {}),
+        stac.Node('MODIS/006/MOD09GA', FILE_PATH, COLLECTION, IMAGE, {}),
+    ]
+    trie = id_trie.build(nodes)
+    self.assertEqual([nodes[1]], trie.get('NOAA/CDR/OISST/V2_1'))
+    self.assertEqual(nodes[:2], list(trie.values_under('NOAA')))
+
+  def test_build_duplicate_id(self):
+    nodes = [
+        stac.Node('FIRMS', FILE_PATH, CATALOG, NONE, {}),
+        stac.Node('FIRMS', FILE_PATH, COLLECTION, IMAGE, {}),
+    ]
+    trie = id_trie.build(nodes)
+    self.assertEqual(1, len(trie))
+    self.assertEqual(nodes, trie.get('FIRMS'))
+    self.assertEqual(nodes, list(trie.values_under('')))
+
+  def test_loader_filter(self):
+    keep = id_trie.IdTrie(['NOAA/CDR']).covers
+    self.assertEqual(
+        ['NOAA/CDR', 'NOAA/CDR/AVHRR/NDVI/V5', 'NOAA/CDR/OISST/V2_1'],
+        [dataset_id for dataset_id in IDS if keep(dataset_id)])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,238 @@
+"""Inverted index from keywords to the datasets that have them.
+
+Each keyword maps to a posting list: the sorted ordinals of the datasets with
+that keyword.  Boolean queries combine posting lists with linear merges, and
+since the keywords themselves are kept sorted, a prefix expands to a
+contiguous range of keywords found with a binary search.
+
+Queries are strings like:
+
+  landsat AND (sr OR toa) AND NOT deprecated
+  sentinel* -cloud
+
+- AND is implied between terms, so "a b" is "a AND b".
+- NOT and a leading "-" exclude the datasets with a term.
+- A trailing "*" matches every keyword with that prefix.
+- Parentheses group.
+
+The index saves to an array_file with one uint32 array holding all of the
+posting lists end to end and one array of offsets into it, so tools can load it
+and answer queries without the catalog.
+"""
+
+import array
+import bisect
+import dataclasses
+import pathlib
+import re
+
+from checker import array_file
+from checker import stac
+from checker.node import keywords
+
+KEYWORDS = keywords.KEYWORDS
+
+MAGIC = b'EEKEYWD1'
+
+AND = 'AND'
+OR = 'OR'
+NOT = 'NOT'
+PREFIX = '*'
+
+Postings = list[int]
+
+_TOKEN_RE = re.compile(r'\(|\)|-|[^\s()]+')
+
+
+def intersect(a: Postings, b: Postings) -> Postings:
+  """Returns the ordinals in both sorted lists."""
+  result = []
+  i = j = 0
+  while i < len(a) and j < len(b):
+    if a[i] == b[j]:
+      result.append(a[i])
+      i += 1
+      j += 1
+    elif a[i] < b[j]:
+      i += 1
+    else:
+      j += 1
+  return result
+
+
+def union(a: Postings, b: Postings) -> Postings:
+  """Returns the ordinals in either sorted list."""
+  result = []
+  i = j = 0
+  while i < len(a) and j < len(b):
+    if a[i] == b[j]:
+      result.append(a[i])
+      i += 1
+      j += 1
+    elif a[i] < b[j]:
+      result.append(a[i])
+      i += 1
+    else:
+      result.append(b[j])
+      j += 1
+  result.extend(a[i:])
+  result.extend(b[j:])
+  return result
+
+
+def difference(a: Postings, b: Postings) -> Postings:
+  """Returns the ordinals in the sorted list a that are not in b."""
+  result = []
+  i = j = 0
+  while i < len(a):
+    if j == len(b) or a[i] < b[j]:
+      result.append(a[i])
+      i += 1
+    elif a[i] == b[j]:
+      i += 1
+      j += 1
+    else:
+      j += 1
+  return result
+
+
+@dataclasses.dataclass
+class KeywordIndex:
+  """Posting lists for each keyword."""
+  ids: list[str]
+  # Sorted keywords.
+  keywords: list[str]
+  # The posting list for keywords[i] is postings[offsets[i]:offsets[i + 1]].
+  offsets: array_file.Array
+  postings: array_file.Array
+
+  def __len__(self) -> int:
+    return len(self.keywords)
+
+  def postings_for(self, keyword: str) -> Postings:
+    i = bisect.bisect_left(self.keywords, keyword)
+    if i == len(self.keywords) or self.keywords[i] != keyword:
+      return []
+    return list(self.postings[self.offsets[i]:self.offsets[i + 1]])
+
+  def expand(self, prefix: str) -> list[str]:
+    """Returns the keywords that start with prefix."""
+    start = bisect.bisect_left(self.keywords, prefix)
+    end = start
+    while end < len(self.keywords) and self.keywords[end].startswith(prefix):
+      end += 1
+    return self.keywords[start:end]
+
+  def term_ordinals(self, term: str) -> Postings:
+    """Returns the ordinals for a keyword or a prefix ending in '*'."""
+    if not term.endswith(PREFIX):
+      return self.postings_for(term.lower())
+    result = []
+    for keyword in self.expand(term[:-1].lower()):
+      result = union(result, self.postings_for(keyword))
+    return result
+
+  def search_ordinals(self, query: str) -> Postings:
+    """Returns the sorted ordinals of the datasets that match query."""
+    return _Parser(self, query).parse()
+
+  def search(self, query: str) -> list[str]:
+    """Returns the ids of the datasets that match query."""
+    return [self.ids[i] for i in self.search_ordinals(query)]
+
+
+class _Parser:
+  """Recursive descent parser that evaluates a query as it goes."""
+
+  def __init__(self, index: KeywordIndex, query: str):
+    self.index = index
+    self.tokens = _TOKEN_RE.findall(query)
+    self.position = 0
+
+  def _peek(self) -> str:
+    if self.position < len(self.tokens):
+      return self.tokens[self.position]
+    return ''
+
+  def _next(self) -> str:
+    token = self._peek()
+    self.position += 1
+    return token
+
+  def parse(self) -> Postings:
+    if not self.tokens:
+      return []
+    result = self._or()
+    if self.position != len(self.tokens):
+      raise ValueError(f'Unexpected "{self._peek()}" in query')
+    return result
+
+  def _or(self) -> Postings:
+    result = self._and()
+    while self._peek() == OR:
+      self._next()
+      result = union(result, self._and())
+    return result
+
+  def _and(self) -> Postings:
+    result = self._not()
+    while self._peek() not in ('', OR, ')'):
+      if self._peek() == AND:
+        self._next()
+      result = intersect(result, self._not())
+    return result
+
+  def _not(self) -> Postings:
+    if self._peek() in (NOT, '-'):
+      self._next()
+      everything = list(range(len(self.index.ids)))
+      return difference(everything, self._not())
+    return self._atom()
+
+  def _atom(self) -> Postings:
+    token = self._next()
+    if token == '(':
+      result = self._or()
+      if self._next() != ')':
+        raise ValueError('Missing ")" in query')
+      return result
+    if token in ('', ')', AND, OR):
+      raise ValueError(f'Expected a keyword in query, found "{token}"')
+    return self.index.term_ordinals(token)
+
+
+def build(nodes: list[stac.Node]) -> KeywordIndex:
+  """Returns an index of the keywords of all of the nodes."""
+  ids = []
+  by_keyword: dict[str, Postings] = {}
+  for node in nodes:
+    node_keywords = node.stac.get(KEYWORDS)
+    if not isinstance(node_keywords, list):
+      continue
+    ordinal = len(ids)
+    ids.append(node.id)
+    for keyword in {k for k in node_keywords if isinstance(k, str)}:
+      by_keyword.setdefault(keyword, []).append(ordinal)
+
+  sorted_keywords = sorted(by_keyword)
+  offsets = array.array('I', [0])
+  postings = array.array('I')
+  for keyword in sorted_keywords:
+    postings.extend(by_keyword[keyword])
+    offsets.append(len(postings))
+
+  return KeywordIndex(ids, sorted_keywords, offsets, postings)
+
+
+def save(index: KeywordIndex, path: pathlib.Path) -> None:
+  metadata = {'ids': index.ids, 'keywords': index.keywords}
+  arrays = {'offsets': index.offsets, 'postings': index.postings}
+  array_file.save(path, MAGIC, metadata, arrays)
+
+
+def load(path: pathlib.Path) -> KeywordIndex:
+  """Returns the index in path with the posting lists memory mapped."""
+  metadata, arrays = array_file.load(path, MAGIC)
+  return KeywordIndex(
+      metadata['ids'], metadata['keywords'], arrays['offsets'],
+      arrays['postings'])
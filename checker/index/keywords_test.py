@@ -0,0 +1,112 @@
+"""Tests for the keywords index."""
+
+import pathlib
+import tempfile
+
+from checker import stac
+from checker.index import keywords
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def collection_node(dataset_id: str, node_keywords) -> stac.Node:
+  stac_data = {'keywords': node_keywords}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+NODES = [
+    stac.Node('CATALOG', FILE_PATH, CATALOG, NONE, {}),
+    collection_node('L8_SR', ['landsat', 'lc08', 'sr']),
+    collection_node('L8_TOA', ['landsat', 'lc08', 'toa']),
+    collection_node('L5_SR', ['deprecated', 'landsat', 'lt05', 'sr']),
+    collection_node('S2', ['copernicus', 'sentinel', 'sentinel2', 'toa']),
+    collection_node('S1', ['copernicus', 'radar', 'sentinel', 'sentinel1']),
+]
+
+
+class MergeTest(unittest.TestCase):
+
+  def test_intersect(self):
+    self.assertEqual([2, 5], keywords.intersect([1, 2, 5, 7], [0, 2, 3, 5]))
+    self.assertEqual([], keywords.intersect([], [1]))
+
+  def test_union(self):
+    self.assertEqual(
+        [0, 1, 2, 3, 5, 7], keywords.union([1, 2, 5, 7], [0, 2, 3, 5]))
+    self.assertEqual([1], keywords.union([], [1]))
+
+  def test_difference(self):
+    self.assertEqual([1, 7], keywords.difference([1, 2, 5, 7], [0, 2, 3, 5]))
+    self.assertEqual([1, 2], keywords.difference([1, 2], []))
+
+
+class KeywordIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = keywords.build(NODES)
+
+  def test_build(self):
+    self.assertEqual(['L8_SR', 'L8_TOA', 'L5_SR', 'S2', 'S1'], self.index.ids)
+    self.assertEqual(11, len(self.index))
+    self.assertEqual(self.index.keywords, sorted(self.index.keywords))
+    self.assertEqual([0, 1, 2], self.index.postings_for('landsat'))
+    self.assertEqual([], self.index.postings_for('missing'))
+
+  def test_expand(self):
+    self.assertEqual(
+        ['sentinel', 'sentinel1', 'sentinel2'], self.index.expand('sent'))
+    self.assertEqual(['landsat', 'lc08', 'lt05'], self.index.expand('l'))
+    self.assertEqual([], self.index.expand('zzz'))
+
+  def test_search_terms(self):
+    self.assertEqual(['L8_SR', 'L5_SR'], self.index.search('sr'))
+    self.assertEqual(['L8_SR', 'L5_SR'], self.index.search('SR'))
+    self.assertEqual([], self.index.search('missing'))
+    self.assertEqual([], self.index.search(''))
+
+  def test_search_and(self):
+    self.assertEqual(['L8_TOA'], self.index.search('landsat AND toa'))
+    self.assertEqual(['L8_TOA'], self.index.search('landsat toa'))
+
+  def test_search_or(self):
+    self.assertEqual(['S2', 'S1'], self.index.search('sentinel1 OR sentinel2'))
+    self.assertEqual(
+        ['L8_SR', 'L8_TOA', 'L5_SR'],
+        self.index.search('landsat AND (sr OR toa)'))
+
+  def test_search_not(self):
+    self.assertEqual(
+        ['L8_SR', 'L8_TOA'], self.index.search('landsat AND NOT deprecated'))
+    self.assertEqual(['L8_SR', 'L8_TOA'], self.index.search('landsat -lt05'))
+    self.assertEqual(['S2', 'S1'], self.index.search('NOT landsat'))
+
+  def test_search_prefix(self):
+    self.assertEqual(['S2', 'S1'], self.index.search('sentinel*'))
+    self.assertEqual(['L8_SR', 'L8_TOA', 'L5_SR'], self.index.search('l*'))
+    self.assertEqual(['S2'], self.index.search('sentinel* -radar'))
+
+  def test_search_errors(self):
+    for query in ('(landsat', 'landsat)', 'AND landsat', 'landsat OR'):
+      with self.assertRaises(ValueError, msg=query):
+        self.index.search(query)
+
+  def test_save_and_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'keywords.bin'
+      keywords.save(self.index, path)
+      loaded = keywords.load(path)
+      self.assertIsInstance(loaded.postings, memoryview)
+      self.assertEqual(self.index.keywords, loaded.keywords)
+      query = 'landsat AND (sr OR toa) AND NOT deprecated'
+      self.assertEqual(self.index.search(query), loaded.search(query))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,268 @@
+"""Packed R-tree over the spatial extents of the STAC Collections.
+
+Answers which datasets intersect a box, which datasets contain a box or point,
+and which datasets are nearest to a point, without scanning every node.
+
+The tree is built with Sort-Tile-Recursive (STR) packing: the boxes are sorted
+into vertical slices by x, each slice is sorted by y, and runs of NODE_SIZE
+boxes become the leaves.  Only the leaves are sorted.  Each level above is
+the bounds of consecutive runs of NODE_SIZE nodes of the level below, which in
+STR order are already close together, until there is one root.  Because the
+children of each tree node are a contiguous run of the level below, the whole
+tree is a list of flat float64 arrays with 4 values per box and no child
+pointers.
+
+Boxes with x1 > x2 cross the antimeridian.  They are stored as two boxes,
+[x1, 180] and [-180, x2], that both point to the same dataset.  Query boxes
+that cross the antimeridian are split the same way.  Nearest queries measure
+the longitude distance the short way around the globe.
+
+Distances are in degrees as if lon/lat were planar.  That is good enough to
+rank collections by nearness, but it is not a geodesic distance.
+"""
+
+import array
+import dataclasses
+import heapq
+import math
+import pathlib
+from typing import Iterator, Optional
+
+from checker import array_file
+from checker import stac
+from checker.node import extent
+
+BBOX = extent.BBOX
+EXTENT = extent.EXTENT
+SPATIAL = extent.SPATIAL
+
+MAGIC = b'EESPATL1'
+NODE_SIZE = 16
+
+MIN_X = -180.0
+MAX_X = 180.0
+
+Box = tuple[float, float, float, float]
+
+
+def bbox(node: stac.Node) -> Optional[Box]:
+  """Returns the x1, y1, x2, y2 of a node or None if there is no valid bbox."""
+  try:
+    coord = node.stac[EXTENT][SPATIAL][BBOX][0]
+  except (KeyError, IndexError, TypeError):
+    return None
+  if not isinstance(coord, list) or len(coord) != extent.COORD_SIZE:
+    return None
+  if not all(isinstance(val, (int, float)) for val in coord):
+    return None
+  return tuple(float(val) for val in coord)
+
+
+def split(box: Box) -> list[Box]:
+  """Returns box as 1 box or 2 boxes if it crosses the antimeridian."""
+  x1, y1, x2, y2 = box
+  if x1 <= x2:
+    return [box]
+  return [(x1, y1, MAX_X, y2), (MIN_X, y1, x2, y2)]
+
+
+def _intersects(a: Box, b: Box) -> bool:
+  return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+  return (outer[0] <= inner[0] and inner[2] <= outer[2] and
+          outer[1] <= inner[1] and inner[3] <= outer[3])
+
+
+def _lon_distance(x: float, x1: float, x2: float) -> float:
+  if x1 <= x <= x2:
+    return 0.0
+  return min((x1 - x) % 360, (x - x2) % 360)
+
+
+def distance(lon: float, lat: float, box: Box) -> float:
+  """Returns the planar distance in degrees from a point to a box."""
+  x1, y1, x2, y2 = box
+  dx = _lon_distance(lon, x1, x2)
+  dy = max(y1 - lat, 0.0, lat - y2)
+  return math.hypot(dx, dy)
+
+
+def _bounds(boxes: list[Box]) -> Box:
+  return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+          max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+def _str_order(boxes: list[Box]) -> list[int]:
+  """Returns the order of the boxes for Sort-Tile-Recursive packing."""
+  count = len(boxes)
+  if not count:
+    return []
+  num_leaves = math.ceil(count / NODE_SIZE)
+  num_slices = math.ceil(math.sqrt(num_leaves))
+  slice_size = num_slices * NODE_SIZE
+
+  by_x = sorted(range(count), key=lambda i: boxes[i][0] + boxes[i][2])
+  order = []
+  for start in range(0, count, slice_size):
+    a_slice = by_x[start:start + slice_size]
+    order.extend(sorted(a_slice, key=lambda i: boxes[i][1] + boxes[i][3]))
+  return order
+
+
+def _flatten(boxes: list[Box]) -> array.array:
+  result = array.array('d')
+  for box in boxes:
+    result.extend(box)
+  return result
+
+
+@dataclasses.dataclass
+class SpatialIndex:
+  """Packed R-tree of dataset bounding boxes.
+
+  levels[0] has the boxes of the datasets in STR order.  Box i of
+  levels[k + 1] covers boxes i * NODE_SIZE to (i + 1) * NODE_SIZE - 1 of
+  levels[k].  The last level has the single root box.
+  """
+  ids: list[str]
+  # For each box in levels[0], the index into ids.
+  ordinals: array_file.Array
+  levels: list[array_file.Array]
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  def _box(self, level: int, i: int) -> Box:
+    values = self.levels[level]
+    return tuple(values[4 * i:4 * i + 4])
+
+  def _num_boxes(self, level: int) -> int:
+    return len(self.levels[level]) // 4
+
+  def _children(self, level: int, i: int) -> range:
+    start = i * NODE_SIZE
+    return range(start, min(start + NODE_SIZE, self._num_boxes(level - 1)))
+
+  def _search(self, query: Box, leaf_test) -> Iterator[int]:
+    """Yields the ordinals of leaf boxes that pass leaf_test."""
+    if not self.levels or not self._num_boxes(0):
+      return
+    stack = [(len(self.levels) - 1, 0)]
+    while stack:
+      level, i = stack.pop()
+      box = self._box(level, i)
+      if not _intersects(box, query):
+        continue
+      if level == 0:
+        if leaf_test(box, query):
+          yield self.ordinals[i]
+        continue
+      for child in self._children(level, i):
+        stack.append((level - 1, child))
+
+  def intersects(self, query: Box) -> list[str]:
+    """Returns the sorted ids of datasets that intersect query."""
+    found = set()
+    for part in split(query):
+      found.update(self._search(part, _intersects))
+    return sorted(self.ids[i] for i in found)
+
+  def contains(self, query: Box) -> list[str]:
+    """Returns the sorted ids of datasets that completely contain query."""
+    found = None
+    for part in split(query):
+      part_found = set(self._search(part, _contains))
+      found = part_found if found is None else found & part_found
+    return sorted(self.ids[i] for i in found)
+
+  def contains_point(self, lon: float, lat: float) -> list[str]:
+    return self.contains((lon, lat, lon, lat))
+
+  def nearest(self, lon: float, lat: float, k: int) -> list[tuple[str, float]]:
+    """Returns up to k (id, distance) pairs of the datasets nearest a point.
+
+    Uses a best first search, so only the tree nodes closer than the kth
+    dataset are visited.
+    """
+    result = []
+    if k <= 0 or not self.levels or not self._num_boxes(0):
+      return result
+    seen = set()
+    root_level = len(self.levels) - 1
+    heap = [(distance(lon, lat, self._box(root_level, 0)), root_level, 0)]
+    while heap and len(result) < k:
+      dist, level, i = heapq.heappop(heap)
+      if level < 0:
+        if i not in seen:
+          seen.add(i)
+          result.append((self.ids[i], dist))
+        continue
+      if level == 0:
+        heapq.heappush(heap, (dist, -1, self.ordinals[i]))
+        continue
+      for child in self._children(level, i):
+        child_box = self._box(level - 1, child)
+        heapq.heappush(
+            heap, (distance(lon, lat, child_box), level - 1, child))
+    return result
+
+
+def build(nodes: list[stac.Node]) -> SpatialIndex:
+  """Returns an index of all the nodes that have a bbox."""
+  ids = []
+  boxes = []
+  box_ordinals = []
+  for node in nodes:
+    node_box = bbox(node)
+    if node_box is None:
+      continue
+    ordinal = len(ids)
+    ids.append(node.id)
+    for part in split(node_box):
+      boxes.append(part)
+      box_ordinals.append(ordinal)
+
+  order = _str_order(boxes)
+  level_boxes = [boxes[i] for i in order]
+  ordinals = array.array('q', (box_ordinals[i] for i in order))
+
+  levels = [_flatten(level_boxes)]
+  while len(level_boxes) > 1:
+    # In STR order, each run of NODE_SIZE boxes is close together.
+    parents = [
+        _bounds(level_boxes[start:start + NODE_SIZE])
+        for start in range(0, len(level_boxes), NODE_SIZE)]
+    levels.append(_flatten(parents))
+    level_boxes = parents
+
+  return SpatialIndex(ids, ordinals, levels)
+
+
+def save(index: SpatialIndex, path: pathlib.Path) -> None:
+  arrays = {'ordinals': index.ordinals}
+  for level, values in enumerate(index.levels):
+    arrays[f'level_{level}'] = values
+  metadata = {'ids': index.ids, 'num_levels': len(index.levels)}
+  array_file.save(path, MAGIC, metadata, arrays)
+
+
+def load(path: pathlib.Path) -> SpatialIndex:
+  """Returns the index in path with the arrays memory mapped."""
+  metadata, arrays = array_file.load(path, MAGIC)
+  levels = [arrays[f'level_{level}'] for level in range(metadata['num_levels'])]
+  return SpatialIndex(metadata['ids'], arrays['ordinals'], levels)
+
+
+def linear_intersects(nodes: list[stac.Node], query: Box) -> list[str]:
+  """Returns the same as SpatialIndex.intersects by checking every node."""
+  found = set()
+  for node in nodes:
+    node_box = bbox(node)
+    if node_box is None:
+      continue
+    for part in split(node_box):
+      if any(_intersects(part, query_part) for query_part in split(query)):
+        found.add(node.id)
+  return sorted(found)
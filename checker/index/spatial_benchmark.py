@@ -0,0 +1,101 @@
+"""Compare the spatial index to a linear scan over the catalog.
+
+Builds the index, saves and reloads it, then times the same random bounding
+box queries with the index and with a scan of every node.
+"""
+
+from collections.abc import Sequence
+import dataclasses
+import pathlib
+import random
+import tempfile
+import time
+
+from absl import app
+from absl import flags
+
+from checker import stac
+from checker.index import spatial
+
+_NUM_QUERIES = flags.DEFINE_integer(
+    'num_queries', 1000, 'Number of random bounding boxes to query.')
+_SEED = flags.DEFINE_integer('seed', 0, 'Random seed for the query boxes.')
+
+
+@dataclasses.dataclass
+class Timings:
+  build: float
+  save: float
+  load: float
+  index_queries: float
+  linear_queries: float
+
+
+def random_boxes(count: int, seed: int) -> list[spatial.Box]:
+  """Returns random boxes, some of which cross the antimeridian."""
+  rng = random.Random(seed)
+  boxes = []
+  for _ in range(count):
+    x1 = rng.uniform(-180, 180)
+    x2 = x1 + rng.uniform(0.1, 40)
+    if x2 > 180:
+      x2 -= 360
+    y1 = rng.uniform(-90, 80)
+    y2 = min(90, y1 + rng.uniform(0.1, 20))
+    boxes.append((x1, y1, x2, y2))
+  return boxes
+
+
+def run(nodes: list[stac.Node], queries: list[spatial.Box]) -> Timings:
+  """Returns the timings and raises if the index and scan disagree."""
+  start = time.perf_counter()
+  index = spatial.build(nodes)
+  build_time = time.perf_counter() - start
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    path = pathlib.Path(tmp_dir) / 'spatial.bin'
+    start = time.perf_counter()
+    spatial.save(index, path)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = spatial.load(path)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_results = [index.intersects(query) for query in queries]
+    index_time = time.perf_counter() - start
+
+  start = time.perf_counter()
+  linear_results = [
+      spatial.linear_intersects(nodes, query) for query in queries]
+  linear_time = time.perf_counter() - start
+
+  if index_results != linear_results:
+    raise ValueError('Index and linear scan results differ')
+
+  return Timings(build_time, save_time, load_time, index_time, linear_time)
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  nodes = stac.load(stac.stac_root())
+  print('Number of STAC nodes loaded:', len(nodes))
+  queries = random_boxes(_NUM_QUERIES.value, _SEED.value)
+  timings = run(nodes, queries)
+
+  print(f'Build: {timings.build * 1000:.2f} ms')
+  print(f'Save: {timings.save * 1000:.2f} ms')
+  print(f'Load: {timings.load * 1000:.2f} ms')
+  num_queries = len(queries)
+  print(f'Index: {timings.index_queries / num_queries * 1e6:.1f} us/query')
+  print(f'Linear: {timings.linear_queries / num_queries * 1e6:.1f} us/query')
+  if timings.index_queries:
+    speedup = timings.linear_queries / timings.index_queries
+    print(f'Speedup: {speedup:.1f}x')
+
+
+if __name__ == '__main__':
+  app.run(main)
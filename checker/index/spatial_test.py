@@ -0,0 +1,155 @@
+"""Tests for spatial."""
+
+import pathlib
+import random
+import tempfile
+
+from checker import stac
+from checker.index import spatial
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def collection_node(dataset_id: str, box) -> stac.Node:
+  stac_data = {'extent': {'spatial': {'bbox': [list(box)]}}}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+NODES = [
+    stac.Node('CATALOG', FILE_PATH, CATALOG, NONE, {}),
+    collection_node('GLOBAL', (-180, -90, 180, 90)),
+    collection_node('EUROPE', (-10, 35, 30, 70)),
+    collection_node('AFRICA', (-20, -35, 50, 37)),
+    collection_node('FIJI', (170, -20, -175, -10)),  # Crosses antimeridian.
+    collection_node('HAWAII', (-161, 18, -154, 23)),
+    collection_node('BAD', (1, 2, 3)),
+]
+
+
+def random_nodes(count: int, seed: int) -> list[stac.Node]:
+  rng = random.Random(seed)
+  nodes = []
+  for i in range(count):
+    x1 = rng.uniform(-180, 180)
+    x2 = x1 + rng.uniform(0, 30)
+    if x2 > 180:
+      x2 -= 360
+    y1 = rng.uniform(-90, 85)
+    y2 = min(90, y1 + rng.uniform(0, 10))
+    nodes.append(collection_node(f'N{i}', (x1, y1, x2, y2)))
+  return nodes
+
+
+class HelperTest(unittest.TestCase):
+
+  def test_bbox(self):
+    self.assertEqual((-10.0, 35.0, 30.0, 70.0), spatial.bbox(NODES[2]))
+    self.assertIsNone(spatial.bbox(NODES[0]))
+    self.assertIsNone(spatial.bbox(NODES[-1]))
+
+  def test_split(self):
+    self.assertEqual([(1, 2, 3, 4)], spatial.split((1, 2, 3, 4)))
+    self.assertEqual(
+        [(170, -20, 180, -10), (-180, -20, -175, -10)],
+        spatial.split((170, -20, -175, -10)))
+
+  def test_distance(self):
+    box = (0, 0, 10, 10)
+    self.assertEqual(0, spatial.distance(5, 5, box))
+    self.assertEqual(5, spatial.distance(15, 5, box))
+    self.assertEqual(5, spatial.distance(-5, 5, box))
+    self.assertEqual(5, spatial.distance(5, 15, box))
+    # Across the antimeridian is closer than the long way around.
+    self.assertEqual(10, spatial.distance(-175, 0, (170, 0, 175, 0)))
+
+
+class SpatialIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = spatial.build(NODES)
+
+  def test_len(self):
+    self.assertEqual(5, len(self.index))
+
+  def test_intersects(self):
+    self.assertEqual(
+        ['AFRICA', 'EUROPE', 'GLOBAL'], self.index.intersects((0, 30, 5, 40)))
+    self.assertEqual(['GLOBAL'], self.index.intersects((100, 0, 110, 10)))
+
+  def test_intersects_antimeridian(self):
+    self.assertEqual(['FIJI', 'GLOBAL'], self.index.intersects(
+        (-178, -15, -177, -14)))
+    self.assertEqual(['FIJI', 'GLOBAL'], self.index.intersects(
+        (179, -15, -179, -14)))
+    self.assertEqual(['FIJI', 'GLOBAL', 'HAWAII'], self.index.intersects(
+        (175, -30, -150, 30)))
+
+  def test_contains(self):
+    self.assertEqual(
+        ['AFRICA', 'EUROPE', 'GLOBAL'], self.index.contains_point(10, 36))
+    self.assertEqual(['EUROPE', 'GLOBAL'], self.index.contains((0, 40, 5, 50)))
+    self.assertEqual(['GLOBAL'], self.index.contains((0, 30, 5, 40)))
+
+  def test_contains_antimeridian(self):
+    self.assertEqual(
+        ['FIJI', 'GLOBAL'], self.index.contains((179, -15, -179, -14)))
+    self.assertEqual(['GLOBAL'], self.index.contains((179, -15, -170, -14)))
+
+  def test_nearest(self):
+    nearest = self.index.nearest(-160, -15, 3)
+    self.assertEqual(['GLOBAL', 'FIJI', 'HAWAII'], [i for i, _ in nearest])
+    self.assertEqual([0, 15, 33], [d for _, d in nearest])
+    self.assertEqual([], self.index.nearest(0, 0, 0))
+    self.assertEqual(5, len(self.index.nearest(0, 0, 100)))
+
+  def test_empty(self):
+    index = spatial.build([])
+    self.assertEqual([], index.intersects((0, 0, 1, 1)))
+    self.assertEqual([], index.contains((0, 0, 1, 1)))
+    self.assertEqual([], index.nearest(0, 0, 1))
+
+  def test_matches_linear_scan(self):
+    nodes = random_nodes(1000, seed=1)
+    index = spatial.build(nodes)
+    self.assertGreater(len(index.levels), 2)
+    rng = random.Random(2)
+    for _ in range(200):
+      x1 = rng.uniform(-180, 180)
+      x2 = rng.uniform(-180, 180)
+      y1 = rng.uniform(-90, 80)
+      query = (x1, y1, x2, y1 + rng.uniform(0, 10))
+      self.assertEqual(
+          spatial.linear_intersects(nodes, query), index.intersects(query))
+
+  def test_nearest_matches_sorted_distances(self):
+    nodes = random_nodes(500, seed=3)
+    index = spatial.build(nodes)
+    distances = sorted(
+        min(spatial.distance(20, 10, part)
+            for part in spatial.split(spatial.bbox(node)))
+        for node in nodes)
+    nearest = index.nearest(20, 10, 10)
+    self.assertEqual(distances[:10], [d for _, d in nearest])
+
+  def test_save_and_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'spatial.bin'
+      spatial.save(self.index, path)
+      loaded = spatial.load(path)
+      self.assertEqual(self.index.ids, loaded.ids)
+      self.assertEqual(
+          self.index.intersects((0, 30, 5, 40)),
+          loaded.intersects((0, 30, 5, 40)))
+      self.assertEqual(
+          self.index.nearest(-160, 0, 3), loaded.nearest(-160, 0, 3))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,157 @@
+"""Interval index over the temporal extents of the STAC Collections.
+
+Answers which datasets overlap a time range, which datasets were active at an
+instant, and which datasets are ongoing, without parsing the time of every node
+for each query.
+
+Each extent.temporal.interval is parsed once into int64 seconds since the
+epoch.  Ongoing datasets, with an end of None, get an end of OPEN_END.  The
+intervals are sorted by start and a max-end segment tree is built over them:
+entry i of the tree is the largest end of the intervals under it.  For a
+query, a binary search finds the intervals that start before the query ends
+and the tree skips every subtree where all the intervals end before the query
+starts.  Each of the m results is reached by its own walk down from the root,
+so queries take O(m log n), and O(log n) when nothing matches.
+
+All of the arrays are flat int64 arrays, so the index is saved and loaded with
+array_file.
+"""
+
+import array
+import bisect
+import dataclasses
+import datetime
+import pathlib
+from typing import Optional
+
+from checker import array_file
+from checker import stac
+from checker.node import extent
+
+EXTENT = extent.EXTENT
+INTERVAL = extent.INTERVAL
+TEMPORAL = extent.TEMPORAL
+
+MAGIC = b'EETEMPO1'
+OPEN_END = 2**63 - 1
+_EMPTY_TREE = -2**63
+
+
+def seconds(when: datetime.datetime) -> int:
+  """Returns seconds since the epoch.  Naive times are treated as UTC."""
+  if when.tzinfo is None:
+    when = when.replace(tzinfo=datetime.timezone.utc)
+  return int(when.timestamp())
+
+
+def interval(node: stac.Node) -> Optional[tuple[int, int]]:
+  """Returns the start and end seconds of a node or None if not valid."""
+  try:
+    start, end = node.stac[EXTENT][TEMPORAL][INTERVAL][0]
+  except (KeyError, IndexError, TypeError, ValueError):
+    return None
+  try:
+    start_seconds = seconds(datetime.datetime.strptime(start, extent.ISO8601))
+    if end is None:
+      end_seconds = OPEN_END
+    else:
+      end_seconds = seconds(datetime.datetime.strptime(end, extent.ISO8601))
+  except (TypeError, ValueError):
+    return None
+  if start_seconds > end_seconds:
+    return None
+  return start_seconds, end_seconds
+
+
+@dataclasses.dataclass
+class TemporalIndex:
+  """Intervals sorted by start with a max-end segment tree."""
+  ids: list[str]
+  starts: array_file.Array
+  ends: array_file.Array
+  # A complete binary tree with the leaves at max_ends[size:size + len(ids)].
+  max_ends: array_file.Array
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  def _size(self) -> int:
+    return len(self.max_ends) // 2
+
+  def _overlapping(self, start: int, end: int) -> list[int]:
+    """Returns the positions of intervals that overlap [start, end]."""
+    # Only intervals that start at or before the end can overlap.
+    limit = bisect.bisect_right(self.starts, end)
+    result = []
+    if not limit:
+      return result
+    size = self._size()
+    stack = [(1, 0, size)]
+    while stack:
+      tree_index, low, high = stack.pop()
+      if low >= limit or self.max_ends[tree_index] < start:
+        continue
+      if tree_index >= size:
+        result.append(low)
+        continue
+      middle = (low + high) // 2
+      stack.append((2 * tree_index + 1, middle, high))
+      stack.append((2 * tree_index, low, middle))
+    return result
+
+  def overlapping(
+      self, start: datetime.datetime,
+      end: Optional[datetime.datetime] = None) -> list[str]:
+    """Returns the ids of datasets that overlap start to end inclusive.
+
+    The ids are in order of dataset start time.  An end of None means no end.
+    """
+    end_seconds = OPEN_END if end is None else seconds(end)
+    positions = self._overlapping(seconds(start), end_seconds)
+    return [self.ids[i] for i in positions]
+
+  def active_at(self, when: datetime.datetime) -> list[str]:
+    """Returns the ids of the datasets with an interval that contains when."""
+    when_seconds = seconds(when)
+    return [self.ids[i] for i in self._overlapping(when_seconds, when_seconds)]
+
+  def ongoing(self) -> list[str]:
+    """Returns the ids of datasets without an end."""
+    return [self.ids[i] for i in self._overlapping(OPEN_END, OPEN_END)]
+
+
+def build(nodes: list[stac.Node]) -> TemporalIndex:
+  """Returns an index of all the nodes that have a valid interval."""
+  entries = []
+  for node in nodes:
+    node_interval = interval(node)
+    if node_interval is not None:
+      entries.append((node_interval[0], node_interval[1], node.id))
+  entries.sort()
+
+  ids = [dataset_id for _, _, dataset_id in entries]
+  starts = array.array('q', (start for start, _, _ in entries))
+  ends = array.array('q', (end for _, end, _ in entries))
+
+  size = 1
+  while size < len(entries):
+    size *= 2
+  max_ends = array.array('q', [_EMPTY_TREE]) * (2 * size)
+  max_ends[size:size + len(ends)] = ends
+  for i in range(size - 1, 0, -1):
+    max_ends[i] = max(max_ends[2 * i], max_ends[2 * i + 1])
+
+  return TemporalIndex(ids, starts, ends, max_ends)
+
+
+def save(index: TemporalIndex, path: pathlib.Path) -> None:
+  arrays = {
+      'starts': index.starts, 'ends': index.ends, 'max_ends': index.max_ends}
+  array_file.save(path, MAGIC, {'ids': index.ids}, arrays)
+
+
+def load(path: pathlib.Path) -> TemporalIndex:
+  """Returns the index in path with the arrays memory mapped."""
+  metadata, arrays = array_file.load(path, MAGIC)
+  return TemporalIndex(
+      metadata['ids'], arrays['starts'], arrays['ends'], arrays['max_ends'])
@@ -0,0 +1,133 @@
+"""Tests for temporal."""
+
+import datetime
+import pathlib
+import random
+import tempfile
+
+from checker import stac
+from checker.index import temporal
+from checker.node import extent
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+UTC = datetime.timezone.utc
+
+
+def collection_node(dataset_id: str, start, end) -> stac.Node:
+  stac_data = {'extent': {'temporal': {'interval': [[start, end]]}}}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+def utc(year: int, month: int = 1, day: int = 1) -> datetime.datetime:
+  return datetime.datetime(year, month, day, tzinfo=UTC)
+
+
+NODES = [
+    stac.Node('CATALOG', FILE_PATH, CATALOG, NONE, {}),
+    collection_node('AVHRR', '1978-01-01T00:00:00Z', '1990-01-01T00:00:00Z'),
+    collection_node('LANDSAT5', '1984-03-01T00:00:00Z', '2012-05-05T00:00:00Z'),
+    collection_node('MODIS', '2000-02-24T00:00:00Z', None),
+    collection_node('OLD', '1700-01-01T00:00:00Z', '1800-01-01T00:00:00Z'),
+    collection_node('S2', '2015-06-23T00:00:00Z', None),
+    collection_node('BAD_DATE', 'not a date', None),
+    collection_node('BACKWARDS', '2015-06-23T00:00:00Z',
+                    '2010-01-01T00:00:00Z'),
+]
+
+
+class HelperTest(unittest.TestCase):
+
+  def test_seconds(self):
+    self.assertEqual(0, temporal.seconds(utc(1970)))
+    self.assertEqual(0, temporal.seconds(datetime.datetime(1970, 1, 1)))
+    self.assertEqual(-86400, temporal.seconds(utc(1969, 12, 31)))
+
+  def test_interval(self):
+    self.assertEqual(
+        (temporal.seconds(utc(2000, 2, 24)), temporal.OPEN_END),
+        temporal.interval(NODES[3]))
+    self.assertIsNone(temporal.interval(NODES[0]))
+    self.assertIsNone(temporal.interval(NODES[-2]))
+    self.assertIsNone(temporal.interval(NODES[-1]))
+
+
+class TemporalIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = temporal.build(NODES)
+
+  def test_len(self):
+    self.assertEqual(5, len(self.index))
+
+  def test_overlapping(self):
+    self.assertEqual(
+        ['AVHRR', 'LANDSAT5'], self.index.overlapping(utc(1980), utc(1985)))
+    self.assertEqual(['OLD'], self.index.overlapping(utc(1600), utc(1750)))
+    self.assertEqual([], self.index.overlapping(utc(1850), utc(1900)))
+    self.assertEqual(
+        ['LANDSAT5', 'MODIS', 'S2'], self.index.overlapping(utc(2012)))
+
+  def test_overlapping_is_inclusive(self):
+    self.assertEqual(['AVHRR'], self.index.overlapping(utc(1970), utc(1978)))
+    self.assertEqual(
+        ['AVHRR', 'LANDSAT5'], self.index.overlapping(utc(1990), utc(1990)))
+
+  def test_active_at(self):
+    self.assertEqual(['LANDSAT5', 'MODIS'], self.index.active_at(utc(2005)))
+    self.assertEqual(['MODIS', 'S2'], self.index.active_at(utc(2400)))
+
+  def test_ongoing(self):
+    self.assertEqual(['MODIS', 'S2'], self.index.ongoing())
+
+  def test_empty(self):
+    index = temporal.build([])
+    self.assertEqual([], index.overlapping(utc(1980), utc(1985)))
+    self.assertEqual([], index.ongoing())
+
+  def test_matches_linear_scan(self):
+    rng = random.Random(1)
+    nodes = []
+    for i in range(1000):
+      start = utc(1900) + datetime.timedelta(days=rng.randrange(45000))
+      if rng.random() < 0.2:
+        end = None
+      else:
+        end = start + datetime.timedelta(days=rng.randrange(5000))
+        end = end.strftime(extent.ISO8601)
+      nodes.append(collection_node(
+          f'N{i}', start.strftime(extent.ISO8601), end))
+    index = temporal.build(nodes)
+
+    intervals = {node.id: temporal.interval(node) for node in nodes}
+    for _ in range(100):
+      start = utc(1900) + datetime.timedelta(days=rng.randrange(50000))
+      end = start + datetime.timedelta(days=rng.randrange(2000))
+      start_seconds = temporal.seconds(start)
+      end_seconds = temporal.seconds(end)
+      expect = sorted(
+          dataset_id for dataset_id, (a, b) in intervals.items()
+          if a <= end_seconds and start_seconds <= b)
+      self.assertEqual(expect, sorted(index.overlapping(start, end)))
+
+  def test_save_and_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'temporal.bin'
+      temporal.save(self.index, path)
+      loaded = temporal.load(path)
+      self.assertEqual(self.index.ids, loaded.ids)
+      self.assertIsInstance(loaded.starts, memoryview)
+      self.assertEqual(
+          self.index.overlapping(utc(1980), utc(1985)),
+          loaded.overlapping(utc(1980), utc(1985)))
+      self.assertEqual(self.index.ongoing(), loaded.ongoing())
+
+
+if __name__ == '__main__':
+  unittest.main()
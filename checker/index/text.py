@@ -0,0 +1,192 @@
+"""BM25 full-text search over the title, description, and keywords of nodes.
+
+Scores use BM25F: the term frequencies of each field are normalized by that
+field's length relative to its average length, weighted by FIELD_WEIGHTS,
+summed, and then saturated once with K1.  A match in a title counts more than
+a match in a long description.
+
+The tokenizer is tuned for the catalog.  Dataset ids, band names, and units
+such as "MODIS/006/MOD09GA", "SR_B4", and "W/m^2" are kept whole and each of
+their parts is also a token, so "mod09ga", "sr_b4", "b4", and "w/m^2" all
+match.
+
+Nodes can be added, replaced, or removed one at a time, which only touches the
+terms of that node.  The index is saved as json.
+"""
+
+import collections
+import dataclasses
+import heapq
+import json
+import math
+import pathlib
+import re
+from typing import Iterator, Optional
+
+from checker import stac
+
+DESCRIPTION = 'description'
+KEYWORDS = 'keywords'
+TITLE = 'title'
+
+FIELDS = (TITLE, DESCRIPTION, KEYWORDS)
+FIELD_WEIGHTS = {TITLE: 3.0, DESCRIPTION: 1.0, KEYWORDS: 2.0}
+
+K1 = 1.2
+B = 0.75
+
+# Runs of characters that can be part of an id, band name, or unit.
+_WORD_RE = re.compile(r'[\w/^.%°+-]+')
+_PART_RE = re.compile(r'[/_.-]')
+_STRIP = './-+'
+
+
+def tokenize(text: str) -> Iterator[str]:
+  """Yields the lower case tokens of text."""
+  for word in _WORD_RE.findall(text.lower()):
+    word = word.strip(_STRIP)
+    if not word:
+      continue
+    yield word
+    parts = [part for part in _PART_RE.split(word) if part]
+    if len(parts) > 1:
+      yield from parts
+
+
+def field_text(node: stac.Node, field: str) -> str:
+  value = node.stac.get(field)
+  if isinstance(value, str):
+    return value
+  if isinstance(value, list):
+    return ' '.join(item for item in value if isinstance(item, str))
+  return ''
+
+
+@dataclasses.dataclass
+class TextIndex:
+  """Term frequencies by field for each indexed node."""
+  # The id for each ordinal or None for removed nodes.
+  ids: list[Optional[str]] = dataclasses.field(default_factory=list)
+  # For each ordinal, the number of tokens in each field.
+  lengths: list[list[int]] = dataclasses.field(default_factory=list)
+  # term -> ordinal -> count of the term in each field.
+  postings: dict[str, dict[int, list[int]]] = dataclasses.field(
+      default_factory=dict)
+  total_lengths: list[int] = dataclasses.field(
+      default_factory=lambda: [0] * len(FIELDS))
+  num_docs: int = 0
+
+  def __post_init__(self):
+    # Lookups so that changing one node only touches that node's terms.
+    self._ordinals = {
+        an_id: ordinal for ordinal, an_id in enumerate(self.ids)
+        if an_id is not None}
+    self._doc_terms = [[] for _ in self.ids]
+    for term, docs in self.postings.items():
+      for ordinal in docs:
+        self._doc_terms[ordinal].append(term)
+
+  def __len__(self) -> int:
+    return self.num_docs
+
+  def remove(self, dataset_id: str) -> bool:
+    """Removes a node from the index.  Returns False if it was not there."""
+    ordinal = self._ordinals.pop(dataset_id, None)
+    if ordinal is None:
+      return False
+    for term in self._doc_terms[ordinal]:
+      term_postings = self.postings[term]
+      del term_postings[ordinal]
+      if not term_postings:
+        del self.postings[term]
+    for i, length in enumerate(self.lengths[ordinal]):
+      self.total_lengths[i] -= length
+    self.ids[ordinal] = None
+    self.lengths[ordinal] = [0] * len(FIELDS)
+    self._doc_terms[ordinal] = []
+    self.num_docs -= 1
+    return True
+
+  def add(self, node: stac.Node) -> None:
+    """Adds a node, replacing any earlier version of a node with its id."""
+    ordinal = self._ordinals.get(node.id)
+    if ordinal is not None:
+      self.remove(node.id)
+    else:
+      ordinal = len(self.ids)
+      self.ids.append(None)
+      self.lengths.append([0] * len(FIELDS))
+      self._doc_terms.append([])
+
+    self.ids[ordinal] = node.id
+    self._ordinals[node.id] = ordinal
+    self.num_docs += 1
+    for i, field in enumerate(FIELDS):
+      counts = collections.Counter(tokenize(field_text(node, field)))
+      length = sum(counts.values())
+      self.lengths[ordinal][i] = length
+      self.total_lengths[i] += length
+      for term, count in counts.items():
+        term_counts = self.postings.setdefault(term, {}).setdefault(
+            ordinal, [0] * len(FIELDS))
+        if not any(term_counts):
+          self._doc_terms[ordinal].append(term)
+        term_counts[i] = count
+
+  def _idf(self, term: str) -> float:
+    doc_count = len(self.postings.get(term, {}))
+    return math.log(1 + (self.num_docs - doc_count + 0.5) / (doc_count + 0.5))
+
+  def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+    """Returns up to limit (id, score) pairs, best first."""
+    if not self.num_docs:
+      return []
+    average_lengths = [
+        total / self.num_docs if total else 1.0 for total in self.total_lengths]
+    weights = [FIELD_WEIGHTS[field] for field in FIELDS]
+
+    scores = collections.defaultdict(float)
+    for term in set(tokenize(query)):
+      if term not in self.postings:
+        continue
+      idf = self._idf(term)
+      for ordinal, counts in self.postings[term].items():
+        lengths = self.lengths[ordinal]
+        tf = 0.0
+        for i, count in enumerate(counts):
+          if count:
+            norm = 1 - B + B * lengths[i] / average_lengths[i]
+            tf += weights[i] * count / norm
+        scores[ordinal] += idf * tf / (K1 + tf)
+
+    best = heapq.nlargest(
+        limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(self.ids[ordinal], score) for ordinal, score in best]
+
+
+def build(nodes: list[stac.Node]) -> TextIndex:
+  index = TextIndex()
+  for node in nodes:
+    index.add(node)
+  return index
+
+
+def save(index: TextIndex, path: pathlib.Path) -> None:
+  data = {
+      'ids': index.ids,
+      'lengths': index.lengths,
+      'postings': index.postings,
+      'total_lengths': index.total_lengths,
+      'num_docs': index.num_docs,
+  }
+  path.write_text(json.dumps(data, separators=(',', ':')))
+
+
+def load(path: pathlib.Path) -> TextIndex:
+  data = json.loads(path.read_text())
+  postings = {
+      term: {int(ordinal): counts for ordinal, counts in docs.items()}
+      for term, docs in data['postings'].items()}
+  return TextIndex(
+      data['ids'], data['lengths'], postings, data['total_lengths'],
+      data['num_docs'])
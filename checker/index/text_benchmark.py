@@ -0,0 +1,89 @@
+"""Time building, saving, loading, and querying the full-text index.
+
+The queries are words taken from the titles in the catalog, so every query has
+at least one match.
+"""
+
+from collections.abc import Sequence
+import pathlib
+import random
+import statistics
+import tempfile
+import time
+
+from absl import app
+from absl import flags
+
+from checker import stac
+from checker.index import text
+
+_NUM_QUERIES = flags.DEFINE_integer(
+    'num_queries', 1000, 'Number of queries to time.')
+_WORDS_PER_QUERY = flags.DEFINE_integer(
+    'words_per_query', 2, 'Number of title words in each query.')
+_SEED = flags.DEFINE_integer('seed', 0, 'Random seed for picking the words.')
+
+
+def queries(
+    nodes: list[stac.Node], count: int, words: int, seed: int) -> list[str]:
+  """Returns queries made of random words from the node titles."""
+  vocabulary = sorted({
+      word for node in nodes
+      for word in text.tokenize(text.field_text(node, text.TITLE))})
+  rng = random.Random(seed)
+  return [' '.join(rng.sample(vocabulary, min(words, len(vocabulary))))
+          for _ in range(count)]
+
+
+def query_latencies(
+    index: text.TextIndex, query_list: list[str]) -> list[float]:
+  """Returns the seconds taken by each query."""
+  latencies = []
+  for query in query_list:
+    start = time.perf_counter()
+    index.search(query)
+    latencies.append(time.perf_counter() - start)
+  return latencies
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  nodes = stac.load(stac.stac_root())
+  print('Number of STAC nodes loaded:', len(nodes))
+
+  start = time.perf_counter()
+  index = text.build(nodes)
+  print(f'Build: {(time.perf_counter() - start) * 1000:.1f} ms')
+  print('Terms:', len(index.postings))
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    path = pathlib.Path(tmp_dir) / 'text.json'
+    start = time.perf_counter()
+    text.save(index, path)
+    print(f'Save: {(time.perf_counter() - start) * 1000:.1f} ms')
+    print('Size:', path.stat().st_size, 'bytes')
+    start = time.perf_counter()
+    index = text.load(path)
+    print(f'Load: {(time.perf_counter() - start) * 1000:.1f} ms')
+
+  if nodes:
+    start = time.perf_counter()
+    index.add(nodes[-1])
+    print(f'Update one node: {(time.perf_counter() - start) * 1e6:.1f} us')
+
+  query_list = queries(
+      nodes, _NUM_QUERIES.value, _WORDS_PER_QUERY.value, _SEED.value)
+  latencies = sorted(query_latencies(index, query_list))
+  if not latencies:
+    return
+  p50 = statistics.median(latencies)
+  p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+  print(f'Query p50: {p50 * 1e6:.1f} us')
+  print(f'Query p99: {p99 * 1e6:.1f} us')
+  print(f'Queries per second: {len(latencies) / sum(latencies):.0f}')
+
+
+if __name__ == '__main__':
+  app.run(main)
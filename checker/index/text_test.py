@@ -0,0 +1,125 @@
+"""Tests for text."""
+
+import pathlib
+import tempfile
+
+from checker import stac
+from checker.index import text
+import unittest
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def collection_node(dataset_id, title, description, keywords) -> stac.Node:
+  stac_data = {
+      'title': title, 'description': description, 'keywords': keywords}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+NODES = [
+    collection_node(
+        'MODIS/006/MOD09GA', 'MOD09GA.006 Terra Surface Reflectance Daily',
+        'Surface reflectance from MODIS/006/MOD09GA for bands sur_refl_b01.',
+        ['modis', 'sr', 'terra']),
+    collection_node(
+        'LANDSAT/LC08/C02/T1_L2', 'USGS Landsat 8 Level 2, Collection 2',
+        'Atmospherically corrected surface reflectance in band SR_B4. ' * 10,
+        ['landsat', 'lc08', 'sr']),
+    collection_node(
+        'ECMWF/ERA5/DAILY', 'ERA5 Daily Aggregates',
+        'Surface net solar radiation in W/m^2 and wind in m/s.',
+        ['climate', 'era5', 'radiation']),
+    collection_node(
+        'NASA/GPM', 'GPM: Global Precipitation Measurement',
+        'Precipitation in mm/hr.', 'not a list'),
+]
+
+
+class TokenizeTest(unittest.TestCase):
+
+  def test_words(self):
+    self.assertEqual(
+        ['surface', 'reflectance'], list(text.tokenize('Surface reflectance.')))
+
+  def test_ids_and_bands(self):
+    self.assertEqual(
+        ['modis/006/mod09ga', 'modis', '006', 'mod09ga'],
+        list(text.tokenize('MODIS/006/MOD09GA')))
+    self.assertEqual(['sr_b4', 'sr', 'b4'], list(text.tokenize('(SR_B4)')))
+
+  def test_units(self):
+    self.assertEqual(['w/m^2', 'w', 'm^2'], list(text.tokenize('W/m^2,')))
+    self.assertEqual(['%'], list(text.tokenize('%')))
+    self.assertEqual([], list(text.tokenize(' - ')))
+
+
+class TextIndexTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.index = text.build(NODES)
+
+  def ids(self, query: str) -> list[str]:
+    return [dataset_id for dataset_id, _ in self.index.search(query)]
+
+  def test_len(self):
+    self.assertEqual(4, len(self.index))
+
+  def test_search(self):
+    self.assertEqual(['ECMWF/ERA5/DAILY'], self.ids('w/m^2'))
+    self.assertEqual(['MODIS/006/MOD09GA'], self.ids('mod09ga'))
+    # The "sr" part also matches the MODIS keyword, but scores lower.
+    self.assertEqual(
+        ['LANDSAT/LC08/C02/T1_L2', 'MODIS/006/MOD09GA'], self.ids('SR_B4'))
+    self.assertEqual(['NASA/GPM'], self.ids('precipitation'))
+    self.assertEqual([], self.ids('nothing'))
+    self.assertEqual([], self.ids(''))
+
+  def test_title_outweighs_repeated_description(self):
+    # MODIS has "reflectance" in the title, Landsat has it 10 times in a much
+    # longer description.
+    self.assertEqual(
+        ['MODIS/006/MOD09GA', 'LANDSAT/LC08/C02/T1_L2'],
+        self.ids('reflectance'))
+
+  def test_limit(self):
+    self.assertEqual(1, len(self.index.search('surface', limit=1)))
+    scores = [score for _, score in self.index.search('surface sr')]
+    self.assertEqual(sorted(scores, reverse=True), scores)
+
+  def test_remove(self):
+    self.assertTrue(self.index.remove('ECMWF/ERA5/DAILY'))
+    self.assertFalse(self.index.remove('ECMWF/ERA5/DAILY'))
+    self.assertEqual(3, len(self.index))
+    self.assertEqual([], self.ids('era5'))
+    self.assertNotIn('era5', self.index.postings)
+
+  def test_update_matches_rebuild(self):
+    changed = collection_node(
+        'NASA/GPM', 'GPM: Global Rainfall', 'Rainfall in mm/hr.', ['rain'])
+    self.index.add(changed)
+    rebuilt = text.build(NODES[:3] + [changed])
+
+    self.assertEqual(4, len(self.index))
+    self.assertEqual([], self.ids('precipitation'))
+    for query in ('rainfall', 'surface reflectance', 'mm/hr'):
+      self.assertEqual(rebuilt.search(query), self.index.search(query))
+
+  def test_save_and_load(self):
+    self.index.remove('NASA/GPM')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'text.json'
+      text.save(self.index, path)
+      loaded = text.load(path)
+    self.assertEqual(self.index.search('surface'), loaded.search('surface'))
+    loaded.add(NODES[3])
+    self.assertEqual(['NASA/GPM'], [i for i, _ in loaded.search('mm/hr')])
+    self.assertTrue(loaded.remove('MODIS/006/MOD09GA'))
+    self.assertEqual([], [i for i, _ in loaded.search('mod09ga')])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,434 @@
+"""Validates STAC nodes against the vendored json schemas.
+
+The STAC 1.0.0 catalog and collection schemas and the eo, sar, scientific, and
+version extension schemas are in checker/schemas, so validation never touches
+the network.  References to the upstream urls resolve to the vendored copies
+by their $id.
+
+Each schema is compiled once per process into a tree of closures and cached,
+so validating a node only walks the node.  This covers the subset of json
+schema draft-07 that the vendored schemas use.  Compiling a schema with any
+other keyword raises a ValueError rather than silently ignoring it.
+
+validate_all can spread the nodes over worker processes.
+"""
+
+import concurrent.futures
+import functools
+import json
+import math
+import pathlib
+import re
+from typing import Callable, Iterator
+
+from checker.node import extensions
+
+STAC_EXTENSIONS = extensions.STAC_EXTENSIONS
+TYPE = 'type'
+
+SCHEMA_DIR = pathlib.Path(__file__).parent / 'schemas'
+
+TYPE_SCHEMAS = {
+    'Catalog': 'catalog.json',
+    'Collection': 'collection.json',
+}
+
+EXTENSION_SCHEMAS = dict(zip(extensions.EXTENSIONS, [
+    'eo.json', 'sar.json', 'scientific.json', 'version.json']))
+
+# Keywords that only annotate a schema.
+_ANNOTATIONS = frozenset({
+    '$comment', '$id', '$schema', 'default', 'definitions', 'description',
+    'format', 'title'})
+
+# The method of _Compiler for each keyword that constrains instances.
+_KEYWORDS = {
+    'type': '_type_of',
+    'enum': '_enum',
+    'const': '_const',
+    'allOf': '_all_of',
+    'anyOf': '_any_of',
+    'oneOf': '_one_of',
+    'not': '_not',
+    'required': '_required',
+    'properties': '_properties',
+    'patternProperties': '_pattern_properties',
+    'additionalProperties': '_additional_properties',
+    'minProperties': '_min_properties',
+    'items': '_items',
+    'contains': '_contains',
+    'minItems': '_min_items',
+    'maxItems': '_max_items',
+    'uniqueItems': '_unique_items',
+    'minLength': '_min_length',
+    'maxLength': '_max_length',
+    'pattern': '_pattern',
+    'minimum': '_minimum',
+    'maximum': '_maximum',
+}
+
+# Yields an error message for each problem with an instance at a path.
+Validator = Callable[[object, str], Iterator[str]]
+
+_TYPES = {
+    'array': lambda value: isinstance(value, list),
+    'boolean': lambda value: isinstance(value, bool),
+    'integer': lambda value: (
+        isinstance(value, int) and not isinstance(value, bool) or
+        isinstance(value, float) and value.is_integer()),
+    'null': lambda value: value is None,
+    'number': lambda value: (
+        isinstance(value, (int, float)) and not isinstance(value, bool)),
+    'object': lambda value: isinstance(value, dict),
+    'string': lambda value: isinstance(value, str),
+}
+
+
+def _is_number(value: object) -> bool:
+  return _TYPES['number'](value)
+
+
+def _equal(a: object, b: object) -> bool:
+  """Json equality, where True is not 1."""
+  if isinstance(a, bool) or isinstance(b, bool):
+    return isinstance(a, bool) and isinstance(b, bool) and a == b
+  return a == b
+
+
+def _freeze(value: object) -> str:
+  return json.dumps(value, sort_keys=True)
+
+
+@functools.cache
+def _ids() -> dict[str, str]:
+  """Returns the vendored file name for each schema $id."""
+  result = {}
+  for path in sorted(SCHEMA_DIR.glob('*.json')):
+    schema_id = json.loads(path.read_text()).get('$id', '')
+    result[schema_id.rstrip('#')] = path.name
+  return result
+
+
+@functools.cache
+def _document(name: str) -> dict[str, object]:
+  return json.loads((SCHEMA_DIR / name).read_text())
+
+
+def _resolve(name: str, pointer: str) -> object:
+  schema = _document(name)
+  for part in pointer.strip('/').split('/') if pointer.strip('/') else []:
+    schema = schema[part.replace('~1', '/').replace('~0', '~')]
+  return schema
+
+
+class _Compiler:
+  """Turns the schemas of one document into validators."""
+
+  def __init__(self):
+    # (document, pointer) -> validator, for references and recursion.
+    self._compiled: dict[tuple[str, str], Validator] = {}
+
+  def ref(self, name: str, pointer: str) -> Validator:
+    key = (name, pointer)
+    if key not in self._compiled:
+      slot: list[Validator] = []
+      # A placeholder so that a schema that refers to itself terminates.
+      self._compiled[key] = lambda value, path: slot[0](value, path)
+      slot.append(self.compile(_resolve(name, pointer), name))
+      self._compiled[key] = slot[0]
+    return self._compiled[key]
+
+  def _reference(self, ref: str, name: str) -> Validator:
+    url, _, pointer = ref.partition('#')
+    if url:
+      if url.rstrip('#') not in _ids():
+        raise ValueError(f'Reference to a schema that is not vendored: {ref}')
+      name = _ids()[url.rstrip('#')]
+    return self.ref(name, pointer)
+
+  def compile(self, schema: object, name: str) -> Validator:
+    """Returns a validator for schema, which is part of document name."""
+    if schema is True or schema == {}:
+      return lambda value, path: iter(())
+    if schema is False:
+      return lambda value, path: iter([f'{path}: not allowed'])
+    if not isinstance(schema, dict):
+      raise ValueError(f'Not a schema in {name}: {schema!r}')
+
+    checks: list[Validator] = []
+    for keyword, argument in schema.items():
+      if keyword in _ANNOTATIONS or keyword in ('then', 'else'):
+        continue
+      if keyword == '$ref':
+        checks.append(self._reference(argument, name))
+      elif keyword == 'if':
+        checks.append(self._if_then_else(schema, name))
+      elif keyword in _KEYWORDS:
+        method = getattr(self, _KEYWORDS[keyword])
+        checks.append(method(argument, schema, name))
+      else:
+        raise ValueError(f'Unsupported keyword in {name}: {keyword}')
+
+    def validate(value: object, path: str) -> Iterator[str]:
+      for check in checks:
+        yield from check(value, path)
+    return validate
+
+  # Keywords for any type.
+
+  def _type_of(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    names = [argument] if isinstance(argument, str) else argument
+    tests = [_TYPES[type_name] for type_name in names]
+    def validate(value, path):
+      if not any(test(value) for test in tests):
+        yield f'{path}: expected {" or ".join(names)}'
+    return validate
+
+  def _enum(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if not any(_equal(value, choice) for choice in argument):
+        yield f'{path}: {value!r} is not one of {argument}'
+    return validate
+
+  def _const(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if not _equal(value, argument):
+        yield f'{path}: expected {argument!r}'
+    return validate
+
+  def _all_of(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validators = [self.compile(sub, name) for sub in argument]
+    def validate(value, path):
+      for validator in validators:
+        yield from validator(value, path)
+    return validate
+
+  def _any_of(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validators = [self.compile(sub, name) for sub in argument]
+    def validate(value, path):
+      if not any(next(v(value, path), None) is None for v in validators):
+        yield f'{path}: does not match any of the allowed schemas'
+    return validate
+
+  def _one_of(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validators = [self.compile(sub, name) for sub in argument]
+    def validate(value, path):
+      matches = sum(next(v(value, path), None) is None for v in validators)
+      if matches != 1:
+        yield f'{path}: matches {matches} of the schemas instead of exactly 1'
+    return validate
+
+  def _not(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validator = self.compile(argument, name)
+    def validate(value, path):
+      if next(validator(value, path), None) is None:
+        yield f'{path}: matches a schema that is not allowed'
+    return validate
+
+  def _if_then_else(self, schema, name) -> Validator:
+    condition = self.compile(schema['if'], name)
+    then = self.compile(schema.get('then', True), name)
+    otherwise = self.compile(schema.get('else', True), name)
+    def validate(value, path):
+      if next(condition(value, path), None) is None:
+        yield from then(value, path)
+      else:
+        yield from otherwise(value, path)
+    return validate
+
+  # Objects.
+
+  def _required(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, dict):
+        for field in argument:
+          if field not in value:
+            yield f'{path}: missing required "{field}"'
+    return validate
+
+  def _properties(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validators = {
+        field: self.compile(sub, name) for field, sub in argument.items()}
+    def validate(value, path):
+      if isinstance(value, dict):
+        for field, validator in validators.items():
+          if field in value:
+            yield from validator(value[field], f'{path}.{field}')
+    return validate
+
+  def _pattern_properties(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validators = [
+        (re.compile(pattern), self.compile(sub, name))
+        for pattern, sub in argument.items()]
+    def validate(value, path):
+      if isinstance(value, dict):
+        for field, item in value.items():
+          for pattern, validator in validators:
+            if pattern.search(field):
+              yield from validator(item, f'{path}.{field}')
+    return validate
+
+  def _additional_properties(self, argument, schema, name) -> Validator:
+    known = set(schema.get('properties', {}))
+    patterns = [re.compile(p) for p in schema.get('patternProperties', {})]
+    validator = self.compile(argument, name)
+    def validate(value, path):
+      if isinstance(value, dict):
+        for field, item in value.items():
+          if field in known or any(p.search(field) for p in patterns):
+            continue
+          yield from validator(item, f'{path}.{field}')
+    return validate
+
+  def _min_properties(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, dict) and len(value) < argument:
+        yield f'{path}: fewer than {argument} properties'
+    return validate
+
+  # Arrays.
+
+  def _items(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    if isinstance(argument, list):
+      raise ValueError(f'Tuple items are not supported in {name}')
+    validator = self.compile(argument, name)
+    def validate(value, path):
+      if isinstance(value, list):
+        for i, item in enumerate(value):
+          yield from validator(item, f'{path}[{i}]')
+    return validate
+
+  def _contains(self, argument, schema, name) -> Validator:
+    del schema  # Unused.
+    validator = self.compile(argument, name)
+    def validate(value, path):
+      if isinstance(value, list) and not any(
+          next(validator(item, path), None) is None for item in value):
+        yield f'{path}: no item matches {_freeze(argument)}'
+    return validate
+
+  def _min_items(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, list) and len(value) < argument:
+        yield f'{path}: fewer than {argument} items'
+    return validate
+
+  def _max_items(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, list) and len(value) > argument:
+        yield f'{path}: more than {argument} items'
+    return validate
+
+  def _unique_items(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if argument and isinstance(value, list):
+        frozen = [_freeze(item) for item in value]
+        if len(frozen) != len(set(frozen)):
+          yield f'{path}: items are not unique'
+    return validate
+
+  # Strings.
+
+  def _min_length(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, str) and len(value) < argument:
+        yield f'{path}: shorter than {argument}'
+    return validate
+
+  def _max_length(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if isinstance(value, str) and len(value) > argument:
+        yield f'{path}: longer than {argument}'
+    return validate
+
+  def _pattern(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    pattern = re.compile(argument)
+    def validate(value, path):
+      if isinstance(value, str) and not pattern.search(value):
+        yield f'{path}: {value!r} does not match {argument}'
+    return validate
+
+  # Numbers.
+
+  def _minimum(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if _is_number(value) and not math.isnan(value) and value < argument:
+        yield f'{path}: less than {argument}'
+    return validate
+
+  def _maximum(self, argument, schema, name) -> Validator:
+    del schema, name  # Unused.
+    def validate(value, path):
+      if _is_number(value) and not math.isnan(value) and value > argument:
+        yield f'{path}: greater than {argument}'
+    return validate
+
+
+@functools.cache
+def validator(name: str) -> Validator:
+  """Returns the compiled validator for a vendored schema file."""
+  return _Compiler().ref(name, '')
+
+
+def schemas_for(stac_data: dict[str, object]) -> list[str]:
+  """Returns the schema files that apply to a STAC node."""
+  result = []
+  type_schema = TYPE_SCHEMAS.get(stac_data.get(TYPE))
+  if type_schema:
+    result.append(type_schema)
+  node_extensions = stac_data.get(STAC_EXTENSIONS)
+  if isinstance(node_extensions, list):
+    for extension in node_extensions:
+      if isinstance(extension, str) and extension in EXTENSION_SCHEMAS:
+        result.append(EXTENSION_SCHEMAS[extension])
+  return result
+
+
+def validate(stac_data: dict[str, object]) -> list[str]:
+  """Returns the errors for a node as "schema: path: message" strings."""
+  if stac_data.get(TYPE) not in TYPE_SCHEMAS:
+    return [f'No schema for type: {stac_data.get(TYPE)}']
+  errors = []
+  for name in schemas_for(stac_data):
+    errors.extend(
+        f'{name}: {error}' for error in validator(name)(stac_data, '$'))
+  return errors
+
+
+def validate_all(
+    stacs: list[dict[str, object]],
+    processes: int = 1) -> list[list[str]]:
+  """Returns the errors for each node, optionally in worker processes.
+
+  Args:
+    stacs: The json of the nodes.
+    processes: The number of worker processes.  With 1, everything runs in
+      this process.
+
+  Returns:
+    A list of errors for each of stacs, in the same order.
+  """
+  if processes <= 1 or len(stacs) < 2:
+    return [validate(stac_data) for stac_data in stacs]
+  chunksize = max(1, len(stacs) // (processes * 4))
+  with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+    return list(executor.map(validate, stacs, chunksize=chunksize))
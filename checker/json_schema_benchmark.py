@@ -0,0 +1,62 @@
+"""Time validating the whole catalog against the json schemas.
+
+Reports how long compiling the schemas takes and the throughput of validating
+every node in this process and with worker processes.
+"""
+
+from collections.abc import Sequence
+import os
+import time
+
+from absl import app
+from absl import flags
+
+from checker import json_schema
+from checker import stac
+
+_PROCESSES = flags.DEFINE_integer(
+    'processes', os.cpu_count() or 1, 'Number of worker processes.')
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 3, 'Number of times to validate the catalog in each mode.')
+
+
+def throughput(
+    stacs: list[dict[str, object]], processes: int, repeats: int) -> float:
+  """Returns the best nodes per second over repeats."""
+  best = float('inf')
+  for _ in range(repeats):
+    start = time.perf_counter()
+    json_schema.validate_all(stacs, processes)
+    best = min(best, time.perf_counter() - start)
+  return len(stacs) / best if best else float('inf')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  nodes = stac.load(stac.stac_root())
+  stacs = [node.stac for node in nodes]
+  print('Number of STAC nodes loaded:', len(nodes))
+
+  start = time.perf_counter()
+  names = sorted(
+      set(json_schema.TYPE_SCHEMAS.values()) |
+      set(json_schema.EXTENSION_SCHEMAS.values()))
+  for name in names:
+    json_schema.validator(name)
+  print(f'Compile {len(names)} schemas: '
+        f'{(time.perf_counter() - start) * 1000:.1f} ms')
+
+  errors = sum(len(node_errors) for node_errors in json_schema.validate_all(
+      stacs, processes=1))
+  print('Errors:', errors)
+
+  serial = throughput(stacs, 1, _REPEATS.value)
+  print(f'1 process: {serial:.0f} nodes/s')
+  parallel = throughput(stacs, _PROCESSES.value, _REPEATS.value)
+  print(f'{_PROCESSES.value} processes: {parallel:.0f} nodes/s')
+
+
+if __name__ == '__main__':
+  app.run(main)
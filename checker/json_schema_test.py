@@ -0,0 +1,187 @@
+"""Tests for json_schema."""
+
+import copy
+
+from checker import json_schema
+import unittest
+
+PREFIX = 'https://storage.googleapis.com/earthengine-stac/catalog/'
+EO = 'https://stac-extensions.github.io/eo/v1.0.0/schema.json'
+SAR = 'https://stac-extensions.github.io/sar/v1.0.0/schema.json'
+SCI = 'https://stac-extensions.github.io/scientific/v1.0.0/schema.json'
+VERSION = 'https://stac-extensions.github.io/version/v1.0.0/schema.json'
+
+CATALOG = {
+    'type': 'Catalog',
+    'stac_version': '1.0.0',
+    'id': 'A',
+    'description': 'A catalog',
+    'links': [{'rel': 'self', 'href': PREFIX + 'A/catalog.json'}],
+}
+
+COLLECTION = {
+    'type': 'Collection',
+    'stac_version': '1.0.0',
+    'stac_extensions': [EO, SAR, SCI, VERSION],
+    'id': 'A/B',
+    'title': 'B',
+    'description': 'A collection',
+    'license': 'CC-BY-4.0',
+    'keywords': ['b'],
+    'providers': [{'name': 'A', 'roles': ['producer', 'licensor']}],
+    'extent': {
+        'spatial': {'bbox': [[-180, -90, 180, 90]]},
+        'temporal': {'interval': [['2000-01-01T00:00:00Z', None]]},
+    },
+    'links': [{'rel': 'self', 'href': PREFIX + 'A/A_B.json'}],
+    'summaries': {
+        'eo:bands': [{'name': 'B1', 'description': 'Band 1'}],
+        'sar:frequency_band': ['C'],
+        'sar:polarizations': ['HH', 'HV'],
+        'gee:schema': [{'name': 'x'}],
+        'year': {'minimum': 2000, 'maximum': 2020},
+    },
+    'sci:doi': '10.5067/MODIS/MOD09GA.006',
+    'version': '6',
+    'deprecated': False,
+}
+
+
+class SchemasTest(unittest.TestCase):
+
+  def test_every_schema_compiles(self):
+    for name in json_schema.TYPE_SCHEMAS.values():
+      self.assertIsNotNone(json_schema.validator(name))
+    for name in json_schema.EXTENSION_SCHEMAS.values():
+      self.assertIsNotNone(json_schema.validator(name))
+
+  def test_validator_is_cached(self):
+    self.assertIs(
+        json_schema.validator('eo.json'), json_schema.validator('eo.json'))
+
+  def test_schemas_for(self):
+    self.assertEqual(['catalog.json'], json_schema.schemas_for(CATALOG))
+    self.assertEqual(
+        ['collection.json', 'eo.json', 'sar.json', 'scientific.json',
+         'version.json'],
+        json_schema.schemas_for(COLLECTION))
+
+
+class ValidateTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.collection = copy.deepcopy(COLLECTION)
+
+  def test_valid(self):
+    self.assertEqual([], json_schema.validate(CATALOG))
+    self.assertEqual([], json_schema.validate(self.collection))
+
+  def test_unknown_type(self):
+    self.assertEqual(
+        ['No schema for type: Item'], json_schema.validate({'type': 'Item'}))
+
+  def test_required(self):
+    del self.collection['license']
+    self.assertEqual(
+        ['collection.json: $: missing required "license"'],
+        json_schema.validate(self.collection))
+
+  def test_bbox(self):
+    self.collection['extent']['spatial']['bbox'] = [[1, 2, 3]]
+    self.assertEqual(
+        ['collection.json: $.extent.spatial.bbox[0]: matches 0 of the schemas '
+         'instead of exactly 1'],
+        json_schema.validate(self.collection))
+
+  def test_interval(self):
+    self.collection['extent']['temporal']['interval'] = [['2000', 1]]
+    self.assertEqual([
+        "collection.json: $.extent.temporal.interval[0][0]: '2000' does not "
+        'match (\\+00:00|Z)$',
+        'collection.json: $.extent.temporal.interval[0][1]: expected string '
+        'or null',
+    ], json_schema.validate(self.collection))
+
+  def test_provider_role(self):
+    self.collection['providers'][0]['roles'] = ['owner']
+    self.assertEqual([
+        "collection.json: $.providers[0].roles[0]: 'owner' is not one of "
+        "['producer', 'licensor', 'processor', 'host']"
+    ], json_schema.validate(self.collection))
+
+  def test_empty_summary(self):
+    self.collection['summaries']['empty'] = []
+    self.assertEqual(
+        ['collection.json: $.summaries.empty: does not match any of the '
+         'allowed schemas'],
+        json_schema.validate(self.collection))
+
+  def test_eo_bands(self):
+    self.collection['summaries']['eo:bands'] = [
+        {'name': 'B1', 'center_wavelength': 'blue'}, {}]
+    self.assertEqual([
+        'eo.json: $.summaries.eo:bands[0].center_wavelength: expected number',
+        'eo.json: $.summaries.eo:bands[1]: fewer than 1 properties',
+    ], json_schema.validate(self.collection))
+
+  def test_sar(self):
+    self.collection['summaries']['sar:polarizations'] = ['HH', 'XX']
+    self.assertEqual([
+        "sar.json: $.summaries.sar:polarizations[1]: 'XX' is not one of "
+        "['HH', 'VV', 'HV', 'VH']"
+    ], json_schema.validate(self.collection))
+
+  def test_scientific_and_version(self):
+    self.collection['sci:doi'] = 'doi:10.5067/x'
+    self.collection['deprecated'] = 'no'
+    self.assertEqual([
+        "scientific.json: $.sci:doi: 'doi:10.5067/x' does not match "
+        '^(10[.][0-9]{2,}(?:[.][0-9]+)*/.+)$',
+        'version.json: $.deprecated: expected boolean',
+    ], json_schema.validate(self.collection))
+
+  def test_boolean_is_not_a_number(self):
+    self.collection['extent']['spatial']['bbox'] = [[True, 0, 1, 1]]
+    self.assertEqual(
+        ['collection.json: $.extent.spatial.bbox[0][0]: expected number'],
+        json_schema.validate(self.collection))
+
+  def test_validate_all(self):
+    bad = copy.deepcopy(CATALOG)
+    bad['stac_version'] = '0.9.0'
+    stacs = [CATALOG, bad, self.collection]
+    expect = [[], ["catalog.json: $.stac_version: expected '1.0.0'"], []]
+    self.assertEqual(expect, json_schema.validate_all(stacs, processes=1))
+    self.assertEqual(expect, json_schema.validate_all(stacs, processes=2))
+
+
+class CompileTest(unittest.TestCase):
+
+  def test_unsupported_keyword(self):
+    with self.assertRaisesRegex(ValueError, 'Unsupported .*: dependencies'):
+      json_schema._Compiler().compile({'dependencies': {}}, 'test')
+
+  def test_conditional(self):
+    validator = json_schema._Compiler().compile({
+        'if': {'type': 'string'},
+        'then': {'minLength': 2},
+        'else': {'minimum': 0}}, 'test')
+    self.assertEqual([], list(validator('ab', '$')))
+    self.assertEqual(['$: shorter than 2'], list(validator('a', '$')))
+    self.assertEqual(['$: less than 0'], list(validator(-1, '$')))
+
+  def test_not_and_additional_properties(self):
+    validator = json_schema._Compiler().compile({
+        'properties': {'a': {}},
+        'patternProperties': {'^x_': {'type': 'integer'}},
+        'additionalProperties': {'not': {'type': 'null'}}}, 'test')
+    self.assertEqual([], list(validator({'a': None, 'x_1': 2.0, 'b': 1}, '$')))
+    self.assertEqual(
+        ['$.x_1: expected integer',
+         '$.b: matches a schema that is not allowed'],
+        list(validator({'x_1': 'no', 'b': None}, '$')))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,337 @@
+"""A Merkle tree over the catalog and a diff of two of them.
+
+The tree follows the directories of the catalog, which mirror its catalogs:
+A/catalog.json sits in the directory A/ with the nodes it links to.  The hash
+of a node is its stac.Node.fingerprint, and the hash of a directory is the
+fingerprint of its listing, {name: hash}, where the names of subdirectories
+end in /.  So the hash of a directory covers its catalog and everything
+under it, and the root hash covers the whole catalog.
+
+diff compares the hashes of two trees from the root down and only descends
+into directories whose hashes differ.  Only the nodes that changed are read
+and compared field by field.
+
+A snapshot file saves the tree in the array_file layout so that a build can be
+diffed later without loading it again:
+
+- offsets: uint64 start of each record in data, plus the end
+- data: the records back to back, each either the canonical json of a node
+  or a directory listing as {name: [hash, record]}
+
+The metadata only has the root.  The file is mapped, and diff decodes a
+record the first time it looks at it, so the time to diff two snapshot files
+depends on the size of the changes and not on the size of the catalog.
+Directories and archives are loaded and hashed in full first.
+"""
+
+import array
+import dataclasses
+import enum
+import json
+import pathlib
+from typing import Iterator, Optional, Union
+
+from checker import archive
+from checker import array_file
+from checker import canonical
+from checker import stac
+
+MAGIC = b'EEMERKL1'
+DATA = 'data'
+OFFSETS = 'offsets'
+VERSION = 1
+
+SEPARATOR = '/'
+
+Listing = dict[str, 'Entry']
+
+
+@dataclasses.dataclass(frozen=True)
+class Entry:
+  """A node or directory in a Snapshot."""
+  hash: str
+  # Where the Snapshot keeps the node's json or the directory's listing.
+  record: int
+
+
+def is_directory(name: str) -> bool:
+  return name.endswith(SEPARATOR)
+
+
+def listing_hash(listing: Listing) -> str:
+  return canonical.fingerprint(
+      {name: entry.hash for name, entry in listing.items()})
+
+
+@dataclasses.dataclass
+class Stats:
+  listings_read: int = 0
+  nodes_read: int = 0
+
+  def summary(self) -> str:
+    return (
+        f'merkle: read {self.listings_read} directory listings and '
+        f'{self.nodes_read} nodes')
+
+
+class Snapshot:
+  """The Merkle tree of one build of the catalog."""
+  root: Entry
+
+  def __init__(self, stats: Optional[Stats] = None):
+    self.stats = stats or Stats()
+
+  def _listing(self, record: int) -> Listing:
+    raise NotImplementedError
+
+  def _stac(self, record: int) -> dict[str, object]:
+    raise NotImplementedError
+
+  def listing(self, entry: Entry) -> Listing:
+    """Returns the names and entries in a directory sorted by name."""
+    self.stats.listings_read += 1
+    return self._listing(entry.record)
+
+  def stac(self, entry: Entry) -> dict[str, object]:
+    self.stats.nodes_read += 1
+    return self._stac(entry.record)
+
+
+class MemorySnapshot(Snapshot):
+  """A Snapshot of loaded nodes."""
+
+  def __init__(self, nodes: list[stac.Node], stats: Optional[Stats] = None):
+    super().__init__(stats)
+    self.records: list[Union[Listing, dict[str, object]]] = []
+    self.listing_records: set[int] = set()
+    listings: dict[tuple[str, ...], Listing] = {(): {}}
+    for a_node in nodes:
+      parts = a_node.path.parts
+      for depth in range(1, len(parts)):
+        listings.setdefault(parts[:depth], {})
+      listings[parts[:-1]][parts[-1]] = Entry(
+          a_node.fingerprint, self._add(a_node.stac))
+
+    # Children have longer keys, so they are hashed before their parents.
+    for parts in sorted(listings, key=len, reverse=True):
+      listing = dict(sorted(listings[parts].items()))
+      entry = Entry(listing_hash(listing), self._add(listing))
+      self.listing_records.add(entry.record)
+      if parts:
+        listings[parts[:-1]][parts[-1] + SEPARATOR] = entry
+      else:
+        self.root = entry
+
+  def _add(self, record: Union[Listing, dict[str, object]]) -> int:
+    self.records.append(record)
+    return len(self.records) - 1
+
+  def _listing(self, record: int) -> Listing:
+    return self.records[record]
+
+  def _stac(self, record: int) -> dict[str, object]:
+    return self.records[record]
+
+
+def encode(snapshot: MemorySnapshot) -> bytes:
+  """Returns the snapshot in the file layout."""
+  offsets = array.array('Q', [0])
+  records = []
+  for index, record in enumerate(snapshot.records):
+    if index in snapshot.listing_records:
+      record = {name: [entry.hash, entry.record]
+                for name, entry in record.items()}
+    data = canonical.dumps(record)
+    records.append(data)
+    offsets.append(offsets[-1] + len(data))
+  metadata = {
+      'version': VERSION,
+      'root': [snapshot.root.hash, snapshot.root.record],
+  }
+  return array_file.encode(
+      MAGIC, metadata,
+      {OFFSETS: offsets, DATA: memoryview(b''.join(records))})
+
+
+def save(snapshot: MemorySnapshot, path: pathlib.Path) -> None:
+  path.write_bytes(encode(snapshot))
+
+
+class FileSnapshot(Snapshot):
+  """A Snapshot in the file layout that decodes records as they are used."""
+
+  def __init__(
+      self, metadata: dict[str, object], arrays: dict[str, array_file.Array],
+      stats: Optional[Stats] = None):
+    super().__init__(stats)
+    if metadata.get('version') != VERSION:
+      raise ValueError(
+          f'Unsupported snapshot version: {metadata.get("version")}')
+    self.root = Entry(*metadata['root'])
+    self.offsets = arrays[OFFSETS]
+    self.data = arrays[DATA]
+
+  @classmethod
+  def decode(cls, buffer, stats: Optional[Stats] = None) -> 'FileSnapshot':
+    return cls(*array_file.decode(buffer, MAGIC), stats)
+
+  @classmethod
+  def load(
+      cls, path: pathlib.Path, stats: Optional[Stats] = None
+  ) -> 'FileSnapshot':
+    return cls(*array_file.load(path, MAGIC), stats)
+
+  def _json(self, record: int) -> object:
+    return json.loads(
+        bytes(self.data[self.offsets[record]:self.offsets[record + 1]]))
+
+  def _listing(self, record: int) -> Listing:
+    return {
+        name: Entry(*value) for name, value in self._json(record).items()}
+
+  def _stac(self, record: int) -> dict[str, object]:
+    return self._json(record)
+
+
+def is_snapshot_file(path: pathlib.Path) -> bool:
+  if not path.is_file():
+    return False
+  with open(path, 'rb') as f:
+    return f.read(len(MAGIC)) == MAGIC
+
+
+def open_snapshot(
+    path: pathlib.Path, stats: Optional[Stats] = None) -> Snapshot:
+  """Returns the Snapshot of a snapshot file, directory, or archive."""
+  if is_snapshot_file(path):
+    return FileSnapshot.load(path, stats)
+  if not path.is_dir() and not archive.is_archive(path):
+    raise ValueError(f'Not a snapshot, directory, or archive: {path}')
+  return MemorySnapshot(stac.load(path), stats)
+
+
+class Change(str, enum.Enum):
+  ADDED = 'added'
+  REMOVED = 'removed'
+  CHANGED = 'changed'
+
+
+@dataclasses.dataclass
+class FieldDiff:
+  """One changed value in a node.
+
+  old is None if the value was added and new is None if it was removed.
+  """
+  # A json pointer (RFC 6901) to the value, like /summaries/eo:bands/0/name.
+  pointer: str
+  change: Change
+  old: object = None
+  new: object = None
+
+
+@dataclasses.dataclass
+class NodeDiff:
+  """A node that is only in one snapshot or differs between the two."""
+  path: str
+  id: str
+  change: Change
+  # For changed nodes, the values that differ in json pointer order.
+  fields: list[FieldDiff] = dataclasses.field(default_factory=list)
+
+
+def _escape(key: str) -> str:
+  return key.replace('~', '~0').replace('/', '~1')
+
+
+def field_diffs(
+    old: object, new: object, pointer: str = '') -> Iterator[FieldDiff]:
+  """Yields the differences between two json values.
+
+  Objects are compared key by key and arrays of the same length item by
+  item.  Anything else that differs is one change of the whole value.
+  """
+  if old == new and type(old) is type(new):
+    return
+  if isinstance(old, dict) and isinstance(new, dict):
+    for key in sorted(old.keys() | new.keys()):
+      child = f'{pointer}/{_escape(key)}'
+      if key not in new:
+        yield FieldDiff(child, Change.REMOVED, old=old[key])
+      elif key not in old:
+        yield FieldDiff(child, Change.ADDED, new=new[key])
+      else:
+        yield from field_diffs(old[key], new[key], child)
+  elif (isinstance(old, list) and isinstance(new, list) and
+        len(old) == len(new)):
+    for index, (old_item, new_item) in enumerate(zip(old, new)):
+      yield from field_diffs(old_item, new_item, f'{pointer}/{index}')
+  elif old != new or isinstance(old, bool) != isinstance(new, bool):
+    yield FieldDiff(pointer, Change.CHANGED, old=old, new=new)
+
+
+def _dataset_id(stac_data: dict[str, object], path: str) -> str:
+  return stac_data.get(stac.ID, stac.UNKNOWN_ID + path)
+
+
+def _one_side(
+    snapshot: Snapshot, entry: Entry, path: str,
+    change: Change) -> Iterator[NodeDiff]:
+  """Yields every node under entry as added or removed."""
+  if not is_directory(path) and path:
+    yield NodeDiff(path, _dataset_id(snapshot.stac(entry), path), change)
+    return
+  for name, child in snapshot.listing(entry).items():
+    yield from _one_side(snapshot, child, path + name, change)
+
+
+def _diff(
+    old: Snapshot, old_entry: Entry, new: Snapshot, new_entry: Entry,
+    path: str) -> Iterator[NodeDiff]:
+  if old_entry.hash == new_entry.hash:
+    return
+  if path and not is_directory(path):
+    old_stac = old.stac(old_entry)
+    new_stac = new.stac(new_entry)
+    yield NodeDiff(
+        path, _dataset_id(new_stac, path), Change.CHANGED,
+        list(field_diffs(old_stac, new_stac)))
+    return
+
+  old_listing = old.listing(old_entry)
+  new_listing = new.listing(new_entry)
+  for name in sorted(old_listing.keys() | new_listing.keys()):
+    if name not in new_listing:
+      yield from _one_side(old, old_listing[name], path + name, Change.REMOVED)
+    elif name not in old_listing:
+      yield from _one_side(new, new_listing[name], path + name, Change.ADDED)
+    else:
+      yield from _diff(
+          old, old_listing[name], new, new_listing[name], path + name)
+
+
+def diff(old: Snapshot, new: Snapshot) -> Iterator[NodeDiff]:
+  """Yields the nodes that differ between two snapshots in path order.
+
+  Only the directories whose hashes differ are listed, so unchanged parts of
+  the catalog are not read.
+  """
+  yield from _diff(old, old.root, new, new.root, '')
+
+
+def to_json(node_diff: NodeDiff) -> dict[str, object]:
+  result = {
+      'path': node_diff.path,
+      'id': node_diff.id,
+      'change': node_diff.change.value,
+  }
+  if node_diff.fields:
+    fields = []
+    for field in node_diff.fields:
+      field_json = {'pointer': field.pointer, 'change': field.change.value}
+      if field.change != Change.ADDED:
+        field_json['old'] = field.old
+      if field.change != Change.REMOVED:
+        field_json['new'] = field.new
+      fields.append(field_json)
+    result['fields'] = fields
+  return result
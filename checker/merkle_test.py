@@ -0,0 +1,185 @@
+"""Tests for merkle."""
+
+import copy
+import json
+import pathlib
+import tempfile
+
+from checker import merkle
+from checker import stac
+import unittest
+
+ADDED = merkle.Change.ADDED
+REMOVED = merkle.Change.REMOVED
+CHANGED = merkle.Change.CHANGED
+
+
+def catalog_files(provider_count: int) -> dict[str, dict[str, object]]:
+  files = {'catalog.json': {'type': 'Catalog', 'id': 'GEE_catalog'}}
+  for provider in range(provider_count):
+    name = f'P{provider}'
+    files[f'{name}/catalog.json'] = {'type': 'Catalog', 'id': name}
+    for dataset in range(3):
+      files[f'{name}/{name}_D{dataset}.json'] = {
+          'type': 'Collection',
+          'id': f'{name}/D{dataset}',
+          'gee:type': 'image',
+          'title': f'Dataset {dataset}',
+          'summaries': {'eo:bands': [{'name': 'B1'}, {'name': 'B2'}]},
+      }
+  return files
+
+
+def make_nodes(files: dict[str, dict[str, object]]) -> list[stac.Node]:
+  return [
+      stac.Node(
+          data['id'], pathlib.Path(path), data['type'],
+          stac.GeeType(data.get('gee:type', 'none')), data)
+      for path, data in files.items()]
+
+
+def snapshot(
+    files: dict[str, dict[str, object]]) -> merkle.MemorySnapshot:
+  return merkle.MemorySnapshot(make_nodes(files))
+
+
+class SnapshotTest(unittest.TestCase):
+
+  def test_same_content_same_root(self):
+    files = catalog_files(3)
+    reordered = dict(reversed(files.items()))
+    self.assertEqual(snapshot(files).root, snapshot(reordered).root)
+
+  def test_root_covers_children(self):
+    files = catalog_files(3)
+    changed = copy.deepcopy(files)
+    changed['P1/P1_D2.json']['title'] = 'New'
+    old = snapshot(files)
+    new = snapshot(changed)
+    self.assertNotEqual(old.root.hash, new.root.hash)
+    old_listing = old.listing(old.root)
+    new_listing = new.listing(new.root)
+    self.assertEqual(old_listing['P0/'].hash, new_listing['P0/'].hash)
+    self.assertNotEqual(old_listing['P1/'].hash, new_listing['P1/'].hash)
+
+  def test_listing(self):
+    memory = snapshot(catalog_files(1))
+    listing = memory.listing(memory.root)
+    self.assertEqual(['P0/', 'catalog.json'], list(listing))
+    self.assertEqual(memory.root.hash, merkle.listing_hash(listing))
+
+  def test_file_round_trip(self):
+    memory = snapshot(catalog_files(2))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'build.snapshot'
+      merkle.save(memory, path)
+      self.assertTrue(merkle.is_snapshot_file(path))
+      loaded = merkle.open_snapshot(path)
+      self.assertIsInstance(loaded, merkle.FileSnapshot)
+      self.assertEqual(memory.root, loaded.root)
+      self.assertEqual(memory.listing(memory.root), loaded.listing(loaded.root))
+      entry = loaded.listing(loaded.listing(loaded.root)['P1/'])['P1_D0.json']
+      self.assertEqual(catalog_files(2)['P1/P1_D0.json'], loaded.stac(entry))
+      self.assertEqual([], list(merkle.diff(memory, loaded)))
+
+  def test_bad_magic(self):
+    with self.assertRaises(ValueError):
+      merkle.FileSnapshot.decode(b'NOTMERKL' + bytes(16))
+
+  def test_open_directory(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      root = pathlib.Path(tmp_dir)
+      for name, data in catalog_files(2).items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2))
+      self.assertEqual(
+          snapshot(catalog_files(2)).root, merkle.open_snapshot(root).root)
+      with self.assertRaises(ValueError):
+        merkle.open_snapshot(root / 'catalog.json')
+
+
+class FieldDiffsTest(unittest.TestCase):
+
+  def test_same(self):
+    self.assertEqual([], list(merkle.field_diffs({'a': [1, 2.0]}, {
+        'a': [1.0, 2]})))
+
+  def test_nested(self):
+    old = {'a': {'b': 1, 'c/d': 2}, 'e': [1, 2], 'f': [1], 'g': True}
+    new = {'a': {'b': 2, 'x': 3}, 'e': [1, 3], 'f': [1, 2], 'g': 1}
+    self.assertEqual([
+        merkle.FieldDiff('/a/b', CHANGED, 1, 2),
+        merkle.FieldDiff('/a/c~1d', REMOVED, old=2),
+        merkle.FieldDiff('/a/x', ADDED, new=3),
+        merkle.FieldDiff('/e/1', CHANGED, 2, 3),
+        merkle.FieldDiff('/f', CHANGED, [1], [1, 2]),
+        merkle.FieldDiff('/g', CHANGED, True, 1),
+    ], list(merkle.field_diffs(old, new)))
+
+
+class DiffTest(unittest.TestCase):
+
+  def test_no_changes(self):
+    stats = merkle.Stats()
+    old = merkle.MemorySnapshot(make_nodes(catalog_files(5)), stats)
+    new = merkle.MemorySnapshot(make_nodes(catalog_files(5)), stats)
+    self.assertEqual([], list(merkle.diff(old, new)))
+    self.assertEqual(merkle.Stats(), stats)
+
+  def test_changes(self):
+    files = catalog_files(3)
+    changed = copy.deepcopy(files)
+    changed['P1/P1_D2.json']['summaries']['eo:bands'][1]['name'] = 'B3'
+    del changed['P2/P2_D0.json']
+    changed['P3/catalog.json'] = {'type': 'Catalog', 'id': 'P3'}
+    self.assertEqual([
+        merkle.NodeDiff('P1/P1_D2.json', 'P1/D2', CHANGED, [
+            merkle.FieldDiff('/summaries/eo:bands/1/name', CHANGED, 'B2', 'B3'),
+        ]),
+        merkle.NodeDiff('P2/P2_D0.json', 'P2/D0', REMOVED),
+        merkle.NodeDiff('P3/catalog.json', 'P3', ADDED),
+    ], list(merkle.diff(snapshot(files), snapshot(changed))))
+
+  def test_reads_only_changed_subtrees(self):
+    files = catalog_files(50)
+    changed = copy.deepcopy(files)
+    changed['P7/P7_D1.json']['title'] = 'New'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      old_path = pathlib.Path(tmp_dir) / 'old'
+      new_path = pathlib.Path(tmp_dir) / 'new'
+      merkle.save(snapshot(files), old_path)
+      merkle.save(snapshot(changed), new_path)
+      stats = merkle.Stats()
+      old = merkle.open_snapshot(old_path, stats)
+      new = merkle.open_snapshot(new_path, stats)
+      diffs = list(merkle.diff(old, new))
+    self.assertEqual(
+        [merkle.FieldDiff('/title', CHANGED, 'Dataset 1', 'New')],
+        diffs[0].fields)
+    # The root and P7/ on each side, then the changed node on each side.
+    self.assertEqual(merkle.Stats(listings_read=4, nodes_read=2), stats)
+
+  def test_to_json(self):
+    node_diff = merkle.NodeDiff('A/A_B.json', 'A/B', CHANGED, [
+        merkle.FieldDiff('/a', ADDED, new=None),
+        merkle.FieldDiff('/b', REMOVED, old=1),
+        merkle.FieldDiff('/c', CHANGED, 1, 2),
+    ])
+    self.assertEqual({
+        'path': 'A/A_B.json',
+        'id': 'A/B',
+        'change': 'changed',
+        'fields': [
+            {'pointer': '/a', 'change': 'added', 'new': None},
+            {'pointer': '/b', 'change': 'removed', 'old': 1},
+            {'pointer': '/c', 'change': 'changed', 'old': 1, 'new': 2},
+        ],
+    }, merkle.to_json(node_diff))
+    self.assertEqual(
+        {'path': 'A.json', 'id': 'A', 'change': 'added'},
+        merkle.to_json(merkle.NodeDiff('A.json', 'A', ADDED)))
+
+
+if __name__ == '__main__':
+  unittest.main()
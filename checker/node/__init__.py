@@ -1,17 +1,21 @@
 """Runs all the single node checks on one Node."""
 
-from typing import Iterator
+from typing import Iterator, Optional
 
 from checker import stac
+from checker.node import bands
 from checker.node import description
 from checker.node import extensions
 from checker.node import extent
+from checker.node import gee_classes
 from checker.node import id_field
 from checker.node import keywords
 from checker.node import license_field
 from checker.node import required
+from checker.node import size_budget
 from checker.node import stac_version
 from checker.node import title
+from checker.node import visualizations
 
 _CHECKS = [
     required.Check,
@@ -23,6 +27,10 @@ _CHECKS = [
     title.Check,
     description.Check,
     license_field.Check,
+    gee_classes.Check,
+    bands.Check,
+    visualizations.Check,
+    size_budget.Check,
 ]
 
 
@@ -34,3 +42,19 @@ def run_checks(
     if checks and check.name not in checks:
       continue
     yield from check.run(node)
+
+
+def fields(checks: list[str]) -> Optional[frozenset[str]]:
+  """Returns the fields the checks read or None for all fields."""
+  return stac.fields_read(
+      check for check in _CHECKS if not checks or check.name in checks)
+
+
+def summaries(checks: list[str]) -> Iterator[str]:
+  """Yields the end of run summary lines from the checks that were run."""
+  for check in _CHECKS:
+    if checks and check.name not in checks:
+      continue
+    summary = check.summary()
+    if summary:
+      yield summary
@@ -0,0 +1,119 @@
+"""Checks the eo:bands and gee:visualizations blocks in summaries.
+
+eo:bands must be a list of dicts, each with:
+- name: a unique, non-empty string
+- description: optional, a string
+- center_wavelength, full_width_half_max, gee:offset, gee:scale, gsd: optional
+  numbers
+
+gee:visualizations must be a list of dicts, each with a non-empty string
+display_name.
+
+Families of collections, such as MODIS and Landsat, build these blocks from
+shared templates, so many nodes have identical blocks.  The messages for each
+block are kept in a fingerprint_cache and only computed the first time the
+block is seen.  The issues for later nodes with the same block are rebuilt from
+those messages.
+"""
+
+from typing import Iterator
+
+from checker import fingerprint_cache
+from checker import stac
+
+SUMMARIES = 'summaries'
+EO_BANDS = 'eo:bands'
+GEE_VISUALIZATIONS = 'gee:visualizations'
+
+DESCRIPTION = 'description'
+DISPLAY_NAME = 'display_name'
+NAME = 'name'
+NUMBER_FIELDS = (
+    'center_wavelength', 'full_width_half_max', 'gee:offset', 'gee:scale',
+    'gsd')
+
+Message = tuple[str, stac.IssueLevel]
+
+
+def is_number(value: object) -> bool:
+  return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_bands(bands: object) -> Iterator[Message]:
+  """Yields the messages for one eo:bands block."""
+  if not isinstance(bands, list):
+    yield f'"{EO_BANDS}" must be a list', stac.IssueLevel.ERROR
+    return
+
+  names = set()
+  for band in bands:
+    if not isinstance(band, dict):
+      yield f'band must be a dict: {band}', stac.IssueLevel.ERROR
+      continue
+
+    name = band.get(NAME)
+    if not isinstance(name, str) or not name:
+      yield (f'band {NAME} must be a non-empty str: {name}',
+             stac.IssueLevel.ERROR)
+      continue
+    if name in names:
+      yield f'Duplicate band {NAME}: "{name}"', stac.IssueLevel.ERROR
+    names.add(name)
+
+    if DESCRIPTION in band and not isinstance(band[DESCRIPTION], str):
+      yield f'band "{name}" {DESCRIPTION} must be a str', stac.IssueLevel.ERROR
+
+    for field in NUMBER_FIELDS:
+      if field in band and not is_number(band[field]):
+        yield (f'band "{name}" {field} must be a number: {band[field]}',
+               stac.IssueLevel.ERROR)
+
+
+def check_visualizations(visualizations: object) -> Iterator[Message]:
+  """Yields the messages for one gee:visualizations block."""
+  if not isinstance(visualizations, list):
+    yield f'"{GEE_VISUALIZATIONS}" must be a list', stac.IssueLevel.ERROR
+    return
+
+  for visualization in visualizations:
+    if not isinstance(visualization, dict):
+      yield (f'visualization must be a dict: {visualization}',
+             stac.IssueLevel.ERROR)
+      continue
+    display_name = visualization.get(DISPLAY_NAME)
+    if not isinstance(display_name, str) or not display_name:
+      yield (f'visualization {DISPLAY_NAME} must be a non-empty str: '
+             f'{display_name}', stac.IssueLevel.ERROR)
+
+
+class Check(stac.NodeCheck):
+  """Checks eo:bands and gee:visualizations, once per distinct block."""
+  name = 'bands'
+  fields = frozenset({SUMMARIES})
+
+  cache: fingerprint_cache.Cache[list[Message]] = fingerprint_cache.Cache()
+
+  @classmethod
+  def reset(cls) -> None:
+    cls.cache = fingerprint_cache.Cache()
+
+  @classmethod
+  def messages(cls, field: str, block: object) -> list[Message]:
+    check = check_bands if field == EO_BANDS else check_visualizations
+    return cls.cache.get(block, lambda: list(check(block)), field)
+
+  @classmethod
+  def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
+    summaries = node.stac.get(SUMMARIES)
+    if not isinstance(summaries, dict):
+      return
+
+    for field in (EO_BANDS, GEE_VISUALIZATIONS):
+      if field not in summaries:
+        continue
+      for message, level in cls.messages(field, summaries[field]):
+        yield cls.new_issue(node, message, level)
+
+  @classmethod
+  def summary(cls) -> str:
+    return cls.cache.summary(cls.name)
@@ -0,0 +1,106 @@
+"""Tests for bands."""
+
+import pathlib
+
+from checker import stac
+from checker.node import bands
+import unittest
+
+Check = bands.Check
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+ID = 'a/collection'
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+BANDS = [
+    {'name': 'B1', 'description': 'Blue', 'center_wavelength': 0.49,
+     'gsd': 30, 'gee:scale': 0.0001, 'gee:offset': -0.2},
+    {'name': 'B2'},
+]
+VISUALIZATIONS = [{'display_name': 'True color'}]
+
+
+def node_with_summaries(summaries, dataset_id: str = ID) -> stac.Node:
+  stac_data = {'summaries': summaries}
+  return stac.Node(dataset_id, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+class BandsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    Check.reset()
+
+  def test_valid(self):
+    node = node_with_summaries(
+        {'eo:bands': BANDS, 'gee:visualizations': VISUALIZATIONS})
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_no_summaries(self):
+    node = stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {})
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_not_lists(self):
+    node = node_with_summaries({'eo:bands': {}, 'gee:visualizations': 'a'})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, '"eo:bands" must be a list'),
+        Check.new_issue(node, '"gee:visualizations" must be a list'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_bad_bands(self):
+    node = node_with_summaries({'eo:bands': [
+        'B0',
+        {'description': 'no name'},
+        {'name': 'B1', 'description': 1, 'gsd': '30', 'gee:scale': True},
+        {'name': 'B1'},
+    ]})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, 'band must be a dict: B0'),
+        Check.new_issue(node, 'band name must be a non-empty str: None'),
+        Check.new_issue(node, 'band "B1" description must be a str'),
+        Check.new_issue(node, 'band "B1" gee:scale must be a number: True'),
+        Check.new_issue(node, 'band "B1" gsd must be a number: 30'),
+        Check.new_issue(node, 'Duplicate band name: "B1"'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_bad_visualizations(self):
+    node = node_with_summaries(
+        {'gee:visualizations': [1, {'display_name': ''}]})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, 'visualization must be a dict: 1'),
+        Check.new_issue(
+            node, 'visualization display_name must be a non-empty str: '),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_cache_fans_out_issues(self):
+    bad_bands = [{'name': 'B1'}, {'name': 'B1'}]
+    node_a = node_with_summaries({'eo:bands': bad_bands}, 'a/first')
+    # Same content with a different key order.
+    node_b = node_with_summaries(
+        {'eo:bands': [dict(reversed(band.items())) for band in bad_bands]},
+        'a/second')
+
+    issues_a = list(Check.run(node_a))
+    issues_b = list(Check.run(node_b))
+
+    message = 'Duplicate band name: "B1"'
+    self.assertEqual([Check.new_issue(node_a, message)], issues_a)
+    self.assertEqual([Check.new_issue(node_b, message)], issues_b)
+    self.assertEqual(1, Check.cache.stats.hits)
+    self.assertEqual(1, Check.cache.stats.misses)
+    self.assertEqual(
+        'bands cache: 1 hits, 1 misses, 50.0% hit rate', Check.summary())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -8,7 +8,7 @@ Possible additions:
 - Start with a capital letter
 - End with a '.'
 
-TODO(schwehr): Check the markdown.
+The markdown is checked by checker/tree/markdown.py.
 """
 
 from typing import Iterator
@@ -23,6 +23,7 @@ MAX_LEN = 8000
 class Check(stac.NodeCheck):
   """Checks the description field."""
   name = 'description'
+  fields = frozenset({DESCRIPTION})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
@@ -23,6 +23,7 @@ EXTENSIONS = [
 class Check(stac.NodeCheck):
   """Checks the stac_extensions field."""
   name = 'extensions'
+  fields = frozenset({STAC_EXTENSIONS})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
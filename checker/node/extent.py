@@ -39,6 +39,7 @@ ISO8601 = '%Y-%m-%dT%H:%M:%S%z'
 class Check(stac.NodeCheck):
   """Checks the extent field."""
   name = 'extent'
+  fields = frozenset({EXTENT})
 
   @classmethod
   def check_spatial(
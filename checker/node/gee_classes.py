@@ -0,0 +1,153 @@
+"""Checks the gee:classes tables in summaries.eo:bands.
+
+A band may have a table of classes.  Each class must have:
+- value: an int
+- description: a non-empty string
+- color: optional, a 6 digit hex color without a leading '#' or a color name
+
+The values must be unique and sorted in increasing order.
+
+Some tables, such as the LANDFIRE ones, have thousands of entries, so each
+table is first split into columns and each column is checked with a single
+whole-column operation.  Walking the table class by class only happens after a
+column fails, to find the entries to report.
+"""
+
+import collections
+import re
+from typing import Iterator
+
+from checker import stac
+
+SUMMARIES = 'summaries'
+EO_BANDS = 'eo:bands'
+GEE_CLASSES = 'gee:classes'
+NAME = 'name'
+
+COLOR = 'color'
+DESCRIPTION = 'description'
+VALUE = 'value'
+REQUIRED_FIELDS = frozenset({DESCRIPTION, VALUE})
+FIELDS = frozenset({COLOR, DESCRIPTION, VALUE})
+
+# Color names accepted by Earth Engine palettes that are used in the catalog.
+COLOR_NAMES = frozenset({
+    'black', 'blue', 'brown', 'darkblue', 'darkorange', 'darkred',
+    'darkslategray', 'darkviolet', 'ghostwhite', 'green', 'orange', 'purple',
+    'red', 'slategray', 'violet', 'white', 'yellow',
+})
+
+HEX_COLOR = '[0-9a-fA-F]{6}'
+_HEX_COLOR_RE = re.compile(HEX_COLOR)
+
+
+def columns(
+    classes: list[dict[str, object]]
+) -> tuple[list[object], list[object], list[object]]:
+  """Returns the value, description, and color columns of a classes table.
+
+  Classes without a color are left out of the color column.
+  """
+  values = [a_class[VALUE] for a_class in classes]
+  descriptions = [a_class[DESCRIPTION] for a_class in classes]
+  colors = [a_class[COLOR] for a_class in classes if COLOR in a_class]
+  return values, descriptions, colors
+
+
+def valid_color(color: object) -> bool:
+  if not isinstance(color, str):
+    return False
+  return color in COLOR_NAMES or bool(_HEX_COLOR_RE.fullmatch(color))
+
+
+def valid_colors(colors: list[object]) -> bool:
+  """Returns True if every color is a hex color or a known color name."""
+  # Each color is matched on its own, since a color with a newline in it
+  # would pass if the column were joined into one string.
+  fullmatch = _HEX_COLOR_RE.fullmatch
+  return all(
+      isinstance(color, str) and (color in COLOR_NAMES or fullmatch(color))
+      for color in colors)
+
+
+class Check(stac.NodeCheck):
+  """Checks the gee:classes tables."""
+  name = 'gee_classes'
+  fields = frozenset({SUMMARIES})
+
+  @classmethod
+  def check_classes(
+      cls, node: stac.Node, band_name: str,
+      classes: object) -> Iterator[stac.Issue]:
+    prefix = f'{GEE_CLASSES} of band "{band_name}"'
+    if not isinstance(classes, list):
+      yield cls.new_issue(node, f'{prefix} must be a list')
+      return
+
+    if not classes:
+      yield cls.new_issue(node, f'{prefix} must not be empty')
+      return
+
+    if not all(isinstance(a_class, dict) for a_class in classes):
+      yield cls.new_issue(node, f'{prefix} entries must be dicts')
+      return
+
+    field_problem = False
+    for a_class in classes:
+      keys = a_class.keys()
+      if REQUIRED_FIELDS <= keys <= FIELDS:
+        continue
+      field_problem = True
+      missing = sorted(REQUIRED_FIELDS.difference(keys))
+      extra = sorted(set(keys).difference(FIELDS))
+      if missing:
+        yield cls.new_issue(
+            node, f'{prefix} entry missing fields: {", ".join(missing)}')
+      if extra:
+        yield cls.new_issue(
+            node, f'{prefix} entry has unexpected fields: {", ".join(extra)}')
+    if field_problem:
+      return
+
+    values, descriptions, colors = columns(classes)
+
+    # bool is a subclass of int, but True is not a valid class value.
+    if {type(value) for value in values} != {int}:
+      for value in values:
+        if type(value) is not int:  # pylint: disable=unidiomatic-typecheck
+          yield cls.new_issue(node, f'{prefix} value must be an int: {value}')
+    elif len(set(values)) != len(values):
+      counts = collections.Counter(values)
+      duplicates = sorted(value for value, count in counts.items() if count > 1)
+      yield cls.new_issue(node, f'{prefix} has duplicate values: {duplicates}')
+    elif values != sorted(values):
+      yield cls.new_issue(node, f'{prefix} values must be sorted')
+
+    if not all(isinstance(d, str) and d.strip() for d in descriptions):
+      for value, description in zip(values, descriptions):
+        if not isinstance(description, str):
+          yield cls.new_issue(
+              node, f'{prefix} description must be a str for value: {value}')
+        elif not description.strip():
+          yield cls.new_issue(
+              node, f'{prefix} has an empty description for value: {value}')
+
+    if not valid_colors(colors):
+      for color in colors:
+        if not valid_color(color):
+          yield cls.new_issue(node, f'{prefix} has an invalid color: "{color}"')
+
+  @classmethod
+  def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
+    summaries = node.stac.get(SUMMARIES)
+    if not isinstance(summaries, dict):
+      return
+
+    bands = summaries.get(EO_BANDS)
+    if not isinstance(bands, list):
+      return
+
+    for band in bands:
+      if not isinstance(band, dict) or GEE_CLASSES not in band:
+        continue
+      yield from cls.check_classes(node, band.get(NAME), band[GEE_CLASSES])
@@ -0,0 +1,161 @@
+"""Tests for gee_classes."""
+
+import pathlib
+import time
+
+from checker import stac
+from checker.node import gee_classes
+import unittest
+
+Check = gee_classes.Check
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+ID = 'a/collection'
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+BAND = 'landcover'
+PREFIX = 'gee:classes of band "landcover"'
+
+
+def node_with_classes(classes) -> stac.Node:
+  stac_data = {'summaries': {'eo:bands': [
+      {'name': 'no_classes'},
+      {'name': BAND, 'gee:classes': classes}]}}
+  return stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+class GeeClassesTest(unittest.TestCase):
+
+  def test_valid(self):
+    node = node_with_classes([
+        {'value': 1, 'color': '00aaFF', 'description': 'Water'},
+        {'value': 2, 'color': 'black', 'description': 'Shadow'},
+        {'value': 5, 'description': 'No color'},
+    ])
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_no_summaries(self):
+    node = stac.Node(ID, FILE_PATH, CATALOG, IMAGE, {})
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_not_a_list(self):
+    node = node_with_classes({'value': 1})
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} must be a list')]
+    self.assertEqual(expect, issues)
+
+  def test_empty(self):
+    node = node_with_classes([])
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} must not be empty')]
+    self.assertEqual(expect, issues)
+
+  def test_not_dicts(self):
+    node = node_with_classes([1])
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} entries must be dicts')]
+    self.assertEqual(expect, issues)
+
+  def test_fields(self):
+    node = node_with_classes([
+        {'value': 1, 'color': '000000', 'description': 'a', 'risk': 'high'},
+        {'color': '000000'},
+    ])
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} entry has unexpected fields: risk'),
+        Check.new_issue(
+            node, f'{PREFIX} entry missing fields: description, value'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_value_not_int(self):
+    node = node_with_classes([
+        {'value': 1, 'description': 'a'},
+        {'value': '2', 'description': 'b'},
+        {'value': True, 'description': 'c'},
+    ])
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} value must be an int: 2'),
+        Check.new_issue(node, f'{PREFIX} value must be an int: True'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_duplicate_values(self):
+    node = node_with_classes([
+        {'value': 3, 'description': 'a'},
+        {'value': 1, 'description': 'b'},
+        {'value': 3, 'description': 'c'},
+    ])
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} has duplicate values: [3]')]
+    self.assertEqual(expect, issues)
+
+  def test_not_sorted(self):
+    node = node_with_classes([
+        {'value': 2, 'description': 'a'},
+        {'value': 1, 'description': 'b'},
+    ])
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} values must be sorted')]
+    self.assertEqual(expect, issues)
+
+  def test_bad_descriptions(self):
+    node = node_with_classes([
+        {'value': 1, 'description': ' '},
+        {'value': 2, 'description': 3},
+        {'value': 4, 'description': 'fine'},
+    ])
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} has an empty description for value: 1'),
+        Check.new_issue(
+            node, f'{PREFIX} description must be a str for value: 2'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_bad_colors(self):
+    node = node_with_classes([
+        {'value': 1, 'color': '#000000', 'description': 'a'},
+        {'value': 2, 'color': 'abcdeg', 'description': 'b'},
+        {'value': 3, 'color': 'notacolor', 'description': 'c'},
+        {'value': 4, 'color': 123456, 'description': 'd'},
+        {'value': 5, 'color': 'abcdef', 'description': 'e'},
+    ])
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} has an invalid color: "#000000"'),
+        Check.new_issue(node, f'{PREFIX} has an invalid color: "abcdeg"'),
+        Check.new_issue(node, f'{PREFIX} has an invalid color: "notacolor"'),
+        Check.new_issue(node, f'{PREFIX} has an invalid color: "123456"'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_valid_colors(self):
+    self.assertTrue(gee_classes.valid_colors([]))
+    self.assertTrue(gee_classes.valid_colors(['white', 'ABCDEF', '012345']))
+    self.assertFalse(gee_classes.valid_colors(['white', 'ABCDEF\n']))
+    self.assertFalse(gee_classes.valid_colors(['ABCDEF', None]))
+    self.assertFalse(gee_classes.valid_colors(['ff0000\n00ff00']))
+    self.assertFalse(gee_classes.valid_colors(['ABCDEF', 'ff0000\n00ff00']))
+
+  def test_large_table(self):
+    num_classes = 100_000
+    node = node_with_classes([
+        {'value': i, 'color': f'{i:06x}', 'description': f'class {i}'}
+        for i in range(num_classes)])
+    start = time.perf_counter()
+    issues = list(Check.run(node))
+    elapsed = time.perf_counter() - start
+    self.assertEqual(0, len(issues))
+    # Much larger than the largest catalog table and still well under 1 second.
+    self.assertLess(elapsed, 1.0)
+
+
+if __name__ == '__main__':
+  unittest.main()
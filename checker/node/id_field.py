@@ -20,6 +20,7 @@ MAX_COLLECTION_LEN = 7
 class Check(stac.NodeCheck):
   """Checks the id field."""
   name = 'id'
+  fields = frozenset({ID})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
@@ -24,6 +24,7 @@ EXCEPTIONS = frozenset({
 class Check(stac.NodeCheck):
   """Checks the keywords field."""
   name = 'keywords'
+  fields = frozenset({KEYWORDS})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
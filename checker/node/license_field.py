@@ -32,11 +32,20 @@ KNOWN_LICENSES = frozenset({
     'OGL-Canada-2.0',
     'PDDL-1.0',
 })
+# Licenses that start with this do not allow commercial use.
+NON_COMMERCIAL_PREFIX = 'CC-BY-NC'
+
+
+def is_non_commercial(node: stac.Node) -> bool:
+  license_field = node.stac.get(LICENSE)
+  return (isinstance(license_field, str) and
+          license_field.startswith(NON_COMMERCIAL_PREFIX))
 
 
 class Check(stac.NodeCheck):
   """Checks the license field."""
   name = 'license'
+  fields = frozenset({LICENSE})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
@@ -57,6 +57,14 @@ class LicenseFieldTest(unittest.TestCase):
         Check.new_issue(self.node, f'Unknown license: "{invalid_license}"')]
     self.assertEqual(expect, issues)
 
+  def test_is_non_commercial(self):
+    self.node.stac = {LICENSE: 'CC-BY-NC-SA-4.0'}
+    self.assertTrue(license_field.is_non_commercial(self.node))
+    self.node.stac = {LICENSE: 'CC-BY-4.0'}
+    self.assertFalse(license_field.is_non_commercial(self.node))
+    self.node.stac = {LICENSE: NOT_A_STR}
+    self.assertFalse(license_field.is_non_commercial(self.node))
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -34,10 +34,12 @@ COLLECTION_FIELDS = frozenset({
 class Check(stac.NodeCheck):
   """Checks the presence of required fields."""
   name = 'required'
+  # Only reads which fields are there, from Node.field_names.
+  fields = frozenset()
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
-    keys = set(node.stac)
+    keys = node.field_names()
     if node.type == stac.StacType.CATALOG:
       diff = sorted(CATALOG_FIELDS.difference(keys))
       if diff:
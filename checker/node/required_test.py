@@ -69,6 +69,13 @@ class CollectionTest(unittest.TestCase):
         Check.new_issue(self.node, 'Collection missing required fields: type')]
     self.assertEqual(expect, issues)
 
+  def test_fields_that_were_not_loaded(self):
+    full = {key: DOES_NOT_MATTER for key in COLLECTION_FIELDS}
+    self.node = stac.new_node(FILE_PATH, full, fields=Check.fields)
+    self.assertEqual({}, self.node.stac)
+    issues = list(Check.run(self.node))
+    self.assertEqual(0, len(issues))
+
   def test_missing_all(self):
     self.node.stac = {}
     issues = list(Check.run(self.node))
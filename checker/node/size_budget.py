@@ -0,0 +1,29 @@
+"""Checks that each node fits the size budget once it is published.
+
+The publisher moves large arrays in summaries out into sidecar json files, so
+a node is only too big if its core document is still over sidecar.BUDGET
+bytes of canonical json after that.  Then the rest of the node, like a very
+long description or many links, has to be made smaller in the source.
+"""
+
+from typing import Iterator
+
+from checker import sidecar
+from checker import stac
+
+
+class Check(stac.NodeCheck):
+  """Checks the published size of a node."""
+  name = 'size_budget'
+  # Every field counts towards the size.
+  fields = None
+  budget = sidecar.BUDGET
+
+  @classmethod
+  def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
+    split = sidecar.split(node, cls.budget)
+    if split.core_size > cls.budget:
+      yield cls.new_issue(
+          node,
+          f'{split.core_size} bytes after moving {len(split.sidecars)} '
+          f'arrays to sidecars is over the budget of {cls.budget} bytes')
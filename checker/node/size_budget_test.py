@@ -0,0 +1,43 @@
+"""Tests for size_budget."""
+
+import pathlib
+
+from checker import sidecar
+from checker import stac
+from checker.node import size_budget
+import unittest
+
+Check = size_budget.Check
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+ID = 'a/collection'
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+class SizeBudgetTest(unittest.TestCase):
+
+  def test_small(self):
+    node = stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {'title': 'A title'})
+    self.assertEqual([], list(Check.run(node)))
+
+  def test_fits_after_split(self):
+    table = [{'value': i, 'description': f'Class {i}'} for i in range(20000)]
+    node = stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {
+        'summaries': {'eo:bands': [{'name': 'B1', 'gee:classes': table}]}})
+    self.assertGreater(sidecar.size(node.stac), sidecar.BUDGET)
+    self.assertEqual([], list(Check.run(node)))
+
+  def test_too_big(self):
+    node = stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {
+        'description': 'x' * sidecar.BUDGET})
+    issues = list(Check.run(node))
+    self.assertEqual(1, len(issues))
+    self.assertEqual('size_budget', issues[0].check_name)
+    self.assertIn(
+        f'over the budget of {sidecar.BUDGET} bytes', issues[0].message)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -19,6 +19,7 @@ STAC_VERSION_FIELD = 'stac_version'
 class Check(stac.NodeCheck):
   """Checks the stac_version field."""
   name = 'stac_version'
+  fields = frozenset({STAC_VERSION_FIELD})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
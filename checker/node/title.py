@@ -44,6 +44,7 @@ TITLE = 'title'
 class Check(stac.NodeCheck):
   """Checks the title field."""
   name = 'title'
+  fields = frozenset({TITLE})
 
   @classmethod
   def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
@@ -0,0 +1,101 @@
+"""Checks the band references in summaries.gee:visualizations.
+
+For each image visualization in summaries.gee:visualizations:
+- image_visualization.band_vis.bands must be a list of 1 or 3 band names
+- each band name must be a str and the name of a band in summaries.eo:bands
+- min, max, gain, bias, and gamma must be a list of length 1 or the same length
+  as bands
+
+The band names are collected into a set once per node, so checking all the
+visualizations of a node is linear in the number of bands plus the number of
+band references.
+
+Nodes without an eo:bands list are skipped.  Checking the structure of each
+block is done by the bands check.
+"""
+
+from typing import Iterator
+
+from checker import stac
+
+SUMMARIES = 'summaries'
+EO_BANDS = 'eo:bands'
+GEE_VISUALIZATIONS = 'gee:visualizations'
+
+BANDS = 'bands'
+BAND_VIS = 'band_vis'
+DISPLAY_NAME = 'display_name'
+IMAGE_VISUALIZATION = 'image_visualization'
+NAME = 'name'
+
+BAND_COUNTS = (1, 3)
+PER_BAND_FIELDS = ('min', 'max', 'gain', 'bias', 'gamma')
+
+
+class Check(stac.NodeCheck):
+  """Checks that visualizations refer to bands that exist."""
+  name = 'visualizations'
+  fields = frozenset({SUMMARIES})
+
+  @classmethod
+  def check_band_vis(
+      cls, node: stac.Node, band_names: set[str], display_name: str,
+      band_vis: object) -> Iterator[stac.Issue]:
+    prefix = f'visualization "{display_name}"'
+    if not isinstance(band_vis, dict):
+      yield cls.new_issue(node, f'{prefix} {BAND_VIS} must be a dict')
+      return
+
+    bands = band_vis.get(BANDS)
+    if not isinstance(bands, list):
+      yield cls.new_issue(node, f'{prefix} {BANDS} must be a list')
+      return
+
+    if len(bands) not in BAND_COUNTS:
+      yield cls.new_issue(
+          node, f'{prefix} must have 1 or 3 {BANDS}: {len(bands)}')
+
+    for band in bands:
+      if not isinstance(band, str):
+        yield cls.new_issue(node, f'{prefix} band must be a str: {band}')
+      elif band not in band_names:
+        yield cls.new_issue(node, f'{prefix} band not in {EO_BANDS}: {band}')
+
+    for field in PER_BAND_FIELDS:
+      if field not in band_vis:
+        continue
+      values = band_vis[field]
+      if not isinstance(values, list):
+        yield cls.new_issue(node, f'{prefix} {field} must be a list')
+      elif len(values) not in (1, len(bands)):
+        yield cls.new_issue(
+            node,
+            f'{prefix} {field} must have 1 or {len(bands)} values: '
+            f'{len(values)}')
+
+  @classmethod
+  def run(cls, node: stac.Node) -> Iterator[stac.Issue]:
+    summaries = node.stac.get(SUMMARIES)
+    if not isinstance(summaries, dict):
+      return
+
+    bands = summaries.get(EO_BANDS)
+    visualizations = summaries.get(GEE_VISUALIZATIONS)
+    if not isinstance(bands, list) or not isinstance(visualizations, list):
+      return
+
+    band_names = {
+        band[NAME] for band in bands
+        if isinstance(band, dict) and isinstance(band.get(NAME), str)}
+
+    for visualization in visualizations:
+      if not isinstance(visualization, dict):
+        continue
+      image_visualization = visualization.get(IMAGE_VISUALIZATION)
+      if not isinstance(image_visualization, dict):
+        continue
+      if BAND_VIS not in image_visualization:
+        continue
+      yield from cls.check_band_vis(
+          node, band_names, visualization.get(DISPLAY_NAME),
+          image_visualization[BAND_VIS])
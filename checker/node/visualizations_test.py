@@ -0,0 +1,113 @@
+"""Tests for visualizations."""
+
+import pathlib
+
+from checker import stac
+from checker.node import visualizations
+import unittest
+
+Check = visualizations.Check
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+ID = 'a/collection'
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+BANDS = [{'name': 'B1'}, {'name': 'B2'}, {'name': 'B3'}, {'name': 'QA'}]
+PREFIX = 'visualization "Test"'
+
+
+def node_with_band_vis(band_vis) -> stac.Node:
+  stac_data = {'summaries': {
+      'eo:bands': BANDS,
+      'gee:visualizations': [{
+          'display_name': 'Test',
+          'image_visualization': {'band_vis': band_vis}}]}}
+  return stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, stac_data)
+
+
+class VisualizationsTest(unittest.TestCase):
+
+  def test_valid(self):
+    node = node_with_band_vis({
+        'bands': ['B3', 'B2', 'B1'],
+        'min': [0], 'max': [1, 2, 3], 'gamma': [1.4]})
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_valid_single_band(self):
+    node = node_with_band_vis(
+        {'bands': ['QA'], 'min': [0], 'max': [1], 'palette': ['000000']})
+    issues = list(Check.run(node))
+    self.assertEqual(0, len(issues))
+
+  def test_skips(self):
+    nodes = [
+        stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {}),
+        stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {'summaries': {
+            'gee:visualizations': [
+                {'image_visualization': {'band_vis': {'bands': ['X']}}}]}}),
+        stac.Node(ID, FILE_PATH, COLLECTION, IMAGE, {'summaries': {
+            'eo:bands': BANDS,
+            'gee:visualizations': [
+                1,
+                {'display_name': 'table', 'table_visualization': {}},
+                {'display_name': 'empty', 'image_visualization': {}}]}}),
+    ]
+    for node in nodes:
+      issues = list(Check.run(node))
+      self.assertEqual(0, len(issues))
+
+  def test_band_vis_not_dict(self):
+    node = node_with_band_vis(['B1'])
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} band_vis must be a dict')]
+    self.assertEqual(expect, issues)
+
+  def test_bands_not_list(self):
+    node = node_with_band_vis({'bands': 'B1'})
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} bands must be a list')]
+    self.assertEqual(expect, issues)
+
+  def test_band_count(self):
+    node = node_with_band_vis({'bands': ['B1', 'B2']})
+    issues = list(Check.run(node))
+    expect = [Check.new_issue(node, f'{PREFIX} must have 1 or 3 bands: 2')]
+    self.assertEqual(expect, issues)
+
+  def test_unknown_band(self):
+    node = node_with_band_vis({'bands': ['B1', 'B9', 'b2']})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} band not in eo:bands: B9'),
+        Check.new_issue(node, f'{PREFIX} band not in eo:bands: b2'),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_band_not_str(self):
+    node = node_with_band_vis({'bands': [{'name': 'B1'}, ['B2'], 'B3']})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f"{PREFIX} band must be a str: {{'name': 'B1'}}"),
+        Check.new_issue(node, f"{PREFIX} band must be a str: ['B2']"),
+    ]
+    self.assertEqual(expect, issues)
+
+  def test_per_band_lengths(self):
+    node = node_with_band_vis({
+        'bands': ['B1', 'B2', 'B3'],
+        'min': 0, 'max': [1, 2], 'gain': [], 'bias': [1, 2, 3, 4],
+        'gamma': [1, 2, 3]})
+    issues = list(Check.run(node))
+    expect = [
+        Check.new_issue(node, f'{PREFIX} min must be a list'),
+        Check.new_issue(node, f'{PREFIX} max must have 1 or 3 values: 2'),
+        Check.new_issue(node, f'{PREFIX} gain must have 1 or 3 values: 0'),
+        Check.new_issue(node, f'{PREFIX} bias must have 1 or 3 values: 4'),
+    ]
+    self.assertEqual(expect, issues)
+
+
+if __name__ == '__main__':
+  unittest.main()
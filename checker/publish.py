@@ -0,0 +1,388 @@
+"""Publishes the catalog, writing only the objects that changed.
+
+Each node is published as the canonical json of its stac under
+earthengine-stac/catalog/ at its path, for example
+catalog/NASA/NASA_X.json in the earthengine-stac bucket.  Each object also
+gets precompressed variants next to it, catalog/NASA/NASA_X.json.gz and .br,
+that a server can pick by Accept-Encoding.  Every object has a strong ETag,
+the quoted sha256 of its bytes, so the ETag of the plain json of a node that
+is not split is the node's fingerprint.
+
+The manifest lists the fingerprint of every published node.  publish reads the
+previous manifest from the sink, writes the objects of the nodes whose
+fingerprints differ or that are new, and then writes the new manifest with
+the keys of the objects that are no longer published as pending deletes.  It
+deletes those and writes the manifest again without them.  The sink writes
+each object atomically and the manifest is written after the objects it
+lists, so a publish that stops before the manifest leaves the old one, and
+the next publish rewrites whatever did not match it.  One that stops while
+deleting leaves the pending deletes in the manifest, and the next publish
+retries them.  A change to the encodings or the size budget rewrites
+everything.
+
+Nodes over the size budget are published as a small core document and
+sidecar json files for their large summaries arrays, which go under
+sidecars/ so that catalog/ only has STAC nodes.  See sidecar.  The manifest
+lists the sidecars of each node so that ones that are no longer written are
+deleted.
+
+Sinks are pluggable.  LocalSink writes to a directory, keeping the headers
+of each object in a json file under .headers.
+
+brotli is only needed for the br variant and is imported when it is used.
+"""
+
+import concurrent.futures
+import dataclasses
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+from typing import Callable, Iterable, Optional
+
+from checker import archive
+from checker import canonical
+from checker import sidecar
+from checker import stac
+
+BUCKET = 'earthengine-stac'
+KEY_PREFIX = 'catalog/'
+# Where sidecar.PREFIX points.
+SIDECAR_KEY_PREFIX = 'sidecars/'
+# Outside of catalog/ so that it is not mistaken for a STAC node.
+MANIFEST_KEY = 'publish_manifest.json'
+VERSION = 1
+# Manifest fields that the first version 1 manifests did not have.
+SIZE_BUDGET = 'size_budget'
+SIDECARS = 'sidecars'
+PENDING_DELETES = 'pending_deletes'
+
+CONTENT_TYPE = 'application/json'
+GZIP = 'gzip'
+BROTLI = 'br'
+SUFFIXES = {GZIP: '.gz', BROTLI: '.br'}
+
+# Compression is CPU bound, but zlib and brotli release the GIL, and a remote
+# sink spends most of its time waiting.
+WORKERS = 8
+
+
+@dataclasses.dataclass
+class Object:
+  """The body and headers of one object in a sink."""
+  key: str
+  body: bytes
+  etag: str
+  content_type: str = CONTENT_TYPE
+  content_encoding: Optional[str] = None
+
+  def headers(self) -> dict[str, str]:
+    result = {'Content-Type': self.content_type, 'ETag': self.etag}
+    if self.content_encoding:
+      result['Content-Encoding'] = self.content_encoding
+    return result
+
+
+class Sink:
+  """Where objects are published."""
+
+  def get(self, key: str) -> Optional[bytes]:
+    """Returns the body of an object or None if there is none."""
+    raise NotImplementedError
+
+  def put(self, an_object: Object) -> None:
+    """Writes an object so that readers see either the old or new one."""
+    raise NotImplementedError
+
+  def delete(self, key: str) -> None:
+    """Deletes an object if there is one."""
+    raise NotImplementedError
+
+
+class LocalSink(Sink):
+  """A Sink that writes to a directory."""
+  HEADERS = '.headers'
+
+  def __init__(self, root: pathlib.Path):
+    self.root = root
+
+  def _path(self, key: str) -> pathlib.Path:
+    return self.root / key
+
+  def _headers_path(self, key: str) -> pathlib.Path:
+    return self.root / self.HEADERS / (key + '.json')
+
+  def get(self, key: str) -> Optional[bytes]:
+    try:
+      return self._path(key).read_bytes()
+    except FileNotFoundError:
+      return None
+
+  def headers(self, key: str) -> Optional[dict[str, str]]:
+    try:
+      return json.loads(self._headers_path(key).read_text())
+    except FileNotFoundError:
+      return None
+
+  def put(self, an_object: Object) -> None:
+    # The body goes first, so a reader never gets the new ETag with the old
+    # body.
+    headers = json.dumps(an_object.headers(), sort_keys=True).encode('utf-8')
+    _write_atomically(self._path(an_object.key), an_object.body)
+    _write_atomically(self._headers_path(an_object.key), headers)
+
+  def delete(self, key: str) -> None:
+    self._path(key).unlink(missing_ok=True)
+    self._headers_path(key).unlink(missing_ok=True)
+
+
+def _write_atomically(path: pathlib.Path, data: bytes) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(data)
+    os.replace(tmp_name, path)
+  except BaseException:
+    os.unlink(tmp_name)
+    raise
+
+
+def object_key(path: pathlib.Path) -> str:
+  """Returns the key of the object for a node's path."""
+  return KEY_PREFIX + archive.relative_path(path.as_posix()).as_posix()
+
+
+def sidecar_key(path: pathlib.Path) -> str:
+  """Returns the key of the object for a sidecar's path."""
+  return SIDECAR_KEY_PREFIX + archive.relative_path(path.as_posix()).as_posix()
+
+
+def etag(body: bytes) -> str:
+  return '"' + hashlib.sha256(body).hexdigest() + '"'
+
+
+def _brotli_compress() -> Callable[[bytes], bytes]:
+  try:
+    import brotli  # pylint: disable=g-import-not-at-top
+  except ImportError as e:
+    raise ValueError(
+        'The br variant needs the brotli package.  Install it or publish '
+        'with only gzip.') from e
+  return lambda body: brotli.compress(body, mode=brotli.MODE_TEXT)
+
+
+def default_encodings() -> tuple[str, ...]:
+  """Returns gzip, and br if the optional brotli package is installed."""
+  try:
+    import brotli  # pylint: disable=g-import-not-at-top,unused-import
+  except ImportError:
+    return (GZIP,)
+  return (GZIP, BROTLI)
+
+
+def compressors(
+    encodings: Iterable[str]) -> dict[str, Callable[[bytes], bytes]]:
+  """Returns a function to compress a body for each encoding.
+
+  Raises:
+    ValueError: for an unknown encoding or if brotli is not installed.
+  """
+  result = {}
+  for encoding in encodings:
+    if encoding == GZIP:
+      # mtime=0 keeps the bytes and so the ETag the same between publishes.
+      result[GZIP] = lambda body: gzip.compress(body, 9, mtime=0)
+    elif encoding == BROTLI:
+      result[BROTLI] = _brotli_compress()
+    else:
+      raise ValueError(f'Unknown encoding: {encoding}')
+  return result
+
+
+def _with_variants(
+    key: str, body: bytes, body_etag: str,
+    compress: dict[str, Callable[[bytes], bytes]]) -> list[Object]:
+  result = [Object(key, body, body_etag)]
+  for encoding, function in compress.items():
+    compressed = function(body)
+    result.append(Object(
+        key + SUFFIXES[encoding], compressed, etag(compressed),
+        content_encoding=encoding))
+  return result
+
+
+def objects(
+    node: stac.Node, compress: dict[str, Callable[[bytes], bytes]],
+    size_budget: Optional[int] = None) -> tuple[list[Object], list[str]]:
+  """Returns the objects for a node and the keys of its sidecars.
+
+  Each json object is followed by its precompressed variants.  If size_budget
+  is given, large arrays are split out of the node into sidecars.
+  """
+  key = object_key(node.path)
+  if size_budget is None:
+    return _with_variants(
+        key, canonical.dumps(node.stac), f'"{node.fingerprint}"',
+        compress), []
+
+  split = sidecar.split(node, size_budget)
+  body = canonical.dumps(split.core)
+  result = _with_variants(key, body, etag(body), compress)
+  sidecar_keys = []
+  for item in split.sidecars:
+    item_key = sidecar_key(item.path)
+    sidecar_keys.append(item_key)
+    body = canonical.dumps(item.value)
+    result += _with_variants(item_key, body, etag(body), compress)
+  return result, sidecar_keys
+
+
+@dataclasses.dataclass
+class Stats:
+  nodes: int = 0
+  unchanged: int = 0
+  written: int = 0
+  deleted: int = 0
+  # Nodes written as a core and sidecars.
+  split: int = 0
+  objects_written: int = 0
+  bytes_written: int = 0
+
+  def summary(self) -> str:
+    return (
+        f'publish: {self.nodes} nodes, {self.unchanged} unchanged, '
+        f'{self.written} written as {self.objects_written} objects of '
+        f'{self.bytes_written} bytes, {self.split} split into sidecars, '
+        f'{self.deleted} deleted')
+
+
+def load_manifest(sink: Sink) -> dict[str, object]:
+  """Returns the manifest in sink or an empty one."""
+  data = sink.get(MANIFEST_KEY)
+  if data is None:
+    return {
+        'version': VERSION, 'encodings': [], 'objects': {},
+        SIZE_BUDGET: None, SIDECARS: {}, PENDING_DELETES: []}
+  manifest = json.loads(data)
+  if manifest.get('version') != VERSION:
+    raise ValueError(
+        f'Unsupported manifest version: {manifest.get("version")}')
+  manifest.setdefault(SIZE_BUDGET, None)
+  manifest.setdefault(SIDECARS, {})
+  manifest.setdefault(PENDING_DELETES, [])
+  return manifest
+
+
+def _put_manifest(sink: Sink, manifest: dict[str, object]) -> None:
+  body = json.dumps(manifest, indent=1).encode('utf-8')
+  sink.put(Object(MANIFEST_KEY, body, etag(body)))
+
+
+def publish(
+    nodes: list[stac.Node], sink: Sink,
+    encodings: Optional[Iterable[str]] = None,
+    stats: Optional[Stats] = None,
+    workers: int = WORKERS,
+    size_budget: Optional[int] = sidecar.BUDGET) -> dict[str, object]:
+  """Writes the nodes that changed since the last publish to sink.
+
+  Args:
+    nodes: The whole catalog.  Nodes that are in the manifest but not here are
+      deleted.
+    sink: Where to publish.
+    encodings: The precompressed variants to write for each node.  Defaults
+      to default_encodings().
+    stats: If given, counts of what was written.
+    workers: Threads that compress and write objects.
+    size_budget: Nodes with more bytes of json than this are split into a
+      core and sidecars.  None to never split.
+
+  Returns:
+    The new manifest.
+
+  Raises:
+    ValueError: if two nodes have the same key, for an unknown encoding, or if
+      brotli is needed and not installed.
+  """
+  stats = stats if stats is not None else Stats()
+  encodings = sorted(encodings if encodings is not None
+                     else default_encodings())
+  compress = compressors(encodings)
+  previous = load_manifest(sink)
+  old = {}
+  if (previous['encodings'] == encodings and
+      previous[SIZE_BUDGET] == size_budget):
+    old = previous['objects']
+
+  published: dict[str, str] = {}
+  sidecars: dict[str, list[str]] = {}
+  changed: list[stac.Node] = []
+  for a_node in nodes:
+    key = object_key(a_node.path)
+    if key in published:
+      raise ValueError(f'Two nodes are published as {key}')
+    published[key] = a_node.fingerprint
+    if old.get(key) == a_node.fingerprint:
+      stats.unchanged += 1
+      if key in previous[SIDECARS]:
+        sidecars[key] = previous[SIDECARS][key]
+    else:
+      changed.append(a_node)
+  stats.nodes = len(nodes)
+
+  def write(a_node: stac.Node) -> tuple[list[Object], list[str]]:
+    node_objects, sidecar_keys = objects(a_node, compress, size_budget)
+    for an_object in node_objects:
+      sink.put(an_object)
+    return node_objects, sidecar_keys
+
+  with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+    for a_node, (node_objects, sidecar_keys) in zip(
+        changed, executor.map(write, changed)):
+      stats.written += 1
+      stats.objects_written += len(node_objects)
+      stats.bytes_written += sum(len(item.body) for item in node_objects)
+      if sidecar_keys:
+        stats.split += 1
+        sidecars[object_key(a_node.path)] = sidecar_keys
+
+  def all_keys(node_keys: Iterable[str],
+               node_sidecars: dict[str, list[str]]) -> set[str]:
+    result = set(node_keys)
+    for keys in node_sidecars.values():
+      result.update(keys)
+    return result
+
+  before = all_keys(previous['objects'], previous[SIDECARS])
+  after = all_keys(published, sidecars)
+  stats.deleted = len(previous['objects'].keys() - published.keys())
+  deletes = set(previous[PENDING_DELETES])
+  for key in before - after:
+    deletes.add(key)
+    deletes.update(key + suffix for suffix in SUFFIXES.values())
+  # Variants of encodings that are no longer published.
+  for encoding in set(previous['encodings']) - set(encodings):
+    deletes.update(key + SUFFIXES[encoding] for key in before & after)
+  # A pending delete from a publish that stopped may have been published again.
+  for key in after:
+    deletes.discard(key)
+    deletes.difference_update(key + SUFFIXES[name] for name in encodings)
+
+  manifest = {
+      'version': VERSION,
+      'encodings': encodings,
+      'objects': dict(sorted(published.items())),
+      SIZE_BUDGET: size_budget,
+      SIDECARS: dict(sorted(sidecars.items())),
+      PENDING_DELETES: sorted(deletes),
+  }
+  _put_manifest(sink, manifest)
+  if deletes:
+    for key in manifest[PENDING_DELETES]:
+      sink.delete(key)
+    manifest[PENDING_DELETES] = []
+    _put_manifest(sink, manifest)
+  return manifest
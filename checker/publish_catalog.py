@@ -0,0 +1,49 @@
+"""Publish the built catalog, writing only the nodes that changed.
+
+STATUS: Experimental - For feedback
+
+  publish_catalog --output_dir=/tmp/earthengine-stac [CATALOG]
+
+CATALOG is a directory of built json or an archive of one and defaults to the
+catalog in this tree.
+"""
+
+from collections.abc import Sequence
+import pathlib
+
+from absl import app
+from absl import flags
+
+from checker import publish
+from checker import sidecar
+from checker import stac
+
+_OUTPUT_DIR = flags.DEFINE_string(
+    'output_dir', None, 'Directory to publish to, laid out like the bucket.',
+    required=True)
+_ENCODINGS = flags.DEFINE_list(
+    'encodings', list(publish.default_encodings()),
+    'Precompressed variants to write next to each json object.  Defaults '
+    'to gzip, and br too if brotli is installed.')
+_SIZE_BUDGET = flags.DEFINE_integer(
+    'size_budget', sidecar.BUDGET,
+    'Split nodes with more bytes of json than this into a core and sidecars '
+    'for their large summaries arrays.  0 to never split.')
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 2:
+    raise app.UsageError('Too many command-line arguments.')
+  root = pathlib.Path(argv[1]) if len(argv) > 1 else stac.stac_root()
+
+  nodes = stac.load(root)
+  print('Number of STAC nodes loaded:', len(nodes))
+  stats = publish.Stats()
+  publish.publish(
+      nodes, publish.LocalSink(pathlib.Path(_OUTPUT_DIR.value)),
+      _ENCODINGS.value, stats, size_budget=_SIZE_BUDGET.value or None)
+  print(stats.summary())
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,290 @@
+"""Tests for publish."""
+
+import gzip
+import hashlib
+import json
+import pathlib
+import tempfile
+from unittest import mock
+
+from checker import canonical
+from checker import publish
+from checker import sidecar
+from checker import stac
+from checker.tree import links
+import unittest
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+GZIP_ONLY = (publish.GZIP,)
+
+try:
+  import brotli  # pylint: disable=g-import-not-at-top
+except ImportError:
+  brotli = None
+
+
+def make_node(path: str, title: str = 'A title') -> stac.Node:
+  dataset_id = path.removesuffix('.json')
+  return stac.Node(
+      dataset_id, pathlib.Path(path), COLLECTION, IMAGE,
+      {'id': dataset_id, 'type': 'Collection', 'title': title})
+
+
+class RecordingSink(publish.LocalSink):
+  """A LocalSink that remembers the keys that were put."""
+
+  def __init__(self, root: pathlib.Path):
+    super().__init__(root)
+    self.puts = []
+
+  def put(self, an_object: publish.Object) -> None:
+    self.puts.append(an_object.key)
+    super().put(an_object)
+
+
+class PublishTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.tmp_dir = tempfile.TemporaryDirectory()
+    self.root = pathlib.Path(self.tmp_dir.name)
+    self.sink = RecordingSink(self.root)
+
+  def tearDown(self):
+    self.tmp_dir.cleanup()
+    super().tearDown()
+
+  def test_object_key(self):
+    self.assertEqual(
+        'catalog/NASA/NASA_X.json',
+        publish.object_key(pathlib.Path('NASA/NASA_X.json')))
+    self.assertEqual(
+        'catalog/catalog.json',
+        publish.object_key(pathlib.Path('catalog/catalog.json')))
+
+  def test_first_publish(self):
+    node = make_node('A/A_X.json')
+    stats = publish.Stats()
+    manifest = publish.publish([node], self.sink, GZIP_ONLY, stats)
+
+    body = (self.root / 'catalog/A/A_X.json').read_bytes()
+    self.assertEqual(canonical.dumps(node.stac), body)
+    self.assertEqual(
+        body, gzip.decompress(
+            (self.root / 'catalog/A/A_X.json.gz').read_bytes()))
+    self.assertEqual({
+        'Content-Type': 'application/json',
+        'ETag': f'"{node.fingerprint}"',
+    }, self.sink.headers('catalog/A/A_X.json'))
+    gz_headers = self.sink.headers('catalog/A/A_X.json.gz')
+    self.assertEqual('gzip', gz_headers['Content-Encoding'])
+    gz_body = (self.root / 'catalog/A/A_X.json.gz').read_bytes()
+    self.assertEqual(
+        '"' + hashlib.sha256(gz_body).hexdigest() + '"', gz_headers['ETag'])
+
+    self.assertEqual(
+        {'catalog/A/A_X.json': node.fingerprint}, manifest['objects'])
+    self.assertEqual(
+        manifest, json.loads(
+            (self.root / publish.MANIFEST_KEY).read_text()))
+    self.assertEqual(publish.Stats(
+        nodes=1, written=1, objects_written=2,
+        bytes_written=len(body) + len(gz_body)), stats)
+
+  def test_only_changes_are_written(self):
+    nodes = [make_node(f'A/A_{i}.json') for i in range(5)]
+    publish.publish(nodes, self.sink, GZIP_ONLY)
+    # The manifest is written after the objects.
+    self.assertEqual(publish.MANIFEST_KEY, self.sink.puts[-1])
+
+    self.sink.puts.clear()
+    nodes[2] = make_node('A/A_2.json', 'New title')
+    stats = publish.Stats()
+    publish.publish(nodes[:4] + [make_node('B/B_X.json')], self.sink,
+                    GZIP_ONLY, stats)
+    self.assertEqual(
+        ['catalog/A/A_2.json', 'catalog/A/A_2.json.gz',
+         'catalog/B/B_X.json', 'catalog/B/B_X.json.gz',
+         # With the pending deletes and then without them.
+         publish.MANIFEST_KEY, publish.MANIFEST_KEY],
+        sorted(self.sink.puts,
+               key=lambda key: (key == publish.MANIFEST_KEY, key)))
+    self.assertEqual(3, stats.unchanged)
+    self.assertEqual(2, stats.written)
+    self.assertEqual(1, stats.deleted)
+    self.assertFalse((self.root / 'catalog/A/A_4.json').exists())
+    self.assertFalse((self.root / 'catalog/A/A_4.json.gz').exists())
+    self.assertIn(
+        b'New title', (self.root / 'catalog/A/A_2.json').read_bytes())
+
+  def test_unchanged(self):
+    nodes = [make_node('A/A_X.json')]
+    publish.publish(nodes, self.sink, GZIP_ONLY)
+    self.sink.puts.clear()
+    stats = publish.Stats()
+    publish.publish([make_node('A/A_X.json')], self.sink, GZIP_ONLY, stats)
+    self.assertEqual([publish.MANIFEST_KEY], self.sink.puts)
+    self.assertEqual(publish.Stats(nodes=1, unchanged=1), stats)
+
+  def test_interrupted_publish_is_redone(self):
+    publish.publish([make_node('A/A_X.json')], self.sink, GZIP_ONLY)
+    changed = [make_node('A/A_X.json', 'New title')]
+    with mock.patch.object(
+        publish, '_write_atomically', side_effect=OSError('disk full')):
+      with self.assertRaises(OSError):
+        publish.publish(changed, self.sink, GZIP_ONLY)
+    # The old manifest is still there, so the next publish writes the node.
+    stats = publish.Stats()
+    publish.publish(changed, self.sink, GZIP_ONLY, stats)
+    self.assertEqual(1, stats.written)
+    self.assertEqual([], list(self.root.rglob('.tmp*')))
+
+  def test_interrupted_delete_is_retried(self):
+    nodes = [make_node('A/A_X.json'), make_node('A/A_Y.json')]
+    publish.publish(nodes, self.sink, GZIP_ONLY)
+    with mock.patch.object(
+        self.sink, 'delete', side_effect=OSError('network down')):
+      with self.assertRaises(OSError):
+        publish.publish(nodes[:1], self.sink, GZIP_ONLY)
+    self.assertEqual(
+        ['catalog/A/A_Y.json', 'catalog/A/A_Y.json.br',
+         'catalog/A/A_Y.json.gz'],
+        publish.load_manifest(self.sink)[publish.PENDING_DELETES])
+
+    manifest = publish.publish(nodes[:1], self.sink, GZIP_ONLY)
+    self.assertEqual([], manifest[publish.PENDING_DELETES])
+    self.assertEqual(manifest, publish.load_manifest(self.sink))
+    self.assertFalse((self.root / 'catalog/A/A_Y.json').exists())
+    self.assertFalse((self.root / 'catalog/A/A_Y.json.gz').exists())
+
+  def test_pending_delete_that_is_published_again(self):
+    nodes = [make_node('A/A_X.json'), make_node('A/A_Y.json')]
+    publish.publish(nodes, self.sink, GZIP_ONLY)
+    with mock.patch.object(
+        self.sink, 'delete', side_effect=OSError('network down')):
+      with self.assertRaises(OSError):
+        publish.publish(nodes[:1], self.sink, GZIP_ONLY)
+    stats = publish.Stats()
+    publish.publish(nodes, self.sink, GZIP_ONLY, stats)
+    self.assertEqual(1, stats.written)
+    self.assertTrue((self.root / 'catalog/A/A_Y.json').exists())
+    self.assertTrue((self.root / 'catalog/A/A_Y.json.gz').exists())
+
+  def test_local_sink_writes_the_body_first(self):
+    with mock.patch.object(publish, '_write_atomically') as write:
+      self.sink.put(publish.Object('catalog/a.json', b'{}', '"x"'))
+    self.assertEqual(
+        [self.root / 'catalog/a.json',
+         self.root / '.headers/catalog/a.json.json'],
+        [call.args[0] for call in write.call_args_list])
+
+  def test_new_encodings_rewrite_everything(self):
+    nodes = [make_node('A/A_X.json')]
+    publish.publish(nodes, self.sink, GZIP_ONLY)
+    stats = publish.Stats()
+    publish.publish(nodes, self.sink, (), stats)
+    self.assertEqual(1, stats.written)
+    self.assertFalse((self.root / 'catalog/A/A_X.json.gz').exists())
+    self.assertTrue((self.root / 'catalog/A/A_X.json').exists())
+
+  def test_split(self):
+    node = make_node('L/L_X.json')
+    table = [{'value': i, 'description': f'Class {i}'} for i in range(1000)]
+    node.stac['summaries'] = {'eo:bands': [{'name': 'B', 'gee:classes': table}]}
+    stats = publish.Stats()
+    manifest = publish.publish(
+        [node], self.sink, GZIP_ONLY, stats, size_budget=1024)
+
+    sidecar_key = 'sidecars/L/L_X.summaries_eo_bands_0_gee_classes.json'
+    self.assertEqual(
+        {'catalog/L/L_X.json': [sidecar_key]}, manifest['sidecars'])
+    self.assertEqual(1, stats.split)
+    core = json.loads((self.root / 'catalog/L/L_X.json').read_bytes())
+    self.assertLessEqual(len(canonical.dumps(core)), 1024)
+    sidecars = {
+        sidecar.PREFIX + sidecar_key.removeprefix(publish.SIDECAR_KEY_PREFIX):
+            json.loads((self.root / sidecar_key).read_bytes())}
+    self.assertEqual(node.stac, sidecar.merge(core, sidecars))
+    self.assertTrue((self.root / (sidecar_key + '.gz')).exists())
+
+    # Once the table is small again, the sidecar is deleted.
+    small = make_node('L/L_X.json')
+    manifest = publish.publish([small], self.sink, GZIP_ONLY, size_budget=1024)
+    self.assertEqual({}, manifest['sidecars'])
+    self.assertFalse((self.root / sidecar_key).exists())
+    self.assertFalse((self.root / (sidecar_key + '.gz')).exists())
+
+  def test_split_output_loads_and_checks(self):
+    def link(rel: str, path: str) -> dict[str, str]:
+      return {'rel': rel, 'href': links.PREFIX + path,
+              'type': 'application/json'}
+
+    root = stac.Node(
+        'GEE_catalog', pathlib.Path('catalog.json'), stac.StacType.CATALOG,
+        stac.GeeType.NONE, {
+            'type': 'Catalog', 'id': 'GEE_catalog',
+            'links': [link('self', 'catalog.json'),
+                      link('child', 'L/L_X.json')]})
+    node = make_node('L/L_X.json')
+    node.stac['links'] = [
+        link('self', 'L/L_X.json'), link('parent', 'catalog.json'),
+        link('root', 'catalog.json')]
+    table = [{'value': i, 'description': f'Class {i}'} for i in range(5000)]
+    node.stac['summaries'] = {'eo:bands': [{'name': 'B', 'gee:classes': table}]}
+    publish.publish([root, node], self.sink, GZIP_ONLY)
+
+    loaded = stac.load(self.root / 'catalog')
+    self.assertEqual(
+        ['GEE_catalog', 'L/L_X'], sorted(item.id for item in loaded))
+    self.assertEqual([], list(links.Check.run(loaded)))
+    core = [item for item in loaded if item.id == 'L/L_X'][0].stac
+    self.assertNotIn('gee:classes', core['summaries']['eo:bands'][0])
+    sidecars = {
+        sidecar.PREFIX + path.relative_to(self.root / 'sidecars').as_posix():
+            json.loads(path.read_bytes())
+        for path in (self.root / 'sidecars').rglob('*.json')}
+    self.assertEqual(node.stac, sidecar.merge(core, sidecars))
+
+  def test_new_size_budget_rewrites_everything(self):
+    nodes = [make_node('A/A_X.json')]
+    publish.publish(nodes, self.sink, GZIP_ONLY, size_budget=None)
+    stats = publish.Stats()
+    publish.publish(nodes, self.sink, GZIP_ONLY, stats)
+    self.assertEqual(1, stats.written)
+
+  def test_duplicate_key(self):
+    with self.assertRaises(ValueError):
+      publish.publish(
+          [make_node('A/A_X.json'), make_node('catalog/A/A_X.json')],
+          self.sink, GZIP_ONLY)
+
+  def test_unknown_encoding(self):
+    with self.assertRaises(ValueError):
+      publish.publish([make_node('A/A_X.json')], self.sink, ('zip',))
+
+  def test_brotli_missing(self):
+    with mock.patch.dict('sys.modules', {'brotli': None}):
+      self.assertEqual(GZIP_ONLY, publish.default_encodings())
+      publish.publish([make_node('A/A_X.json')], self.sink)
+      with self.assertRaisesRegex(ValueError, 'brotli'):
+        publish.publish(
+            [make_node('A/A_X.json')], self.sink,
+            (publish.GZIP, publish.BROTLI))
+    self.assertTrue((self.root / 'catalog/A/A_X.json.gz').exists())
+    self.assertFalse((self.root / 'catalog/A/A_X.json.br').exists())
+
+  @unittest.skipIf(brotli is None, 'brotli is not installed')
+  def test_brotli(self):
+    node = make_node('A/A_X.json')
+    publish.publish([node], self.sink)
+    self.assertEqual(
+        canonical.dumps(node.stac),
+        brotli.decompress((self.root / 'catalog/A/A_X.json.br').read_bytes()))
+    self.assertEqual(
+        'br', self.sink.headers('catalog/A/A_X.json.br')['Content-Encoding'])
+
+
+if __name__ == '__main__':
+  unittest.main()
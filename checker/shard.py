@@ -0,0 +1,172 @@
+"""Splits a checker run across machines and merges the results.
+
+Each node belongs to the shard picked by a stable hash of the first part of
+its id, so a catalog and everything under it land in the same shard.  A shard
+runs the node checks and the local tree checks on its own nodes and writes a
+summary with, for each of its nodes:
+
+- its position in the load order of the whole catalog
+- the issues it got from the node checks and from each local tree check
+- a projection of its json down to the fields the other tree checks read
+
+Merging the summaries of all of the shards rebuilds the projected catalog in
+load order, emits the stored issues, and runs the non-local tree checks over
+the projection.  The issues come out in the same order as a run on one
+machine.
+"""
+
+import json
+import pathlib
+from typing import Iterator, Optional
+import zlib
+
+from checker import node as node_checks
+from checker import stac
+from checker import tree
+
+SEPARATOR = '/'
+VERSION = 1
+
+
+def subtree(dataset_id: str) -> str:
+  return dataset_id.split(SEPARATOR, 1)[0]
+
+
+def shard_of(dataset_id: str, shard_count: int) -> int:
+  """Returns the shard for an id.  This is the same on every machine."""
+  return zlib.crc32(subtree(dataset_id).encode('utf-8')) % shard_count
+
+
+def issue_to_json(issue: stac.Issue) -> list[str]:
+  return [
+      issue.id, str(issue.path), issue.check_name, issue.message,
+      issue.level.value]
+
+
+def issue_from_json(data: list[str]) -> stac.Issue:
+  dataset_id, path, check_name, message, level = data
+  return stac.Issue(
+      dataset_id, pathlib.Path(path), check_name, message,
+      stac.IssueLevel(level))
+
+
+def project(
+    node: stac.Node, fields: Optional[frozenset[str]]) -> dict[str, object]:
+  """Returns the part of the json of a node that has fields."""
+  if fields is None:
+    return node.stac
+  return {field: node.stac[field] for field in fields if field in node.stac}
+
+
+def summarize(
+    nodes: list[stac.Node], checks: list[str], shard_index: int,
+    shard_count: int) -> dict[str, object]:
+  """Runs this shard's part of the checks and returns its summary.
+
+  Args:
+    nodes: The whole catalog in load order.
+    checks: The names of the checks to run or empty for all of them.
+    shard_index: Which shard this is, from 0 to shard_count - 1.
+    shard_count: How many shards the catalog is split into.
+
+  Returns:
+    A json compatible dict for merge.
+  """
+  if not 0 <= shard_index < shard_count:
+    raise ValueError(
+        f'shard_index must be in [0, {shard_count}): {shard_index}')
+
+  fields = tree.projection_fields(checks)
+  mine = [
+      (ordinal, a_node) for ordinal, a_node in enumerate(nodes)
+      if shard_of(a_node.id, shard_count) == shard_index]
+
+  local: dict[tuple[str, str], dict[str, list[list[str]]]] = {}
+  for check in tree.selected(checks):
+    if not check.local:
+      continue
+    for issue in check.run([a_node for _, a_node in mine]):
+      key = (issue.id, str(issue.path))
+      local.setdefault(key, {}).setdefault(check.name, []).append(
+          issue_to_json(issue))
+
+  records = []
+  for ordinal, a_node in mine:
+    records.append({
+        'ordinal': ordinal,
+        'id': a_node.id,
+        'path': str(a_node.path),
+        'type': a_node.type,
+        'gee_type': a_node.gee_type.value,
+        'stac': project(a_node, fields),
+        'issues': [
+            issue_to_json(issue)
+            for issue in node_checks.run_checks(a_node, checks)],
+        'local': local.get((a_node.id, str(a_node.path)), {}),
+    })
+  return {
+      'version': VERSION,
+      'shard_index': shard_index,
+      'shard_count': shard_count,
+      'num_nodes': len(nodes),
+      'nodes': records,
+  }
+
+
+def save(summary: dict[str, object], path: pathlib.Path) -> None:
+  path.write_text(json.dumps(summary, separators=(',', ':')))
+
+
+def load(path: pathlib.Path) -> dict[str, object]:
+  return json.loads(path.read_text())
+
+
+def merge(summaries: list[dict[str, object]]) -> list[dict[str, object]]:
+  """Returns the node records of all of the shards in load order."""
+  if not summaries:
+    raise ValueError('No shard summaries to merge')
+  shard_count = summaries[0]['shard_count']
+  num_nodes = summaries[0]['num_nodes']
+  indexes = sorted(summary['shard_index'] for summary in summaries)
+  if indexes != list(range(shard_count)):
+    raise ValueError(
+        f'Expected one summary for each of {shard_count} shards: {indexes}')
+  for summary in summaries:
+    if summary['version'] != VERSION:
+      raise ValueError(f'Unknown summary version: {summary["version"]}')
+    if (summary['shard_count'] != shard_count or
+        summary['num_nodes'] != num_nodes):
+      raise ValueError('Summaries are from different runs')
+
+  records = [record for summary in summaries for record in summary['nodes']]
+  records.sort(key=lambda record: record['ordinal'])
+  if len(records) != num_nodes:
+    raise ValueError(f'Expected {num_nodes} nodes, found {len(records)}')
+  return records
+
+
+def _node(record: dict[str, object]) -> stac.Node:
+  node_type = record['type']
+  if node_type in (stac_type.value for stac_type in stac.StacType):
+    node_type = stac.StacType(node_type)
+  return stac.Node(
+      record['id'], pathlib.Path(record['path']), node_type,
+      stac.GeeType(record['gee_type']), record['stac'])
+
+
+def merged_issues(
+    records: list[dict[str, object]],
+    checks: list[str]) -> Iterator[stac.Issue]:
+  """Yields the issues of a single machine run in the same order."""
+  for record in records:
+    for issue in record['issues']:
+      yield issue_from_json(issue)
+
+  nodes = [_node(record) for record in records]
+  for check in tree.selected(checks):
+    if check.local:
+      for record in records:
+        for issue in record['local'].get(check.name, []):
+          yield issue_from_json(issue)
+    else:
+      yield from check.run(nodes)
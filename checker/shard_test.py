@@ -0,0 +1,125 @@
+"""Tests for shard."""
+
+import json
+import pathlib
+import tempfile
+
+from checker import node
+from checker import shard
+from checker import stac
+from checker import tree
+import unittest
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+PREFIX = 'https://storage.googleapis.com/earthengine-stac/catalog/'
+
+
+def link(rel: str, href: str) -> dict[str, str]:
+  return {'rel': rel, 'href': PREFIX + href, 'type': 'application/json'}
+
+
+def make_node(
+    dataset_id: str, stac_type: stac.StacType, gee_type: stac.GeeType,
+    href: str, parent: str, children: list[str]) -> stac.Node:
+  links = [link('self', href), link('parent', parent)]
+  links += [link('child', child) for child in children]
+  return stac.Node(
+      dataset_id, pathlib.Path(f'catalog/{href}'), stac_type, gee_type, {
+          'type': stac_type.value,
+          'id': dataset_id,
+          'stac_version': '1.0.0',
+          'description': f'About {dataset_id}. See [B](B_X).',
+          'license': 'CC-BY-NC-4.0',
+          'links': links,
+      })
+
+
+def make_nodes() -> list[stac.Node]:
+  return [
+      make_node('GEE_catalog', CATALOG, NONE, 'catalog.json', 'catalog.json',
+                ['A/catalog.json', 'B/catalog.json', 'C/catalog.json']),
+      make_node('A', CATALOG, NONE, 'A/catalog.json', 'catalog.json',
+                ['A/A_V1.json', 'A/A_missing.json']),
+      make_node('A/V1', COLLECTION, IMAGE, 'A/A_V1.json', 'A/catalog.json', []),
+      make_node('B', CATALOG, NONE, 'B/catalog.json', 'catalog.json',
+                ['B/B_X.json']),
+      make_node('B/X', COLLECTION, IMAGE, 'B/B_X.json', 'C/catalog.json', []),
+      make_node('C', CATALOG, NONE, 'C/catalog.json', 'catalog.json', []),
+  ]
+
+
+def single_run(nodes: list[stac.Node], checks: list[str]) -> list[str]:
+  issues = []
+  for a_node in nodes:
+    issues.extend(node.run_checks(a_node, checks))
+  issues.extend(tree.run_checks(nodes, checks))
+  return [str(issue) for issue in issues]
+
+
+class ShardTest(unittest.TestCase):
+
+  def test_subtree(self):
+    self.assertEqual('LANDSAT', shard.subtree('LANDSAT/LC09/C02/T1_L2'))
+    self.assertEqual('GEE_catalog', shard.subtree('GEE_catalog'))
+
+  def test_shard_of_is_stable_within_a_subtree(self):
+    for count in (1, 2, 3, 7):
+      shard_index = shard.shard_of('MODIS', count)
+      self.assertLess(shard_index, count)
+      self.assertEqual(shard_index, shard.shard_of('MODIS/061/MOD09GA', count))
+
+  def test_issue_round_trip(self):
+    issue = stac.Issue(
+        'A/B', pathlib.Path('catalog/A/A_B.jsonnet'), 'links', 'Bad',
+        stac.IssueLevel.WARNING)
+    self.assertEqual(
+        issue, shard.issue_from_json(
+            json.loads(json.dumps(shard.issue_to_json(issue)))))
+
+  def test_project(self):
+    a_node = make_nodes()[0]
+    self.assertEqual(
+        {'links': a_node.stac['links']},
+        shard.project(a_node, frozenset({'links', 'not_there'})))
+    self.assertIs(a_node.stac, shard.project(a_node, None))
+
+  def test_merge_matches_single_run(self):
+    nodes = make_nodes()
+    for checks in ([], ['links', 'parent_child'], ['schemas']):
+      for shard_count in (1, 2, 3):
+        with self.subTest(checks=checks, shard_count=shard_count):
+          summaries = []
+          with tempfile.TemporaryDirectory() as tmp_dir:
+            for shard_index in range(shard_count):
+              path = pathlib.Path(tmp_dir) / f'shard_{shard_index}.json'
+              shard.save(
+                  shard.summarize(nodes, checks, shard_index, shard_count),
+                  path)
+              summaries.append(shard.load(path))
+          records = shard.merge(summaries[::-1])
+          self.assertEqual(len(nodes), len(records))
+          self.assertEqual(
+              single_run(nodes, checks),
+              [str(issue) for issue in shard.merged_issues(records, checks)])
+
+  def test_merge_needs_every_shard(self):
+    nodes = make_nodes()
+    summaries = [shard.summarize(nodes, [], index, 3) for index in (0, 2)]
+    with self.assertRaisesRegex(ValueError, 'one summary for each'):
+      shard.merge(summaries)
+
+  def test_merge_nothing(self):
+    with self.assertRaisesRegex(ValueError, 'No shard summaries'):
+      shard.merge([])
+
+  def test_bad_shard_index(self):
+    with self.assertRaisesRegex(ValueError, 'shard_index'):
+      shard.summarize(make_nodes(), [], 3, 3)
+
+
+if __name__ == '__main__':
+  unittest.main()
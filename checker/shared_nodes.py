@@ -0,0 +1,200 @@
+"""Runs the node checks in worker processes over shared memory.
+
+Sending nodes to worker processes pickles their json, and big nodes like the
+LANDFIRE class tables are megabytes each.  Instead, the catalog is serialized
+once into a multiprocessing.shared_memory block in the array_file layout:
+
+- offsets: uint64 start of each node's record in data, plus the end
+- data: the pickled nodes back to back
+
+Records are pickles rather than json because pickle is faster to write and
+read, and a worker unpickles straight from its slice of the block.
+
+Each worker attaches to the block once when it starts.  Its tasks are only
+ranges of node indexes, which are balanced by bytes rather than by count, and
+it decodes just the nodes in its ranges.  The issues come back pickled and are
+small.
+
+Stats counts the bytes that cross between processes, so they can be compared
+with pickling the nodes.  See shared_nodes_benchmark.
+
+map_nodes runs any module level function of a node this way, which is how the
+schemas tree check validates in worker processes.
+
+The check summaries, like the bands cache stats, stay in the workers.
+"""
+
+import array
+import bisect
+import concurrent.futures
+import dataclasses
+import functools
+from multiprocessing import shared_memory
+import os
+import pickle
+import time
+from typing import Callable, Iterator, Optional
+
+from checker import array_file
+from checker import node as node_checks
+from checker import stac
+
+MAGIC = b'EENODES1'
+DATA = 'data'
+OFFSETS = 'offsets'
+
+# Tasks per worker, so a slow range does not hold up the rest.
+TASKS_PER_PROCESS = 4
+
+# The block the worker in this process is attached to.
+_shared: Optional[shared_memory.SharedMemory] = None
+
+
+@dataclasses.dataclass
+class Stats:
+  nodes: int = 0
+  # The size of the shared memory block, which is written once.
+  shared_bytes: int = 0
+  # The pickled tasks sent to the workers.
+  task_bytes: int = 0
+  # The pickled issues sent back.
+  result_bytes: int = 0
+  encode_seconds: float = 0.0
+  run_seconds: float = 0.0
+
+  def summary(self) -> str:
+    return (
+        f'shared_nodes: {self.nodes} nodes, {self.shared_bytes} shared bytes, '
+        f'{self.task_bytes + self.result_bytes} IPC bytes, encoded in '
+        f'{self.encode_seconds * 1000:.1f} ms, ran in '
+        f'{self.run_seconds * 1000:.1f} ms')
+
+
+def encode(nodes: list[stac.Node]) -> bytes:
+  """Returns the nodes in the shared layout."""
+  offsets = array.array('Q', [0])
+  records = []
+  for a_node in nodes:
+    record = pickle.dumps(a_node, pickle.HIGHEST_PROTOCOL)
+    records.append(record)
+    offsets.append(offsets[-1] + len(record))
+  data = memoryview(b''.join(records))
+  return array_file.encode(
+      MAGIC, {'count': len(nodes)}, {OFFSETS: offsets, DATA: data})
+
+
+def _offsets(buffer) -> tuple[array_file.Array, array_file.Array]:
+  _, arrays = array_file.decode(buffer, MAGIC)
+  return arrays[OFFSETS], arrays[DATA]
+
+
+def decode(buffer, start: int, stop: int) -> Iterator[stac.Node]:
+  """Yields nodes start to stop - 1 from a buffer made by encode."""
+  offsets, data = _offsets(buffer)
+  for index in range(start, stop):
+    yield pickle.loads(data[offsets[index]:offsets[index + 1]])
+
+
+def ranges(offsets: array_file.Array, parts: int) -> list[tuple[int, int]]:
+  """Splits the nodes into up to parts ranges with about the same bytes."""
+  count = len(offsets) - 1
+  total = offsets[-1]
+  bounds = [0]
+  for part in range(1, parts):
+    bound = min(bisect.bisect_left(offsets, total * part / parts), count)
+    if bound > bounds[-1]:
+      bounds.append(bound)
+  if count > bounds[-1]:
+    bounds.append(count)
+  return list(zip(bounds, bounds[1:]))
+
+
+def _attach(name: str) -> None:
+  global _shared
+  _shared = shared_memory.SharedMemory(name)
+
+
+def _map_range(
+    task: tuple[int, int, Callable[[stac.Node], Iterator[object]]]) -> bytes:
+  start, stop, function = task
+  results = []
+  for a_node in decode(_shared.buf, start, stop):
+    results.extend(function(a_node))
+  return pickle.dumps(results)
+
+
+def map_nodes(
+    nodes: list[stac.Node], function: Callable[[stac.Node], Iterator[object]],
+    processes: Optional[int] = None,
+    stats: Optional[Stats] = None) -> list[object]:
+  """Returns the results of function on each node, run in worker processes.
+
+  Args:
+    nodes: The nodes to run function on.
+    function: Returns the results for one node.  It is pickled by name, so it
+      must be a module level function or a functools.partial of one.
+    processes: The number of worker processes.  Defaults to the number of
+      CPUs.  With 1, everything runs in this process.
+    stats: If given, filled in with what was sent between processes.
+
+  Returns:
+    The results of all the nodes in the order of the nodes.
+  """
+  if processes is None:
+    processes = os.cpu_count() or 1
+  if stats is None:
+    stats = Stats()
+  stats.nodes = len(nodes)
+  if processes <= 1 or len(nodes) < 2:
+    start = time.perf_counter()
+    results = [result for a_node in nodes for result in function(a_node)]
+    stats.run_seconds = time.perf_counter() - start
+    return results
+
+  start = time.perf_counter()
+  encoded = encode(nodes)
+  stats.encode_seconds = time.perf_counter() - start
+  stats.shared_bytes = len(encoded)
+
+  start = time.perf_counter()
+  block = shared_memory.SharedMemory(create=True, size=len(encoded))
+  try:
+    block.buf[:len(encoded)] = encoded
+    offsets, _ = _offsets(encoded)
+    tasks = [
+        (first, last, function)
+        for first, last in ranges(offsets, processes * TASKS_PER_PROCESS)]
+    stats.task_bytes = sum(len(pickle.dumps(task)) for task in tasks)
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(
+        processes, initializer=_attach, initargs=(block.name,)) as executor:
+      for result in executor.map(_map_range, tasks):
+        stats.result_bytes += len(result)
+        results.extend(pickle.loads(result))
+  finally:
+    block.close()
+    block.unlink()
+  stats.run_seconds = time.perf_counter() - start
+  return results
+
+
+def run_checks(
+    nodes: list[stac.Node], checks: list[str],
+    processes: Optional[int] = None,
+    stats: Optional[Stats] = None) -> list[stac.Issue]:
+  """Returns the node check issues, checking in worker processes.
+
+  Args:
+    nodes: The nodes to check.
+    checks: The names of the checks to run or empty for all of them.
+    processes: The number of worker processes.  Defaults to the number of
+      CPUs.  With 1, everything runs in this process.
+    stats: If given, filled in with what was sent between processes.
+
+  Returns:
+    The issues in the same order as running node.run_checks on each node.
+  """
+  return map_nodes(
+      nodes, functools.partial(node_checks.run_checks, checks=checks),
+      processes, stats)
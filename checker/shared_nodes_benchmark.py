@@ -0,0 +1,75 @@
+"""Compare sending nodes to workers by pickle and by shared memory.
+
+Runs the node checks on the whole catalog in worker processes both ways and
+reports the bytes sent between processes and the wall time of each.
+"""
+
+from collections.abc import Sequence
+import concurrent.futures
+import os
+import pickle
+import time
+
+from absl import app
+from absl import flags
+
+from checker import node
+from checker import shared_nodes
+from checker import stac
+
+_PROCESSES = flags.DEFINE_integer(
+    'processes', os.cpu_count() or 1, 'Number of worker processes.')
+_REPEATS = flags.DEFINE_integer(
+    'repeats', 3, 'Number of times to check the catalog in each mode.')
+
+
+def _check_pickled(a_node: stac.Node) -> bytes:
+  return pickle.dumps(list(node.run_checks(a_node, [])))
+
+
+def pickled(nodes: list[stac.Node], processes: int) -> tuple[int, float]:
+  """Returns the IPC bytes and seconds for sending every node by pickle."""
+  # Measured apart from the run, which pickles the nodes itself.
+  ipc_bytes = sum(len(pickle.dumps(a_node)) for a_node in nodes)
+  start = time.perf_counter()
+  chunksize = max(
+      1, len(nodes) // (processes * shared_nodes.TASKS_PER_PROCESS))
+  with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+    for result in executor.map(_check_pickled, nodes, chunksize=chunksize):
+      ipc_bytes += len(result)
+  return ipc_bytes, time.perf_counter() - start
+
+
+def shared(nodes: list[stac.Node], processes: int) -> tuple[int, float]:
+  """Returns the IPC bytes and seconds for the shared memory transport."""
+  stats = shared_nodes.Stats()
+  shared_nodes.run_checks(nodes, [], processes, stats)
+  return (
+      stats.task_bytes + stats.result_bytes,
+      stats.encode_seconds + stats.run_seconds)
+
+
+def main(argv: Sequence[str]) -> None:
+  if len(argv) > 1:
+    raise app.UsageError('Too many command-line arguments.')
+
+  nodes = stac.load(stac.stac_root())
+  print('Number of STAC nodes loaded:', len(nodes))
+  processes = max(2, _PROCESSES.value)
+
+  results = {}
+  for name, transport in (('pickle', pickled), ('shared', shared)):
+    ipc_bytes, seconds = transport(nodes, processes)
+    for _ in range(_REPEATS.value - 1):
+      seconds = min(seconds, transport(nodes, processes)[1])
+    results[name] = ipc_bytes, seconds
+    print(f'{name}: {ipc_bytes} IPC bytes, {seconds * 1000:.1f} ms '
+          f'with {processes} processes')
+
+  saved_bytes = results['pickle'][0] - results['shared'][0]
+  saved_seconds = results['pickle'][1] - results['shared'][1]
+  print(f'Saved {saved_bytes} IPC bytes and {saved_seconds * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,82 @@
+"""Tests for shared_nodes."""
+
+import array
+import pathlib
+
+from checker import node
+from checker import shared_nodes
+from checker import stac
+import unittest
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+
+def make_nodes(count: int) -> list[stac.Node]:
+  return [
+      stac.Node(
+          f'A/N{index}', pathlib.Path(f'A/A_N{index}.json'), 'Collection',
+          IMAGE, {
+              'type': 'Collection',
+              'id': f'A/N{index}',
+              'gee:type': 'image',
+              'description': 'x' * index * 10,
+          })
+      for index in range(count)]
+
+
+class SharedNodesTest(unittest.TestCase):
+
+  def test_round_trip(self):
+    nodes = make_nodes(5)
+    encoded = shared_nodes.encode(nodes)
+    self.assertEqual(nodes, list(shared_nodes.decode(encoded, 0, 5)))
+    self.assertEqual(nodes[2:4], list(shared_nodes.decode(encoded, 2, 4)))
+    self.assertEqual([], list(shared_nodes.decode(encoded, 3, 3)))
+
+  def test_wrong_magic(self):
+    with self.assertRaisesRegex(ValueError, 'EENODES1'):
+      list(shared_nodes.decode(b'NOTNODES' + b'\0' * 16, 0, 1))
+
+  def test_ranges_cover_every_node(self):
+    offsets = array.array('Q', [0, 10, 20, 30, 40, 50])
+    self.assertEqual([(0, 5)], shared_nodes.ranges(offsets, 1))
+    self.assertEqual([(0, 3), (3, 5)], shared_nodes.ranges(offsets, 2))
+    self.assertEqual(
+        [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)],
+        shared_nodes.ranges(offsets, 20))
+
+  def test_ranges_balance_bytes(self):
+    # One big node and many small ones.
+    offsets = array.array('Q', [0, 1000] + list(range(1010, 1110, 10)))
+    self.assertEqual([(0, 1), (1, 11)], shared_nodes.ranges(offsets, 2))
+
+  def test_ranges_empty(self):
+    self.assertEqual([], shared_nodes.ranges(array.array('Q', [0]), 4))
+
+  def test_run_checks_matches_serial(self):
+    nodes = make_nodes(12)
+    expected = [
+        issue for a_node in nodes for issue in node.run_checks(a_node, [])]
+    self.assertTrue(expected)
+    stats = shared_nodes.Stats()
+    self.assertEqual(
+        expected,
+        shared_nodes.run_checks(nodes, [], processes=2, stats=stats))
+    self.assertEqual(12, stats.nodes)
+    self.assertGreater(stats.shared_bytes, 0)
+    self.assertGreater(stats.task_bytes, 0)
+    self.assertGreater(stats.result_bytes, 0)
+    self.assertIn('12 nodes', stats.summary())
+
+  def test_run_checks_in_process(self):
+    nodes = make_nodes(3)
+    stats = shared_nodes.Stats()
+    self.assertEqual(
+        [issue for a_node in nodes for issue in node.run_checks(a_node, [])],
+        shared_nodes.run_checks(nodes, [], processes=1, stats=stats))
+    self.assertEqual(0, stats.shared_bytes)
+
+
+if __name__ == '__main__':
+  unittest.main()
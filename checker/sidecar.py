@@ -0,0 +1,205 @@
+"""Splits oversized nodes into a core document and sidecar json files.
+
+A few collections, like the LANDFIRE ones with thousands of gee:classes, are
+megabytes of json, while most clients only want the title, extent, and
+links.  split measures the canonical json of a node and, if it is over the
+budget, moves the largest arrays in summaries out into sidecars until the
+core fits:
+
+1. the gee:classes table of each band in summaries.eo:bands
+2. the other arrays in summaries
+3. summaries.eo:bands itself
+
+Arrays smaller than MIN_SIDECAR_SIZE are left in place since a link to them
+would not be much smaller.  Each sidecar is the json of the array, published
+at the node's path as <name>.<pointer>.json but under sidecars/ rather than
+catalog/, so loading or checking the published catalog only sees STAC nodes.
+The core gets a link to each one with rel gee:sidecar and the json pointer of
+where the array was, so merge can put the node back together by applying the
+links in reverse order.
+
+The node's own stac is not changed.  Only the dicts and lists along the
+moved pointers are copied.
+"""
+
+import dataclasses
+import pathlib
+import re
+
+from checker import canonical
+from checker import stac
+
+# The largest core document, in bytes of canonical json.
+BUDGET = 128 * 1024
+MIN_SIDECAR_SIZE = 4 * 1024
+
+LINKS = 'links'
+SUMMARIES = 'summaries'
+EO_BANDS = 'eo:bands'
+GEE_CLASSES = 'gee:classes'
+
+REL = 'gee:sidecar'
+POINTER = 'gee:pointer'
+# Next to the catalog in the same bucket, but outside of the catalog PREFIX
+# that the link checks and crawl follow.
+PREFIX = 'https://storage.googleapis.com/earthengine-stac/sidecars/'
+
+_NOT_NAME = re.compile(r'[^A-Za-z0-9]+')
+
+
+@dataclasses.dataclass
+class Sidecar:
+  path: pathlib.Path
+  # The json pointer in the node where value was.
+  pointer: str
+  value: object
+
+
+@dataclasses.dataclass
+class Split:
+  core: dict[str, object]
+  core_size: int
+  sidecars: list[Sidecar] = dataclasses.field(default_factory=list)
+
+
+def size(stac_data: dict[str, object]) -> int:
+  return len(canonical.dumps(stac_data))
+
+
+def _escape(key: str) -> str:
+  return key.replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(part: str) -> str:
+  return part.replace('~1', '/').replace('~0', '~')
+
+
+def _parts(pointer: str) -> list[str]:
+  return [_unescape(part) for part in pointer.split('/')[1:]]
+
+
+def _key(container: object, part: str) -> object:
+  return int(part) if isinstance(container, list) else part
+
+
+def _get(stac_data: dict[str, object], pointer: str) -> object:
+  value = stac_data
+  for part in _parts(pointer):
+    value = value[_key(value, part)]
+  return value
+
+
+def _copy_path(
+    stac_data: dict[str, object],
+    pointer: str) -> tuple[dict[str, object], object, object]:
+  """Copies the containers along pointer.
+
+  Returns:
+    The copy of stac_data, the copy of the container that the pointer's last
+    part is in, and the key of that part.
+  """
+  parts = _parts(pointer)
+  root = dict(stac_data)
+  container = root
+  for part in parts[:-1]:
+    key = _key(container, part)
+    child = container[key]
+    child = list(child) if isinstance(child, list) else dict(child)
+    container[key] = child
+    container = child
+  return root, container, _key(container, parts[-1])
+
+
+def candidates(stac_data: dict[str, object]) -> list[tuple[str, int]]:
+  """Returns the pointers and sizes of the arrays that may be moved.
+
+  They are in the order to move them, the largest first within each group.
+  """
+  summaries = stac_data.get(SUMMARIES)
+  if not isinstance(summaries, dict):
+    return []
+  classes = []
+  bands = summaries.get(EO_BANDS)
+  if isinstance(bands, list):
+    for index, band in enumerate(bands):
+      if isinstance(band, dict) and isinstance(band.get(GEE_CLASSES), list):
+        classes.append((
+            f'/{SUMMARIES}/{_escape(EO_BANDS)}/{index}/'
+            f'{_escape(GEE_CLASSES)}',
+            len(canonical.dumps(band[GEE_CLASSES]))))
+  others = [
+      (f'/{SUMMARIES}/{_escape(key)}', len(canonical.dumps(value)))
+      for key, value in summaries.items()
+      if key != EO_BANDS and isinstance(value, list)]
+  by_size = lambda item: -item[1]
+  result = sorted(classes, key=by_size) + sorted(others, key=by_size)
+  if isinstance(bands, list):
+    # Measured later, once the classes tables may have moved out of it.
+    result.append((f'/{SUMMARIES}/{_escape(EO_BANDS)}', -1))
+  return result
+
+
+def sidecar_path(path: pathlib.Path, pointer: str) -> pathlib.Path:
+  name = _NOT_NAME.sub('_', pointer).strip('_')
+  return path.with_name(f'{path.stem}.{name}{path.suffix}')
+
+
+def link(path: pathlib.Path, pointer: str) -> dict[str, str]:
+  return {
+      'rel': REL,
+      'href': PREFIX + path.as_posix(),
+      'type': 'application/json',
+      POINTER: pointer,
+  }
+
+
+def split(node: stac.Node, budget: int = BUDGET) -> Split:
+  """Returns the node's json split so the core is at most budget bytes.
+
+  If the core is still over budget after moving every candidate, it is
+  returned as small as it got.
+  """
+  core = node.stac
+  core_size = size(core)
+  result = Split(core, core_size)
+  if core_size <= budget:
+    return result
+
+  for pointer, value_size in candidates(core):
+    if core_size <= budget:
+      break
+    value = _get(core, pointer)
+    if value_size < 0:
+      value_size = len(canonical.dumps(value))
+    if value_size < MIN_SIDECAR_SIZE:
+      continue
+    path = sidecar_path(node.path, pointer)
+    core, container, key = _copy_path(core, pointer)
+    del container[key]
+    core[LINKS] = list(core.get(LINKS, [])) + [link(path, pointer)]
+    core_size = size(core)
+    result.sidecars.append(Sidecar(path, pointer, value))
+
+  result.core = core
+  result.core_size = core_size
+  return result
+
+
+def merge(
+    core: dict[str, object],
+    sidecars: dict[str, object]) -> dict[str, object]:
+  """Returns the node's json from its core and the sidecars by href.
+
+  An empty links list is dropped, since split adds links to a node that may
+  not have had any.
+  """
+  links = core.get(LINKS, [])
+  result = dict(core)
+  result[LINKS] = [item for item in links if item.get('rel') != REL]
+  if not result[LINKS]:
+    del result[LINKS]
+  for item in reversed(links):
+    if item.get('rel') == REL:
+      result, container, key = _copy_path(result, item[POINTER])
+      container[key] = sidecars[item['href']]
+  return result
@@ -0,0 +1,121 @@
+"""Tests for sidecar."""
+
+import pathlib
+
+from checker import canonical
+from checker import sidecar
+from checker import stac
+import unittest
+
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+
+PATH = pathlib.Path('LANDFIRE/LANDFIRE_X.json')
+CLASSES_POINTER = '/summaries/eo:bands/1/gee:classes'
+BANDS_POINTER = '/summaries/eo:bands'
+CATALOG_PREFIX = 'https://storage.googleapis.com/earthengine-stac/catalog/'
+
+
+def classes(count: int) -> list[dict[str, object]]:
+  return [
+      {'value': value, 'description': f'Class {value}', 'color': 'ff0000'}
+      for value in range(count)]
+
+
+def make_node(class_count: int = 2000) -> stac.Node:
+  return stac.Node('LANDFIRE/X', PATH, COLLECTION, IMAGE, {
+      'id': 'LANDFIRE/X',
+      'title': 'A title',
+      'links': [{'rel': 'self', 'href': CATALOG_PREFIX + PATH.as_posix()}],
+      'summaries': {
+          'eo:bands': [
+              {'name': 'B0'},
+              {'name': 'B1', 'gee:classes': classes(class_count)},
+          ],
+          'gee:schema': [{'name': f'column{i}'} for i in range(300)],
+          'platform': ['a'],
+      },
+  })
+
+
+class SplitTest(unittest.TestCase):
+
+  def test_under_budget(self):
+    node = make_node(10)
+    split = sidecar.split(node)
+    self.assertIs(node.stac, split.core)
+    self.assertEqual(len(canonical.dumps(node.stac)), split.core_size)
+    self.assertEqual([], split.sidecars)
+
+  def test_moves_classes_first(self):
+    node = make_node()
+    original = canonical.dumps(node.stac)
+    split = sidecar.split(node, 32 * 1024)
+
+    self.assertEqual([CLASSES_POINTER], [
+        item.pointer for item in split.sidecars])
+    self.assertEqual(
+        pathlib.Path(
+            'LANDFIRE/LANDFIRE_X.summaries_eo_bands_1_gee_classes.json'),
+        split.sidecars[0].path)
+    self.assertEqual(classes(2000), split.sidecars[0].value)
+    self.assertNotIn('gee:classes', split.core['summaries']['eo:bands'][1])
+    self.assertEqual({
+        'rel': 'gee:sidecar',
+        'href': sidecar.PREFIX + split.sidecars[0].path.as_posix(),
+        'type': 'application/json',
+        'gee:pointer': CLASSES_POINTER,
+    }, split.core['links'][-1])
+    self.assertEqual(len(canonical.dumps(split.core)), split.core_size)
+    self.assertLessEqual(split.core_size, 32 * 1024)
+    # The node is not changed.
+    self.assertEqual(original, canonical.dumps(node.stac))
+
+  def test_moves_until_it_fits(self):
+    split = sidecar.split(make_node(), 1024)
+    self.assertEqual(
+        [CLASSES_POINTER, '/summaries/gee:schema'],
+        [item.pointer for item in split.sidecars])
+    # It stops once the core fits, so the bands stay.
+    self.assertLessEqual(split.core_size, 1024)
+    self.assertIn('eo:bands', split.core['summaries'])
+    self.assertIn('platform', split.core['summaries'])
+
+  def test_small_arrays_stay(self):
+    split = sidecar.split(make_node(), 100)
+    self.assertNotIn('/summaries/platform', [
+        item.pointer for item in split.sidecars])
+    self.assertGreater(split.core_size, 100)
+
+  def test_moves_bands_without_classes(self):
+    node = make_node()
+    node.stac['summaries']['eo:bands'] += [
+        {'name': f'X{i}', 'description': 'x' * 100} for i in range(100)]
+    split = sidecar.split(node, 1024)
+    self.assertEqual(
+        [CLASSES_POINTER, '/summaries/gee:schema', BANDS_POINTER],
+        [item.pointer for item in split.sidecars])
+    self.assertNotIn('gee:classes', split.sidecars[2].value[1])
+
+  def test_merge(self):
+    for budget in (1024, 32 * 1024, sidecar.BUDGET):
+      with self.subTest(budget=budget):
+        node = make_node()
+        node.stac['summaries']['eo:bands'] += [
+            {'name': f'X{i}', 'description': 'x' * 100} for i in range(100)]
+        split = sidecar.split(node, budget)
+        sidecars = {
+            sidecar.PREFIX + item.path.as_posix(): item.value
+            for item in split.sidecars}
+        self.assertEqual(node.stac, sidecar.merge(split.core, sidecars))
+
+  def test_no_summaries(self):
+    node = stac.Node('A', pathlib.Path('A.json'), COLLECTION, IMAGE, {
+        'description': 'x' * 1000})
+    split = sidecar.split(node, 100)
+    self.assertEqual([], split.sidecars)
+    self.assertGreater(split.core_size, 100)
+
+
+if __name__ == '__main__':
+  unittest.main()
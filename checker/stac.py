@@ -5,14 +5,22 @@ NOTE: FIRMS catalog and FIRMS collection have the same id.
 
 import dataclasses
 import enum
+import functools
 import json
 import pathlib
-from typing import Iterator
+from typing import Callable, Iterable, Iterator, Optional
 
 import os
 
+from checker import archive
+from checker import canonical
+from checker import hash_cons
+
 GEE_TYPE = 'gee:type'
+ID = 'id'
 TYPE = 'type'
+# The fields load always reads.
+LOAD_FIELDS = frozenset({GEE_TYPE, ID, TYPE})
 # This is an intentionally invalid dataset_id.
 UNKNOWN_ID = '> UNKNOWN ID: '
 
@@ -49,6 +57,24 @@ class Node:
   type: StacType
   gee_type: GeeType
   stac: dict[str, object]  # The result of json.load
+  # Every top level field in the file if stac was loaded with only some of
+  # them, or None if stac has all of them.
+  top_level_fields: Optional[frozenset[str]] = None
+
+  @functools.cached_property
+  def fingerprint(self) -> str:
+    """The sha256 of the canonical json of stac.
+
+    This is computed once per Node, so stac must not change after the first
+    use.  For nodes loaded with only some fields, it only covers those.
+    """
+    return canonical.fingerprint(self.stac)
+
+  def field_names(self) -> frozenset[str]:
+    """Returns the top level fields in the file, loaded into stac or not."""
+    if self.top_level_fields is None:
+      return frozenset(self.stac)
+    return self.top_level_fields
 
   def is_two_level(self):
     """Returns true if the asset id is a 2nd direcotry level asset."""
@@ -88,6 +114,15 @@ class Issue:
 class Check:
   """Parent class for all checks."""
   name: str = 'unknown'
+  # The top level fields of Node.stac that run reads or None for all of them.
+  # A check that only tests whether fields are there uses Node.field_names,
+  # which has every field, and does not need to list them.
+  fields: Optional[frozenset[str]] = None
+
+  @classmethod
+  def summary(cls) -> Optional[str]:
+    """Returns a line for the end of run summary or None."""
+    return None
 
   @classmethod
   def new_issue(cls,
@@ -107,24 +142,92 @@ class NodeCheck(Check):
 
 class TreeCheck(Check):
   """One tree check."""
+  # True if the issues for a node only depend on that node, so the check can
+  # run on part of the catalog at a time.
+  local: bool = False
 
   @classmethod
   def run(cls, nodes: list[Node]) -> Iterator[Issue]:
     raise NotImplementedError
 
 
-# TODO(schwehr): Allow a list of regex for the ids.
-def load(root: pathlib.Path) -> list[Node]:
-  """Returns a list of Nodes."""
+def fields_read(checks: Iterable[type[Check]]) -> Optional[frozenset[str]]:
+  """Returns the fields that checks read or None if any of them reads all."""
+  result = frozenset()
+  for check in checks:
+    if check.fields is None:
+      return None
+    result |= check.fields
+  return result
+
+
+def _files(root: pathlib.Path) -> Iterator[tuple[pathlib.Path, bytes]]:
+  """Yields the path relative to root and contents of the json files."""
   root_len = len(root.parts)
-  nodes: list[Node] = []
   for path in root.rglob('*.json'):
-    relative_path = pathlib.Path(*path.parts[root_len:])
-
-    stac = json.loads(path.read_text())
-    dataset_id = stac.get('id', UNKNOWN_ID + str(relative_path))
-    asset_type = stac.get(TYPE)
-    gee_type_str = stac.get(GEE_TYPE)
-    gee_type = GeeType(gee_type_str) if gee_type_str else GeeType.NONE
-    nodes.append(Node(dataset_id, relative_path, asset_type, gee_type, stac))
+    yield pathlib.Path(*path.parts[root_len:]), path.read_bytes()
+
+
+def node_id(relative_path: pathlib.Path, stac: dict[str, object]) -> str:
+  """Returns the id of a node or a placeholder naming its file."""
+  return stac.get(ID, UNKNOWN_ID + str(relative_path))
+
+
+def new_node(
+    relative_path: pathlib.Path, stac: dict[str, object],
+    pool: Optional[hash_cons.Pool] = None,
+    fields: Optional[frozenset[str]] = None) -> Node:
+  """Returns the Node for the json of the STAC file at relative_path.
+
+  Args:
+    relative_path: The path of the file relative to the catalog root.
+    stac: The decoded json of the file.
+    pool: If given, identical values are shared with other nodes through this
+      pool.
+    fields: If given, only these top level fields are kept in Node.stac.
+  """
+  dataset_id = node_id(relative_path, stac)
+  top_level_fields = None
+  if fields is not None:
+    top_level_fields = frozenset(stac)
+    stac = {key: value for key, value in stac.items() if key in fields}
+  if pool is not None:
+    stac = pool.intern(stac)
+  gee_type_str = stac.get(GEE_TYPE)
+  gee_type = GeeType(gee_type_str) if gee_type_str else GeeType.NONE
+  return Node(
+      dataset_id, relative_path, stac.get(TYPE), gee_type, stac,
+      top_level_fields)
+
+
+def load(
+    root: pathlib.Path,
+    id_filter: Optional[Callable[[str], bool]] = None,
+    pool: Optional[hash_cons.Pool] = None,
+    fields: Optional[frozenset[str]] = None) -> list[Node]:
+  """Returns a list of Nodes.
+
+  Args:
+    root: The directory to search for STAC json files or a zip or tar archive
+      of it.  Archives are read without extracting them.
+    id_filter: If given, only nodes with ids for which this returns True are
+      kept.  For example, id_trie.IdTrie(['NOAA/CDR']).covers.
+    pool: If given, identical values are shared between the nodes through
+      this pool and the nodes must be treated as read only.
+    fields: If given, only these top level fields and LOAD_FIELDS are kept
+      in Node.stac.  For example, node.fields(checks).  This only reduces
+      the memory the nodes hold, not the load time: every file is still
+      decoded in full with json.loads, and the other fields are dropped
+      afterwards, before pooling, so large values like summaries are not held
+      for the run.  Node.field_names still lists them.
+  """
+  if fields is not None:
+    fields = fields | LOAD_FIELDS
+  files = archive.members(root) if archive.is_archive(root) else _files(root)
+  nodes: list[Node] = []
+  for relative_path, contents in files:
+    stac = json.loads(contents)
+    if id_filter is not None and not id_filter(node_id(relative_path, stac)):
+      continue
+    nodes.append(new_node(relative_path, stac, pool, fields))
   return nodes
@@ -1,6 +1,8 @@
 """Tests for stac."""
 
+import json
 import pathlib
+import tempfile
 
 from checker import stac
 import unittest
@@ -49,6 +51,17 @@ class NodeTest(unittest.TestCase):
       self.assertTrue(
           node.is_two_level(), f'id should be two level: {dataset_id}')
 
+  def test_fingerprint(self):
+    node = stac.Node(ID, EMPTY_PATH, COLLECTION, IMAGE, {'a': 1.0, 'b': [2]})
+    same = stac.Node('other', EMPTY_PATH, COLLECTION, IMAGE, {'b': [2], 'a': 1})
+    self.assertEqual(64, len(node.fingerprint))
+    self.assertEqual(node.fingerprint, same.fingerprint)
+    # The fingerprint is cached, so it does not see later changes.
+    node.stac['a'] = 2
+    self.assertEqual(same.fingerprint, node.fingerprint)
+    self.assertEqual(node, stac.Node(ID, EMPTY_PATH, COLLECTION, IMAGE, {
+        'a': 2, 'b': [2]}))
+
 
 class IssueTest(unittest.TestCase):
 
@@ -102,6 +115,9 @@ class CheckTest(unittest.TestCase):
 
     self.assertEqual(expect, issue)
 
+  def test_no_summary(self):
+    self.assertIsNone(stac.Check.summary())
+
   def test_not_implemented(self):
     node = stac.Node(
         ID, EMPTY_PATH, stac.StacType.COLLECTION, stac.GeeType.TABLE, {})
@@ -119,5 +135,42 @@ class LoadTest(unittest.TestCase):
     nodes = stac.load(stac_root)
     self.assertGreater(len(nodes), 200)
 
+  def test_id_filter(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      root = pathlib.Path(tmp_dir)
+      for name in ('a', 'b'):
+        (root / f'{name}.json').write_text(json.dumps({ID: name}))
+      nodes = stac.load(root, lambda dataset_id: dataset_id == 'b')
+    self.assertEqual(['b'], [node.id for node in nodes])
+
+  def test_fields(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      root = pathlib.Path(tmp_dir)
+      (root / 'a.json').write_text(json.dumps({
+          ID: 'a', 'type': 'Collection', 'gee:type': 'image', 'title': 'A',
+          'summaries': {'gee:classes': [{'value': 1}]}}))
+      nodes = stac.load(root, fields=frozenset({'title'}))
+    self.assertEqual(
+        {ID: 'a', 'type': 'Collection', 'gee:type': 'image', 'title': 'A'},
+        nodes[0].stac)
+    self.assertEqual(stac.GeeType.IMAGE, nodes[0].gee_type)
+    self.assertEqual(
+        {ID, 'type', 'gee:type', 'title', 'summaries'},
+        nodes[0].field_names())
+
+  def test_new_node(self):
+    path = pathlib.Path('a/b.json')
+    node = stac.new_node(
+        path, {ID: 'a/b', 'type': 'Collection', 'gee:type': 'image'})
+    self.assertEqual('a/b', node.id)
+    self.assertEqual(path, node.path)
+    self.assertEqual(stac.StacType.COLLECTION, node.type)
+    self.assertEqual(stac.GeeType.IMAGE, node.gee_type)
+
+    node = stac.new_node(path, {'type': 'Catalog'})
+    self.assertEqual(stac.UNKNOWN_ID + 'a/b.json', node.id)
+    self.assertEqual(stac.GeeType.NONE, node.gee_type)
+    self.assertEqual({'type'}, node.field_names())
+
 if __name__ == '__main__':
   unittest.main()
@@ -1,20 +1,50 @@
 """Runs all the tree checks."""
 
-from typing import Iterator
+from typing import Iterator, Optional
 
 from checker import stac
+from checker.tree import links
+from checker.tree import markdown
+from checker.tree import non_commercial
 from checker.tree import parent_child
+from checker.tree import schemas
 
 _CHECKS = [
+    links.Check,
+    markdown.Check,
+    non_commercial.Check,
     parent_child.Check,
+    schemas.Check,
 ]
 
 
+def selected(checks: list[str]) -> list[type[stac.TreeCheck]]:
+  """Returns the tree checks named in checks or all of them if empty."""
+  return [check for check in _CHECKS if not checks or check.name in checks]
+
+
+def projection_fields(checks: list[str]) -> Optional[frozenset[str]]:
+  """Returns the fields the non-local checks read or None for all fields."""
+  return stac.fields_read(
+      check for check in selected(checks) if not check.local)
+
+
+def fields(checks: list[str]) -> Optional[frozenset[str]]:
+  """Returns the fields the checks read or None for all fields."""
+  return stac.fields_read(selected(checks))
+
+
 def run_checks(
     nodes: list[stac.Node], checks: list[str]) -> Iterator[stac.Issue]:
   """Runs all checks on that operate on the tree of STAC nodes."""
 
-  for check in _CHECKS:
-    if checks and check.name not in checks:
-      continue
+  for check in selected(checks):
     yield from check.run(nodes)
+
+
+def summaries(checks: list[str]) -> Iterator[str]:
+  """Yields the end of run summary lines from the checks that were run."""
+  for check in selected(checks):
+    summary = check.summary()
+    if summary:
+      yield summary
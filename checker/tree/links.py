@@ -0,0 +1,125 @@
+"""Checks the links between STAC nodes.
+
+Every href under the catalog PREFIX must resolve to a node:
+
+- The rel must be one that points to a STAC node.
+- The target of a parent or child link must exist.  Parents must be catalogs
+  and version links must point to collections.
+- The type must be the STAC media type.
+- If there is a title, it must name the target.  Child links are titled with
+  the id of the target with '/' replaced by '_' like ee.link.child_collection,
+  while version links are titled with the id of the target.
+
+Dangling child links and title mismatches are warnings until the catalog is
+cleaned up.
+
+The url of every node comes from its self link and goes into one dict, so the
+check is linear in the total number of links.
+"""
+
+from typing import Iterator
+
+from checker import stac
+from checker.tree import parent_child
+
+HREF = parent_child.HREF
+LINKS = parent_child.LINKS
+PREFIX = parent_child.PREFIX
+REL = parent_child.REL
+TITLE = 'title'
+TYPE = 'type'
+
+CHILD = parent_child.CHILD
+PARENT = parent_child.PARENT
+ROOT = 'root'
+SELF = parent_child.SELF
+LATEST = 'latest-version'
+PREDECESSOR = 'predecessor-version'
+SUCCESSOR = 'successor-version'
+
+STAC_MEDIA_TYPE = 'application/json'
+
+# The type of node each rel must point to or None for any type.
+TARGET_TYPES = {
+    CHILD: None,
+    PARENT: stac.StacType.CATALOG,
+    ROOT: stac.StacType.CATALOG,
+    SELF: None,
+    LATEST: stac.StacType.COLLECTION,
+    PREDECESSOR: stac.StacType.COLLECTION,
+    SUCCESSOR: stac.StacType.COLLECTION,
+}
+
+
+def expected_title(rel: str, target: stac.Node) -> str:
+  """Returns the title a link of rel to target should have."""
+  if rel == CHILD:
+    return target.id.replace('/', '_')
+  return target.id
+
+
+def links(node: stac.Node) -> Iterator[dict[str, object]]:
+  """Yields the links of a node that are dicts with a str href."""
+  node_links = node.stac.get(LINKS)
+  if not isinstance(node_links, list):
+    return
+  for link in node_links:
+    if isinstance(link, dict) and isinstance(link.get(HREF), str):
+      yield link
+
+
+def url_index(nodes: list[stac.Node]) -> dict[str, stac.Node]:
+  """Returns the nodes by the href of their self links."""
+  result = {}
+  for node in nodes:
+    for link in links(node):
+      if link.get(REL) == SELF:
+        result[link[HREF]] = node
+        break
+  return result
+
+
+class Check(stac.TreeCheck):
+  """Checks that the links within the catalog resolve."""
+  name = 'links'
+  fields = frozenset({LINKS})
+
+  @classmethod
+  def run(cls, nodes: list[stac.Node]) -> Iterator[stac.Issue]:
+    by_url = url_index(nodes)
+    for node in nodes:
+      for link in links(node):
+        href = link[HREF]
+        if not href.startswith(PREFIX):
+          continue
+        rel = link.get(REL)
+        if rel not in TARGET_TYPES:
+          yield cls.new_issue(node, f'Unexpected rel for a STAC link: {rel}')
+          continue
+
+        media_type = link.get(TYPE)
+        if media_type != STAC_MEDIA_TYPE:
+          yield cls.new_issue(
+              node,
+              f'{rel} link type must be {STAC_MEDIA_TYPE}: {media_type}')
+
+        target = by_url.get(href)
+        if target is None:
+          level = (
+              stac.IssueLevel.WARNING if rel == CHILD
+              else stac.IssueLevel.ERROR)
+          yield cls.new_issue(
+              node, f'{rel} link target not found: {href}', level)
+          continue
+
+        target_type = TARGET_TYPES[rel]
+        if target_type and target.type != target_type:
+          yield cls.new_issue(
+              node, f'{rel} link must point to a {target_type.value}: {href}')
+
+        title = link.get(TITLE)
+        expected = expected_title(rel, target)
+        if title is not None and title != expected:
+          yield cls.new_issue(
+              node, f'{rel} link title "{title}" does not match "{expected}"',
+              stac.IssueLevel.WARNING)
@@ -0,0 +1,154 @@
+"""Tests for links."""
+
+import pathlib
+
+from checker import stac
+from checker.tree import links
+import unittest
+
+Check = links.Check
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+
+HREF = links.HREF
+LINKS = links.LINKS
+PREFIX = links.PREFIX
+REL = links.REL
+TITLE = links.TITLE
+TYPE = links.TYPE
+
+WARNING = stac.IssueLevel.WARNING
+
+CHILD = links.CHILD
+LATEST = links.LATEST
+PARENT = links.PARENT
+PREDECESSOR = links.PREDECESSOR
+ROOT = links.ROOT
+SELF = links.SELF
+STAC_TYPE = links.STAC_MEDIA_TYPE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+ROOT_URL = PREFIX + 'catalog.json'
+CATALOG_URL = PREFIX + 'A/catalog.json'
+V1_URL = PREFIX + 'A/A_V1.json'
+V2_URL = PREFIX + 'A/A_V2.json'
+
+
+def link(rel, href, title=None, media_type=STAC_TYPE):
+  result = {REL: rel, HREF: href, TYPE: media_type}
+  if title is not None:
+    result[TITLE] = title
+  return result
+
+
+def make_nodes() -> list[stac.Node]:
+  return [
+      stac.Node('GEE_catalog', FILE_PATH, CATALOG, NONE, {LINKS: [
+          link(SELF, ROOT_URL),
+          link(ROOT, ROOT_URL),
+          link(CHILD, CATALOG_URL, 'A'),
+      ]}),
+      stac.Node('A', FILE_PATH, CATALOG, NONE, {LINKS: [
+          link(SELF, CATALOG_URL),
+          link(PARENT, ROOT_URL),
+          link(CHILD, V1_URL, 'A_V1'),
+          link(CHILD, V2_URL, 'A_V2'),
+      ]}),
+      stac.Node('A/V1', FILE_PATH, COLLECTION, IMAGE, {LINKS: [
+          link(SELF, V1_URL),
+          link(PARENT, CATALOG_URL),
+          link(LATEST, V2_URL, 'A/V2'),
+          link('license', 'https://example.com/terms', media_type='text/html'),
+      ]}),
+      stac.Node('A/V2', FILE_PATH, COLLECTION, IMAGE, {LINKS: [
+          link(SELF, V2_URL),
+          link(PARENT, CATALOG_URL),
+          link(PREDECESSOR, V1_URL, 'A/V1'),
+      ]}),
+  ]
+
+
+class LinksTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.nodes = make_nodes()
+
+  def test_valid(self):
+    self.assertEqual([], list(Check.run(self.nodes)))
+
+  def test_url_index(self):
+    by_url = links.url_index(self.nodes)
+    self.assertEqual(4, len(by_url))
+    self.assertIs(self.nodes[2], by_url[V1_URL])
+
+  def test_malformed_links_are_skipped(self):
+    self.nodes[0].stac[LINKS].extend(['not a dict', {REL: CHILD}])
+    self.nodes.append(
+        stac.Node('B', FILE_PATH, CATALOG, NONE, {LINKS: 'not a list'}))
+    self.assertEqual([], list(Check.run(self.nodes)))
+
+  def test_dangling(self):
+    missing = PREFIX + 'A/A_V3.json'
+    node = self.nodes[3]
+    node.stac[LINKS].append(link('successor-version', missing, 'A/V3'))
+    expect = [Check.new_issue(
+        node, f'successor-version link target not found: {missing}')]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_dangling_child(self):
+    missing = PREFIX + 'A/A_V3.json'
+    node = self.nodes[1]
+    node.stac[LINKS].append(link(CHILD, missing, 'A_V3'))
+    expect = [Check.new_issue(
+        node, f'child link target not found: {missing}', WARNING)]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_unexpected_rel(self):
+    node = self.nodes[2]
+    node.stac[LINKS][2][REL] = 'latest'
+    expect = [Check.new_issue(node, 'Unexpected rel for a STAC link: latest')]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_media_type(self):
+    node = self.nodes[3]
+    node.stac[LINKS][1][TYPE] = 'text/html'
+    expect = [Check.new_issue(
+        node, 'parent link type must be application/json: text/html')]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_wrong_target_type(self):
+    node = self.nodes[3]
+    node.stac[LINKS][1][HREF] = V1_URL
+    node.stac[LINKS][2] = link(PREDECESSOR, CATALOG_URL)
+    expect = [
+        Check.new_issue(node, f'parent link must point to a Catalog: {V1_URL}'),
+        Check.new_issue(
+            node,
+            f'predecessor-version link must point to a Collection: '
+            f'{CATALOG_URL}'),
+    ]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_child_title(self):
+    node = self.nodes[1]
+    node.stac[LINKS][3][TITLE] = 'A/V2'
+    expect = [Check.new_issue(
+        node, 'child link title "A/V2" does not match "A_V2"', WARNING)]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+  def test_version_title(self):
+    node = self.nodes[2]
+    node.stac[LINKS][2][TITLE] = 'A_V2'
+    expect = [Check.new_issue(
+        node, 'latest-version link title "A_V2" does not match "A/V2"',
+        WARNING)]
+    self.assertEqual(expect, list(Check.run(self.nodes)))
+
+
+if __name__ == '__main__':
+  unittest.main()
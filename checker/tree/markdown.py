@@ -0,0 +1,232 @@
+"""Checks the markdown in descriptions and terms of use.
+
+Each text is scanned once, line by line, without building a syntax tree.  The
+scan collects:
+
+- links: the targets of [text](target) and <target>
+- headings: lines starting with 1 to 6 '#'
+- problems: unmatched '[' or ']', link targets without a closing ')', empty
+  link targets, unclosed code spans and code blocks, unknown HTML entities,
+  empty headings, and table rows with a different number of cells than the
+  table's first row
+
+Many collections share the same terms of use and boilerplate descriptions, so
+scans are kept in a fingerprint_cache and each distinct text is only scanned
+once.
+
+Links to dataset pages in the Earth Engine catalog must be to a dataset id in
+the STAC catalog.  The markdown problems are warnings and bad dataset links
+are errors.
+"""
+
+import dataclasses
+import html.entities
+import re
+from typing import Iterator
+
+from checker import fingerprint_cache
+from checker import stac
+
+DESCRIPTION = 'description'
+GEE_TERMS_OF_USE = 'gee:terms_of_use'
+FIELDS = (DESCRIPTION, GEE_TERMS_OF_USE)
+
+CATALOG_PAGE_PREFIXES = (
+    'https://developers.google.com/earth-engine/datasets/catalog/',
+    '/earth-engine/datasets/catalog/',
+)
+
+FENCE = '```'
+
+_ENTITY_RE = re.compile(r'&(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);')
+_HEADING_RE = re.compile(r' {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t#]*$')
+_AUTOLINK_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9+.-]*:[^ <>]*)>')
+
+
+@dataclasses.dataclass
+class Scan:
+  """What one pass over a markdown text found."""
+  links: list[str] = dataclasses.field(default_factory=list)
+  headings: list[tuple[int, str]] = dataclasses.field(default_factory=list)
+  problems: list[str] = dataclasses.field(default_factory=list)
+
+
+def _link_target(line: str, start: int) -> int:
+  """Returns the index of the ')' matching the '(' at start or -1."""
+  depth = 0
+  i = start
+  while i < len(line):
+    char = line[i]
+    if char == '\\':
+      i += 2
+      continue
+    if char == '(':
+      depth += 1
+    elif char == ')':
+      depth -= 1
+      if not depth:
+        return i
+    i += 1
+  return -1
+
+
+def scan(text: str) -> Scan:
+  """Returns the links, headings, and problems in a markdown text."""
+  result = Scan()
+  problems = result.problems
+  in_fence = False
+  fence_line = 0
+  table_cells = 0
+  # Line numbers of the '[' that are not matched yet.
+  open_brackets: list[int] = []
+
+  def close_paragraph():
+    for line_number in open_brackets:
+      problems.append(f'line {line_number}: Unmatched "["')
+    open_brackets.clear()
+
+  for line_number, line in enumerate(text.split('\n'), 1):
+    stripped = line.strip()
+    if stripped.startswith(FENCE):
+      close_paragraph()
+      in_fence = not in_fence
+      fence_line = line_number
+      table_cells = 0
+      continue
+    if in_fence:
+      continue
+    if not stripped:
+      close_paragraph()
+      table_cells = 0
+      continue
+
+    heading = _HEADING_RE.match(line)
+    if heading:
+      close_paragraph()
+      title = heading.group(2) or ''
+      if not title:
+        problems.append(f'line {line_number}: Empty heading')
+      result.headings.append((len(heading.group(1)), title))
+
+    if stripped.startswith('|'):
+      cells = len(stripped.strip('|').split('|'))
+      if not table_cells:
+        table_cells = cells
+      elif cells != table_cells:
+        problems.append(
+            f'line {line_number}: Table row has {cells} cells instead of '
+            f'{table_cells}')
+    else:
+      table_cells = 0
+
+    i = 0
+    while i < len(line):
+      char = line[i]
+      if char == '\\':
+        i += 2
+        continue
+      if char == '`':
+        run = len(line) - i - len(line[i:].lstrip('`'))
+        ticks = line[i:i + run]
+        end = line.find(ticks, i + run)
+        if end < 0:
+          problems.append(f'line {line_number}: Unclosed code span')
+          break
+        i = end + run
+        continue
+      if char == '[':
+        open_brackets.append(line_number)
+      elif char == ']':
+        if not open_brackets:
+          problems.append(f'line {line_number}: Unmatched "]"')
+        else:
+          open_brackets.pop()
+          if line.startswith('(', i + 1):
+            end = _link_target(line, i + 1)
+            if end < 0:
+              problems.append(f'line {line_number}: Unclosed link target')
+              break
+            target = line[i + 2:end].split()
+            if target:
+              result.links.append(target[0].strip('<>'))
+            else:
+              problems.append(f'line {line_number}: Empty link target')
+            i = end + 1
+            continue
+      elif char == '&':
+        entity = _ENTITY_RE.match(line, i)
+        if entity:
+          name = entity.group(1)
+          if not name.startswith('#') and name + ';' not in html.entities.html5:
+            problems.append(
+                f'line {line_number}: Unknown HTML entity: &{name};')
+          i = entity.end()
+          continue
+      elif char == '<':
+        autolink = _AUTOLINK_RE.match(line, i)
+        if autolink:
+          result.links.append(autolink.group(1))
+          i = autolink.end()
+          continue
+      i += 1
+
+  close_paragraph()
+  if in_fence:
+    problems.append(f'line {fence_line}: Unclosed code block')
+  return result
+
+
+def catalog_page(target: str) -> str:
+  """Returns the name of the dataset page a link points to or ''."""
+  for prefix in CATALOG_PAGE_PREFIXES:
+    if target.startswith(prefix):
+      page = re.split('[#?]', target[len(prefix):], maxsplit=1)[0]
+      page = page.rstrip('/')
+      # Dataset ids have at least two parts, so their pages have a '_'.  This
+      # skips the index, overview pages like "landsat", and files like pdfs.
+      if '_' not in page or '.' in page or '/' in page:
+        return ''
+      return page
+  return ''
+
+
+def page_name(dataset_id: str) -> str:
+  return dataset_id.replace('/', '_')
+
+
+class Check(stac.TreeCheck):
+  """Checks the markdown of each distinct description and terms of use."""
+  name = 'markdown'
+  fields = frozenset(FIELDS)
+
+  cache: fingerprint_cache.Cache[Scan] = fingerprint_cache.Cache()
+
+  @classmethod
+  def reset(cls) -> None:
+    cls.cache = fingerprint_cache.Cache()
+
+  @classmethod
+  def scan(cls, text: str) -> Scan:
+    return cls.cache.get(text, lambda: scan(text))
+
+  @classmethod
+  def run(cls, nodes: list[stac.Node]) -> Iterator[stac.Issue]:
+    pages = {page_name(node.id) for node in nodes}
+    for node in nodes:
+      for field in FIELDS:
+        text = node.stac.get(field)
+        if not isinstance(text, str):
+          continue
+        result = cls.scan(text)
+        for problem in result.problems:
+          yield cls.new_issue(
+              node, f'{field} {problem}', stac.IssueLevel.WARNING)
+        for target in result.links:
+          page = catalog_page(target)
+          if page and page not in pages:
+            yield cls.new_issue(
+                node, f'{field} links to an unknown dataset: {target}')
+
+  @classmethod
+  def summary(cls) -> str:
+    return cls.cache.summary(cls.name)
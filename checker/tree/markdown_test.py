@@ -0,0 +1,137 @@
+"""Tests for markdown."""
+
+import pathlib
+
+from checker import stac
+from checker.tree import markdown
+import unittest
+
+Check = markdown.Check
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+WARNING = stac.IssueLevel.WARNING
+
+DESCRIPTION = markdown.DESCRIPTION
+GEE_TERMS_OF_USE = markdown.GEE_TERMS_OF_USE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+PAGE = 'https://developers.google.com/earth-engine/datasets/catalog/'
+
+
+class ScanTest(unittest.TestCase):
+
+  def test_links(self):
+    result = markdown.scan(
+        'See [the guide](/earth-engine/guides/landsat) and\n'
+        '[the paper](https://doi.org/10.1 "Title") or '
+        '<https://example.com/a_(b)>.\n'
+        '[multi\nline](https://example.com/(x))')
+    self.assertEqual([
+        '/earth-engine/guides/landsat', 'https://doi.org/10.1',
+        'https://example.com/a_(b)', 'https://example.com/(x)'
+    ], result.links)
+    self.assertEqual([], result.problems)
+
+  def test_headings(self):
+    result = markdown.scan('# Terms\n\ntext #1\n### Notes ###\n#hashtag\n#')
+    self.assertEqual([(1, 'Terms'), (3, 'Notes'), (1, '')], result.headings)
+    self.assertEqual(['line 6: Empty heading'], result.problems)
+
+  def test_brackets(self):
+    result = markdown.scan('a [b\n\nc] d [e](f\n[g')
+    self.assertEqual([
+        'line 1: Unmatched "["',
+        'line 3: Unmatched "]"',
+        'line 3: Unclosed link target',
+        'line 4: Unmatched "["',
+    ], result.problems)
+
+  def test_empty_link_target(self):
+    self.assertEqual(
+        ['line 1: Empty link target'], markdown.scan('[a]( )').problems)
+
+  def test_escapes_and_code(self):
+    result = markdown.scan(
+        r'\[not a link\] `[x](y) &bogus;` ``a ` b``' '\n'
+        '```\n[ &nope; |\n```')
+    self.assertEqual([], result.links)
+    self.assertEqual([], result.problems)
+
+  def test_unclosed_code(self):
+    self.assertEqual(
+        ['line 1: Unclosed code span', 'line 2: Unclosed code block'],
+        markdown.scan('a `b\n```\ncode').problems)
+
+  def test_entities(self):
+    result = markdown.scan('5 &mu;m &deg; &#176; &#xB0; &micro; &bogus; & a')
+    self.assertEqual(['line 1: Unknown HTML entity: &bogus;'], result.problems)
+
+  def test_tables(self):
+    result = markdown.scan(
+        '| a | b |\n|---|---|\n| 1 | 2 |\n| 3 |\n\n| x |\n|---|')
+    self.assertEqual(
+        ['line 4: Table row has 1 cells instead of 2'], result.problems)
+
+
+class CatalogPageTest(unittest.TestCase):
+
+  def test_catalog_page(self):
+    self.assertEqual(
+        'NASA_GRACE_MASS_GRIDS_MASCON',
+        markdown.catalog_page(PAGE + 'NASA_GRACE_MASS_GRIDS_MASCON'))
+    self.assertEqual(
+        'A_B', markdown.catalog_page('/earth-engine/datasets/catalog/A_B#x'))
+    self.assertEqual('', markdown.catalog_page(PAGE))
+    self.assertEqual('', markdown.catalog_page(PAGE + 'landsat'))
+    self.assertEqual('', markdown.catalog_page(PAGE + 'DataLicense_GAUL.pdf'))
+    self.assertEqual('', markdown.catalog_page('https://example.com/A_B'))
+
+
+class MarkdownTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    Check.reset()
+
+  def test_valid(self):
+    nodes = [
+        stac.Node('A', FILE_PATH, CATALOG, NONE, {DESCRIPTION: 'A catalog'}),
+        stac.Node('A/B', FILE_PATH, COLLECTION, IMAGE, {
+            DESCRIPTION: f'See [C]({PAGE}A_C).',
+            GEE_TERMS_OF_USE: '[CC-BY](https://example.com)'}),
+        stac.Node('A/C', FILE_PATH, COLLECTION, IMAGE, {
+            DESCRIPTION: f'See [B]({PAGE}A_B).',
+            GEE_TERMS_OF_USE: '[CC-BY](https://example.com)'}),
+    ]
+    self.assertEqual([], list(Check.run(nodes)))
+
+  def test_issues(self):
+    node = stac.Node('A/B', FILE_PATH, COLLECTION, IMAGE, {
+        DESCRIPTION: f'See [C]({PAGE}A_C).',
+        GEE_TERMS_OF_USE: 'Terms [here'})
+    expect = [
+        Check.new_issue(
+            node, 'gee:terms_of_use line 1: Unmatched "["', WARNING),
+        Check.new_issue(
+            node, f'description links to an unknown dataset: {PAGE}A_C'),
+    ]
+    self.assertCountEqual(expect, list(Check.run([node])))
+
+  def test_identical_texts_are_scanned_once(self):
+    terms = 'The same terms of use.'
+    nodes = [
+        stac.Node(f'A/{i}', FILE_PATH, COLLECTION, IMAGE, {
+            DESCRIPTION: f'Dataset {i}.', GEE_TERMS_OF_USE: terms})
+        for i in range(4)]
+    self.assertEqual([], list(Check.run(nodes)))
+    self.assertEqual(5, Check.cache.stats.misses)
+    self.assertEqual(3, Check.cache.stats.hits)
+    self.assertEqual(
+        'markdown cache: 3 hits, 5 misses, 37.5% hit rate', Check.summary())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,104 @@
+"""Checks that non_commercial_datasets.jsonnet matches the licenses.
+
+non_commercial_datasets.jsonnet lists asset id prefixes of the datasets with
+CC-BY-NC licenses.  Every collection with a CC-BY-NC license must start with
+one of the prefixes, every prefix must match at least one collection, and a
+prefix must not match a collection that allows commercial use.
+
+The prefixes go in a character trie, so matching all of the collections takes
+time proportional to the total length of their ids rather than ids times
+prefixes.
+"""
+
+import pathlib
+import re
+from typing import Iterator, Optional
+
+from checker import stac
+from checker.node import license_field
+
+LICENSE = license_field.LICENSE
+NON_COMMERCIAL_DATASETS = 'non_commercial_datasets.jsonnet'
+
+_COMMENT_RE = re.compile(r'//.*$', re.MULTILINE)
+_STRING_RE = re.compile(r"'([^']*)'")
+
+
+def non_commercial_path() -> pathlib.Path:
+  return stac.stac_root() / '..' / NON_COMMERCIAL_DATASETS
+
+
+def load_prefixes(path: pathlib.Path) -> list[str]:
+  """Returns the quoted strings from a jsonnet list, ignoring comments."""
+  return _STRING_RE.findall(_COMMENT_RE.sub('', path.read_text()))
+
+
+class PrefixTrie:
+  """Finds which of a set of prefixes a string starts with."""
+
+  def __init__(self, prefixes: list[str]):
+    # Each trie node is a dict from a character to the next node.  The None
+    # key marks the end of a prefix and holds that prefix.
+    self._root: dict[Optional[str], object] = {}
+    for prefix in prefixes:
+      node = self._root
+      for char in prefix:
+        node = node.setdefault(char, {})
+      node[None] = prefix
+
+  def matches(self, text: str) -> list[str]:
+    """Returns the prefixes of text from shortest to longest."""
+    result = []
+    node = self._root
+    if None in node:
+      result.append(node[None])
+    for char in text:
+      node = node.get(char)
+      if node is None:
+        break
+      if None in node:
+        result.append(node[None])
+    return result
+
+
+class Check(stac.TreeCheck):
+  """Checks non_commercial_datasets.jsonnet against the license fields."""
+  name = 'non_commercial'
+  fields = frozenset({LICENSE})
+
+  @classmethod
+  def run(cls, nodes: list[stac.Node]) -> Iterator[stac.Issue]:
+    path = non_commercial_path()
+    yield from cls.check_prefixes(nodes, load_prefixes(path), path)
+
+  @classmethod
+  def check_prefixes(
+      cls, nodes: list[stac.Node], prefixes: list[str],
+      path: pathlib.Path) -> Iterator[stac.Issue]:
+    trie = PrefixTrie(prefixes)
+    used = set()
+    collection_count = 0
+    for node in nodes:
+      if node.type != stac.StacType.COLLECTION:
+        continue
+      collection_count += 1
+      matches = trie.matches(node.id)
+      used.update(matches)
+      non_commercial = license_field.is_non_commercial(node)
+      if non_commercial and not matches:
+        yield cls.new_issue(
+            node, f'{node.stac[LICENSE]} dataset is not covered by a prefix '
+            f'in {NON_COMMERCIAL_DATASETS}')
+      elif matches and not non_commercial:
+        yield cls.new_issue(
+            node, f'Covered by non-commercial prefix "{matches[0]}", but '
+            f'{LICENSE} is not {license_field.NON_COMMERCIAL_PREFIX}: '
+            f'{node.stac.get(LICENSE)}')
+
+    # With no collections, as when the catalog json has not been built or a
+    # crawl fetched nothing, every prefix would be reported.
+    if not collection_count:
+      return
+    for prefix in sorted(set(prefixes) - used):
+      yield stac.Issue(
+          prefix, path, cls.name, 'Prefix does not match any dataset')
@@ -0,0 +1,104 @@
+"""Tests for non_commercial."""
+
+import pathlib
+import tempfile
+
+from checker import stac
+from checker.tree import non_commercial
+import unittest
+
+Check = non_commercial.Check
+
+CATALOG = stac.StacType.CATALOG
+COLLECTION = stac.StacType.COLLECTION
+IMAGE = stac.GeeType.IMAGE
+NONE = stac.GeeType.NONE
+LICENSE = non_commercial.LICENSE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+LIST_PATH = pathlib.Path('non_commercial_datasets.jsonnet')
+
+NC = 'CC-BY-NC-4.0'
+BY = 'CC-BY-4.0'
+
+
+def collection_node(dataset_id: str, license_value: str) -> stac.Node:
+  return stac.Node(
+      dataset_id, FILE_PATH, COLLECTION, IMAGE, {LICENSE: license_value})
+
+
+class PrefixTrieTest(unittest.TestCase):
+
+  def test_matches(self):
+    trie = non_commercial.PrefixTrie(['CSP/ERGo', 'CSP/ERGo/1_0/US', 'Ox'])
+    self.assertEqual(
+        ['CSP/ERGo', 'CSP/ERGo/1_0/US'], trie.matches('CSP/ERGo/1_0/US/CHILI'))
+    self.assertEqual(['CSP/ERGo'], trie.matches('CSP/ERGo/1_0/Global'))
+    self.assertEqual(['Ox'], trie.matches('Ox'))
+    self.assertEqual([], trie.matches('CSP/ERG'))
+    self.assertEqual([], trie.matches(''))
+
+  def test_empty_prefix(self):
+    self.assertEqual([''], non_commercial.PrefixTrie(['']).matches('a'))
+
+
+class LoadPrefixesTest(unittest.TestCase):
+
+  def test_load(self):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      path = pathlib.Path(tmp_dir) / 'list.jsonnet'
+      path.write_text(
+          "// Quotes in a 'comment' are ignored.\n"
+          "[\n  'A/B',\n  'C', // trailing 'comment'\n]\n")
+      self.assertEqual(['A/B', 'C'], non_commercial.load_prefixes(path))
+
+  def test_load_repo_list(self):
+    path = non_commercial.non_commercial_path()
+    prefixes = non_commercial.load_prefixes(path)
+    self.assertIn('CSP/ERGo/1_0/US/CHILI', prefixes)
+    self.assertEqual(len(prefixes), len(set(prefixes)))
+
+
+class NonCommercialTest(unittest.TestCase):
+
+  def issues(self, nodes, prefixes):
+    return list(Check.check_prefixes(nodes, prefixes, LIST_PATH))
+
+  def test_valid(self):
+    nodes = [
+        stac.Node('CSP', FILE_PATH, CATALOG, NONE, {}),
+        collection_node('CSP/ERGo/1_0/US/CHILI', NC),
+        collection_node('CSP/ERGo/1_0/US/landforms', 'CC-BY-NC-SA-4.0'),
+        collection_node('CSP/other', BY),
+    ]
+    self.assertEqual([], self.issues(nodes, ['CSP/ERGo/1_0/US/']))
+
+  def test_not_covered(self):
+    node = collection_node('Oxford/MAP/EVI', NC)
+    expect = [Check.new_issue(
+        node, 'CC-BY-NC-4.0 dataset is not covered by a prefix in '
+        'non_commercial_datasets.jsonnet')]
+    self.assertEqual(expect, self.issues([node], []))
+
+  def test_covers_commercial(self):
+    nodes = [collection_node('A/NC', NC), collection_node('A/NCX', BY)]
+    expect = [Check.new_issue(
+        nodes[1], 'Covered by non-commercial prefix "A/NC", but license is '
+        'not CC-BY-NC: CC-BY-4.0')]
+    self.assertEqual(expect, self.issues(nodes, ['A/NC']))
+
+  def test_unused_prefix(self):
+    nodes = [collection_node('A', NC)]
+    expect = [
+        stac.Issue('B', LIST_PATH, 'non_commercial',
+                   'Prefix does not match any dataset'),
+    ]
+    self.assertEqual(expect, self.issues(nodes, ['A', 'B']))
+
+  def test_no_collections(self):
+    nodes = [stac.Node('A', FILE_PATH, CATALOG, NONE, {})]
+    self.assertEqual([], self.issues(nodes, ['A', 'B']))
+
+
+if __name__ == '__main__':
+  unittest.main()
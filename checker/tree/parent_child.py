@@ -58,6 +58,7 @@ def child_urls(node: stac.Node) -> list[str]:
 class Check(stac.TreeCheck):
   """Checks parent-child relationship."""
   name = 'parent_child'
+  fields = frozenset({LINKS, GEE_SKIP_INDEXING})
 
   @classmethod
   def run(cls, nodes: list[stac.Node]) -> Iterator[stac.Issue]:
@@ -0,0 +1,33 @@
+"""Validates every node against the STAC and extension json schemas.
+
+See checker/json_schema.py for the vendored schemas.  The nodes are validated
+in this process unless processes is more than 1, when they go to worker
+processes through shared_nodes like the node checks do.
+"""
+
+from typing import Iterator
+
+from checker import json_schema
+from checker import shared_nodes
+from checker import stac
+
+
+def _node_issues(node: stac.Node) -> Iterator[stac.Issue]:
+  for error in json_schema.validate(node.stac):
+    yield Check.new_issue(node, error)
+
+
+class Check(stac.TreeCheck):
+  """Checks each node against its json schemas."""
+  name = 'schemas'
+  local = True
+  # The number of worker processes.  ee_stac_check sets it from --processes.
+  processes: int = 1
+
+  @classmethod
+  def run(cls, nodes: list[stac.Node]) -> Iterator[stac.Issue]:
+    if cls.processes > 1:
+      yield from shared_nodes.map_nodes(nodes, _node_issues, cls.processes)
+    else:
+      for node in nodes:
+        yield from _node_issues(node)
@@ -0,0 +1,48 @@
+"""Tests for schemas."""
+
+import pathlib
+
+from checker import stac
+from checker.tree import schemas
+import unittest
+
+Check = schemas.Check
+
+CATALOG = stac.StacType.CATALOG
+NONE = stac.GeeType.NONE
+
+FILE_PATH = pathlib.Path('test/path/should/be/ignored')
+
+
+def catalog_node(dataset_id: str, stac_version: str) -> stac.Node:
+  stac_data = {
+      'type': 'Catalog', 'stac_version': stac_version, 'id': dataset_id,
+      'description': 'A catalog', 'links': []}
+  return stac.Node(dataset_id, FILE_PATH, CATALOG, NONE, stac_data)
+
+
+class SchemasTest(unittest.TestCase):
+
+  def test_valid(self):
+    nodes = [catalog_node('A', '1.0.0'), catalog_node('B', '1.0.0')]
+    self.assertEqual([], list(Check.run(nodes)))
+
+  def test_invalid(self):
+    nodes = [catalog_node('A', '1.0.0'), catalog_node('B', '0.9.0')]
+    expect = [Check.new_issue(
+        nodes[1], "catalog.json: $.stac_version: expected '1.0.0'")]
+    self.assertEqual(expect, list(Check.run(nodes)))
+
+  def test_processes(self):
+    nodes = [catalog_node('A', '0.9.0'), catalog_node('B', '1.0.0')]
+    expect = list(Check.run(nodes))
+    self.assertEqual(1, len(expect))
+    Check.processes = 2
+    try:
+      self.assertEqual(expect, list(Check.run(nodes)))
+    finally:
+      Check.processes = 1
+
+
+if __name__ == '__main__':
+  unittest.main()